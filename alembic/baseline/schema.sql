@@ -0,0 +1,497 @@
+-- Squashed baseline schema for fresh databases.
+--
+-- Equivalent to running every migration from 8c215621414a up to the revision
+-- in BASELINE_REVISION (alembic/env.py) on an empty database. env.py loads
+-- this file in one transaction, stamps that revision, and lets Alembic apply
+-- any newer revisions on top. Existing databases keep using the migration chain.
+--
+-- Regenerate after squashing further revisions (then update BASELINE_REVISION):
+--   pg_dump --schema-only --no-owner --no-privileges -T alembic_version mxwhisper
+-- with SET statements and schema prefixes removed, plus the seed rows below.
+
+CREATE EXTENSION IF NOT EXISTS vector;
+
+CREATE TABLE audio_files (
+    id integer NOT NULL,
+    user_id character varying(255) NOT NULL,
+    file_path character varying(1000) NOT NULL,
+    original_filename character varying(500) NOT NULL,
+    file_size bigint NOT NULL,
+    mime_type character varying(100),
+    duration double precision,
+    checksum character varying(64) NOT NULL,
+    source_type character varying(50) NOT NULL,
+    source_url text,
+    source_platform character varying(100),
+    created_at timestamp with time zone NOT NULL,
+    updated_at timestamp with time zone NOT NULL
+);
+
+CREATE SEQUENCE audio_files_id_seq
+    AS integer
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1;
+
+ALTER SEQUENCE audio_files_id_seq OWNED BY audio_files.id;
+
+CREATE TABLE collections (
+    id integer NOT NULL,
+    name character varying(200) NOT NULL,
+    description text,
+    collection_type character varying(50),
+    user_id character varying(255) NOT NULL,
+    is_public boolean DEFAULT false NOT NULL,
+    created_at timestamp with time zone DEFAULT now() NOT NULL,
+    updated_at timestamp with time zone DEFAULT now() NOT NULL
+);
+
+CREATE SEQUENCE collections_id_seq
+    AS integer
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1;
+
+ALTER SEQUENCE collections_id_seq OWNED BY collections.id;
+
+CREATE TABLE job_chunks (
+    id bigint NOT NULL,
+    job_id bigint NOT NULL,
+    chunk_index integer NOT NULL,
+    text text NOT NULL,
+    topic_summary text,
+    keywords character varying[],
+    confidence double precision,
+    start_time double precision,
+    end_time double precision,
+    start_char_pos integer,
+    end_char_pos integer,
+    embedding vector(384),
+    created_at timestamp with time zone DEFAULT now() NOT NULL
+);
+
+CREATE SEQUENCE job_chunks_id_seq
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 50;
+
+ALTER SEQUENCE job_chunks_id_seq OWNED BY job_chunks.id;
+
+CREATE TABLE job_collections (
+    id bigint NOT NULL,
+    job_id bigint NOT NULL,
+    collection_id integer NOT NULL,
+    "position" integer,
+    assigned_by character varying(255),
+    created_at timestamp with time zone DEFAULT now() NOT NULL
+);
+
+CREATE SEQUENCE job_collections_id_seq
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 50;
+
+ALTER SEQUENCE job_collections_id_seq OWNED BY job_collections.id;
+
+CREATE TABLE job_topics (
+    id bigint NOT NULL,
+    job_id bigint NOT NULL,
+    topic_id integer NOT NULL,
+    ai_confidence double precision,
+    ai_reasoning text,
+    assigned_by character varying(255),
+    user_reviewed boolean DEFAULT false NOT NULL,
+    created_at timestamp with time zone DEFAULT now() NOT NULL
+);
+
+CREATE SEQUENCE job_topics_id_seq
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 50;
+
+ALTER SEQUENCE job_topics_id_seq OWNED BY job_topics.id;
+
+CREATE TABLE jobs (
+    id integer NOT NULL,
+    user_id character varying(255),
+    filename character varying(255) NOT NULL,
+    status character varying(50) NOT NULL,
+    transcript text,
+    created_at timestamp with time zone DEFAULT now() NOT NULL,
+    updated_at timestamp with time zone DEFAULT now() NOT NULL,
+    file_path character varying(500) NOT NULL,
+    segments jsonb,
+    embedding vector(384),
+    job_type character varying(50) DEFAULT 'transcription'::character varying NOT NULL,
+    audio_file_id integer,
+    source_url text
+);
+
+CREATE SEQUENCE jobs_id_seq
+    AS integer
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1;
+
+ALTER SEQUENCE jobs_id_seq OWNED BY jobs.id;
+
+CREATE TABLE roles (
+    id integer NOT NULL,
+    name character varying(50) NOT NULL,
+    description character varying(255),
+    created_at timestamp with time zone NOT NULL
+);
+
+CREATE SEQUENCE roles_id_seq
+    AS integer
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1;
+
+ALTER SEQUENCE roles_id_seq OWNED BY roles.id;
+
+CREATE TABLE topics (
+    id integer NOT NULL,
+    name character varying(100) NOT NULL,
+    description text,
+    parent_id integer,
+    created_at timestamp with time zone DEFAULT now() NOT NULL,
+    updated_at timestamp with time zone DEFAULT now() NOT NULL
+);
+
+CREATE SEQUENCE topics_id_seq
+    AS integer
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1;
+
+ALTER SEQUENCE topics_id_seq OWNED BY topics.id;
+
+CREATE TABLE transcription_chunks (
+    id bigint NOT NULL,
+    transcription_id integer NOT NULL,
+    chunk_index integer NOT NULL,
+    text text NOT NULL,
+    topic_summary text,
+    keywords character varying[],
+    confidence double precision,
+    start_time double precision,
+    end_time double precision,
+    start_char_pos integer,
+    end_char_pos integer,
+    embedding vector(384),
+    created_at timestamp with time zone NOT NULL
+);
+
+CREATE SEQUENCE transcription_chunks_id_seq
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 50;
+
+ALTER SEQUENCE transcription_chunks_id_seq OWNED BY transcription_chunks.id;
+
+CREATE TABLE transcription_collections (
+    id integer NOT NULL,
+    transcription_id integer NOT NULL,
+    collection_id integer NOT NULL,
+    "position" integer,
+    assigned_by character varying(255),
+    created_at timestamp with time zone NOT NULL
+);
+
+CREATE SEQUENCE transcription_collections_id_seq
+    AS integer
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1;
+
+ALTER SEQUENCE transcription_collections_id_seq OWNED BY transcription_collections.id;
+
+CREATE TABLE transcription_topics (
+    id integer NOT NULL,
+    transcription_id integer NOT NULL,
+    topic_id integer NOT NULL,
+    ai_confidence double precision,
+    ai_reasoning text,
+    assigned_by character varying(255),
+    user_reviewed boolean NOT NULL,
+    created_at timestamp with time zone NOT NULL
+);
+
+CREATE SEQUENCE transcription_topics_id_seq
+    AS integer
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1;
+
+ALTER SEQUENCE transcription_topics_id_seq OWNED BY transcription_topics.id;
+
+CREATE TABLE transcriptions (
+    id integer NOT NULL,
+    audio_file_id integer NOT NULL,
+    user_id character varying(255) NOT NULL,
+    transcript text NOT NULL,
+    language character varying(10),
+    model_name character varying(100),
+    model_version character varying(50),
+    avg_confidence double precision,
+    processing_time double precision,
+    status character varying(50) NOT NULL,
+    error_message text,
+    created_at timestamp with time zone NOT NULL,
+    updated_at timestamp with time zone NOT NULL,
+    segments jsonb
+);
+
+CREATE SEQUENCE transcriptions_id_seq
+    AS integer
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1;
+
+ALTER SEQUENCE transcriptions_id_seq OWNED BY transcriptions.id;
+
+CREATE TABLE users (
+    id character varying(255) NOT NULL,
+    email character varying(255),
+    name character varying(255),
+    preferred_username character varying(255),
+    created_at timestamp with time zone NOT NULL,
+    updated_at timestamp with time zone NOT NULL,
+    role_id integer DEFAULT 2 NOT NULL,
+    token_created_at timestamp without time zone,
+    token_expires_at timestamp without time zone,
+    current_token_jti character varying(255),
+    token_revocation_counter integer DEFAULT 0 NOT NULL
+);
+
+ALTER TABLE ONLY audio_files ALTER COLUMN id SET DEFAULT nextval('audio_files_id_seq'::regclass);
+
+ALTER TABLE ONLY collections ALTER COLUMN id SET DEFAULT nextval('collections_id_seq'::regclass);
+
+ALTER TABLE ONLY job_chunks ALTER COLUMN id SET DEFAULT nextval('job_chunks_id_seq'::regclass);
+
+ALTER TABLE ONLY job_collections ALTER COLUMN id SET DEFAULT nextval('job_collections_id_seq'::regclass);
+
+ALTER TABLE ONLY job_topics ALTER COLUMN id SET DEFAULT nextval('job_topics_id_seq'::regclass);
+
+ALTER TABLE ONLY jobs ALTER COLUMN id SET DEFAULT nextval('jobs_id_seq'::regclass);
+
+ALTER TABLE ONLY roles ALTER COLUMN id SET DEFAULT nextval('roles_id_seq'::regclass);
+
+ALTER TABLE ONLY topics ALTER COLUMN id SET DEFAULT nextval('topics_id_seq'::regclass);
+
+ALTER TABLE ONLY transcription_chunks ALTER COLUMN id SET DEFAULT nextval('transcription_chunks_id_seq'::regclass);
+
+ALTER TABLE ONLY transcription_collections ALTER COLUMN id SET DEFAULT nextval('transcription_collections_id_seq'::regclass);
+
+ALTER TABLE ONLY transcription_topics ALTER COLUMN id SET DEFAULT nextval('transcription_topics_id_seq'::regclass);
+
+ALTER TABLE ONLY transcriptions ALTER COLUMN id SET DEFAULT nextval('transcriptions_id_seq'::regclass);
+
+ALTER TABLE ONLY audio_files
+    ADD CONSTRAINT audio_files_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY collections
+    ADD CONSTRAINT collections_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY job_chunks
+    ADD CONSTRAINT job_chunks_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY job_collections
+    ADD CONSTRAINT job_collections_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY job_topics
+    ADD CONSTRAINT job_topics_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY jobs
+    ADD CONSTRAINT jobs_pkey PRIMARY KEY (id);
+
+ALTER TABLE jobs
+    ADD CONSTRAINT jobs_segments_is_array CHECK (((segments IS NULL) OR (jsonb_typeof(segments) = 'array'::text))) NOT VALID;
+
+ALTER TABLE ONLY roles
+    ADD CONSTRAINT roles_name_key UNIQUE (name);
+
+ALTER TABLE ONLY roles
+    ADD CONSTRAINT roles_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY topics
+    ADD CONSTRAINT topics_name_key UNIQUE (name);
+
+ALTER TABLE ONLY topics
+    ADD CONSTRAINT topics_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY transcription_chunks
+    ADD CONSTRAINT transcription_chunks_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY transcription_collections
+    ADD CONSTRAINT transcription_collections_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY transcription_topics
+    ADD CONSTRAINT transcription_topics_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY transcriptions
+    ADD CONSTRAINT transcriptions_pkey PRIMARY KEY (id);
+
+ALTER TABLE transcriptions
+    ADD CONSTRAINT transcriptions_segments_is_array CHECK (((segments IS NULL) OR (jsonb_typeof(segments) = 'array'::text))) NOT VALID;
+
+ALTER TABLE ONLY job_collections
+    ADD CONSTRAINT uq_job_collection UNIQUE (job_id, collection_id);
+
+ALTER TABLE ONLY job_topics
+    ADD CONSTRAINT uq_job_topic UNIQUE (job_id, topic_id);
+
+ALTER TABLE ONLY transcription_chunks
+    ADD CONSTRAINT uq_transcription_chunk UNIQUE (transcription_id, chunk_index);
+
+ALTER TABLE ONLY transcription_collections
+    ADD CONSTRAINT uq_transcription_collection UNIQUE (transcription_id, collection_id);
+
+ALTER TABLE ONLY transcription_topics
+    ADD CONSTRAINT uq_transcription_topic UNIQUE (transcription_id, topic_id);
+
+ALTER TABLE ONLY audio_files
+    ADD CONSTRAINT uq_user_checksum UNIQUE (user_id, checksum);
+
+ALTER TABLE ONLY users
+    ADD CONSTRAINT users_pkey PRIMARY KEY (id);
+
+CREATE INDEX idx_audio_files_checksum ON audio_files USING btree (checksum);
+
+CREATE INDEX idx_audio_files_created_at ON audio_files USING btree (created_at DESC);
+
+CREATE INDEX idx_audio_files_source_type ON audio_files USING btree (source_type);
+
+CREATE INDEX idx_audio_files_user_id ON audio_files USING btree (user_id);
+
+CREATE INDEX idx_jobs_audio_file_id ON jobs USING btree (audio_file_id);
+
+CREATE INDEX idx_jobs_job_type ON jobs USING btree (job_type);
+
+CREATE INDEX idx_transcription_chunks_embedding ON transcription_chunks USING ivfflat (embedding vector_cosine_ops);
+
+CREATE INDEX idx_transcription_chunks_transcription ON transcription_chunks USING btree (transcription_id);
+
+CREATE INDEX idx_transcription_collections_collection ON transcription_collections USING btree (collection_id);
+
+CREATE INDEX idx_transcription_collections_position ON transcription_collections USING btree ("position");
+
+CREATE INDEX idx_transcription_collections_transcription ON transcription_collections USING btree (transcription_id);
+
+CREATE INDEX idx_transcription_topics_low_confidence ON transcription_topics USING btree (ai_confidence) WHERE (ai_confidence < (0.5)::double precision);
+
+CREATE INDEX idx_transcription_topics_topic ON transcription_topics USING btree (topic_id);
+
+CREATE INDEX idx_transcription_topics_transcription ON transcription_topics USING btree (transcription_id);
+
+CREATE INDEX idx_transcription_topics_unreviewed ON transcription_topics USING btree (transcription_id) WHERE (user_reviewed = false);
+
+CREATE INDEX idx_transcriptions_audio_file ON transcriptions USING btree (audio_file_id);
+
+CREATE INDEX idx_transcriptions_created_at ON transcriptions USING btree (created_at DESC);
+
+CREATE INDEX idx_transcriptions_status ON transcriptions USING btree (status);
+
+CREATE INDEX idx_transcriptions_user_id ON transcriptions USING btree (user_id);
+
+ALTER TABLE ONLY audio_files
+    ADD CONSTRAINT audio_files_user_id_fkey FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE;
+
+ALTER TABLE ONLY collections
+    ADD CONSTRAINT collections_user_id_fkey FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE;
+
+ALTER TABLE ONLY jobs
+    ADD CONSTRAINT fk_jobs_audio_file_id FOREIGN KEY (audio_file_id) REFERENCES audio_files(id) ON DELETE SET NULL;
+
+ALTER TABLE ONLY users
+    ADD CONSTRAINT fk_users_role_id FOREIGN KEY (role_id) REFERENCES roles(id);
+
+ALTER TABLE ONLY job_chunks
+    ADD CONSTRAINT job_chunks_job_id_fkey FOREIGN KEY (job_id) REFERENCES jobs(id) ON DELETE CASCADE;
+
+ALTER TABLE ONLY job_collections
+    ADD CONSTRAINT job_collections_assigned_by_fkey FOREIGN KEY (assigned_by) REFERENCES users(id);
+
+ALTER TABLE ONLY job_collections
+    ADD CONSTRAINT job_collections_collection_id_fkey FOREIGN KEY (collection_id) REFERENCES collections(id) ON DELETE CASCADE;
+
+ALTER TABLE ONLY job_collections
+    ADD CONSTRAINT job_collections_job_id_fkey FOREIGN KEY (job_id) REFERENCES jobs(id) ON DELETE CASCADE;
+
+ALTER TABLE ONLY job_topics
+    ADD CONSTRAINT job_topics_assigned_by_fkey FOREIGN KEY (assigned_by) REFERENCES users(id);
+
+ALTER TABLE ONLY job_topics
+    ADD CONSTRAINT job_topics_job_id_fkey FOREIGN KEY (job_id) REFERENCES jobs(id) ON DELETE CASCADE;
+
+ALTER TABLE ONLY job_topics
+    ADD CONSTRAINT job_topics_topic_id_fkey FOREIGN KEY (topic_id) REFERENCES topics(id) ON DELETE CASCADE;
+
+ALTER TABLE ONLY jobs
+    ADD CONSTRAINT jobs_user_id_fkey FOREIGN KEY (user_id) REFERENCES users(id);
+
+ALTER TABLE ONLY topics
+    ADD CONSTRAINT topics_parent_id_fkey FOREIGN KEY (parent_id) REFERENCES topics(id);
+
+ALTER TABLE ONLY transcription_chunks
+    ADD CONSTRAINT transcription_chunks_transcription_id_fkey FOREIGN KEY (transcription_id) REFERENCES transcriptions(id) ON DELETE CASCADE;
+
+ALTER TABLE ONLY transcription_collections
+    ADD CONSTRAINT transcription_collections_assigned_by_fkey FOREIGN KEY (assigned_by) REFERENCES users(id);
+
+ALTER TABLE ONLY transcription_collections
+    ADD CONSTRAINT transcription_collections_collection_id_fkey FOREIGN KEY (collection_id) REFERENCES collections(id) ON DELETE CASCADE;
+
+ALTER TABLE ONLY transcription_collections
+    ADD CONSTRAINT transcription_collections_transcription_id_fkey FOREIGN KEY (transcription_id) REFERENCES transcriptions(id) ON DELETE CASCADE;
+
+ALTER TABLE ONLY transcription_topics
+    ADD CONSTRAINT transcription_topics_assigned_by_fkey FOREIGN KEY (assigned_by) REFERENCES users(id);
+
+ALTER TABLE ONLY transcription_topics
+    ADD CONSTRAINT transcription_topics_topic_id_fkey FOREIGN KEY (topic_id) REFERENCES topics(id) ON DELETE CASCADE;
+
+ALTER TABLE ONLY transcription_topics
+    ADD CONSTRAINT transcription_topics_transcription_id_fkey FOREIGN KEY (transcription_id) REFERENCES transcriptions(id) ON DELETE CASCADE;
+
+ALTER TABLE ONLY transcriptions
+    ADD CONSTRAINT transcriptions_audio_file_id_fkey FOREIGN KEY (audio_file_id) REFERENCES audio_files(id) ON DELETE CASCADE;
+
+ALTER TABLE ONLY transcriptions
+    ADD CONSTRAINT transcriptions_user_id_fkey FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE;
+
+ALTER TABLE ONLY users
+    ADD CONSTRAINT users_role_id_fkey FOREIGN KEY (role_id) REFERENCES roles(id);
+
+-- Default roles (seeded by e5f6g7h8i9j0)
+INSERT INTO roles (id, name, description, created_at) VALUES
+    (1, 'admin', 'Administrator with full access', now()),
+    (2, 'user', 'Regular user', now());
+
+SELECT setval('roles_id_seq', 2);
@@ -1,10 +1,12 @@
 import asyncio
 from logging.config import fileConfig
+from pathlib import Path
 
-from sqlalchemy import pool
+from sqlalchemy import inspect, pool
 from sqlalchemy.ext.asyncio import create_async_engine
 
 from alembic import context
+from alembic.script import ScriptDirectory
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -12,7 +14,8 @@ config = context.config
 
 # Interpret the config file for Python logging.
 # This line sets up loggers basically.
-if config.config_file_name is not None:
+# Skipped when the app runs migrations in-process (app/data/migrations.py).
+if config.config_file_name is not None and config.attributes.get("configure_logger", True):
     fileConfig(config.config_file_name)
 
 # add your model's MetaData object here
@@ -25,17 +28,62 @@ config.set_main_option("sqlalchemy.url", settings.database_url)
 
 target_metadata = Base.metadata
 
+# Session-level guards for every migration: a DDL statement waiting on an
+# ACCESS EXCLUSIVE lock queues all later queries on that table, so give up
+# quickly rather than block the application. Set per session (not SET LOCAL)
+# so they also apply inside autocommit_block() sections.
+migration_session_settings = {
+    "lock_timeout": settings.migration_lock_timeout,
+    "statement_timeout": settings.migration_statement_timeout,
+}
+
+# Squashed schema for fresh databases: equivalent to running the migration chain
+# up to BASELINE_REVISION. Revisions after it still run on top as usual.
+BASELINE_SCHEMA = Path(__file__).parent / "baseline" / "schema.sql"
+BASELINE_REVISION = "c91f4a7e3d05"
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
 # ... etc.
 
 
+def should_load_baseline(connection) -> bool:
+    """Whether this run is `upgrade head` against an empty database."""
+    migration_context = context.get_context()
+    migrations_fn = migration_context.opts.get("fn")
+    if getattr(migrations_fn, "__name__", None) != "upgrade":
+        return False  # stamp/downgrade/etc. must not create the schema
+
+    script = ScriptDirectory.from_config(config)
+    if context.get_revision_argument() != script.get_current_head():
+        return False
+
+    if migration_context.get_current_revision() is not None:
+        return False
+    return not inspect(connection).get_table_names()
+
+
+def load_baseline(connection) -> None:
+    """Create the squashed schema and stamp BASELINE_REVISION."""
+    sql = "\n".join(
+        line for line in BASELINE_SCHEMA.read_text().splitlines()
+        if not line.startswith("--")
+    )
+    for statement in sql.split(";\n"):
+        if statement.strip():
+            connection.exec_driver_sql(statement)
+
+    context.get_context().stamp(ScriptDirectory.from_config(config), BASELINE_REVISION)
+
+
 def do_run_migrations(connection):
     """Run migrations with the given connection."""
     context.configure(connection=connection, target_metadata=target_metadata)
 
     with context.begin_transaction():
+        if should_load_baseline(connection):
+            load_baseline(connection)
         context.run_migrations()
 
 
@@ -60,6 +108,8 @@ def run_migrations_offline() -> None:
     )
 
     with context.begin_transaction():
+        for name, value in migration_session_settings.items():
+            context.execute(f"SET {name} = '{value}'")
         context.run_migrations()
 
 
@@ -68,6 +118,7 @@ async def run_migrations_online_async() -> None:
     connectable = create_async_engine(
         config.get_main_option("sqlalchemy.url"),
         poolclass=pool.NullPool,
+        connect_args={"server_settings": migration_session_settings},
     )
 
     async with connectable.connect() as connection:
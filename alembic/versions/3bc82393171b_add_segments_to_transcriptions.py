@@ -9,6 +9,7 @@ from typing import Sequence, Union
 
 from alembic import op
 import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
 
 
 # revision identifiers, used by Alembic.
@@ -20,8 +21,8 @@ depends_on: Union[str, Sequence[str], None] = None
 
 def upgrade() -> None:
     """Upgrade schema."""
-    # Add segments column to transcriptions table
-    op.add_column('transcriptions', sa.Column('segments', sa.JSON(), nullable=True))
+    # Add segments column to transcriptions table (JSONB, matching the model)
+    op.add_column('transcriptions', sa.Column('segments', postgresql.JSONB(astext_type=sa.Text()), nullable=True))
 
 
 def downgrade() -> None:
@@ -27,13 +27,13 @@ def upgrade() -> None:
         sa.Column('name', sa.String(length=100), nullable=False),
         sa.Column('description', sa.Text(), nullable=True),
         sa.Column('parent_id', sa.Integer(), nullable=True),
-        sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
-        sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
         sa.ForeignKeyConstraint(['parent_id'], ['topics.id'], ),
         sa.PrimaryKeyConstraint('id'),
-        sa.UniqueConstraint('name')
+        sa.UniqueConstraint('name'),
+        sa.Index('idx_topics_parent_id', 'parent_id')
     )
-    op.create_index('idx_topics_parent_id', 'topics', ['parent_id'])
 
     # Create collections table
     op.create_table(
@@ -44,54 +44,60 @@ def upgrade() -> None:
         sa.Column('collection_type', sa.String(length=50), nullable=True),
         sa.Column('user_id', sa.String(length=255), nullable=False),
         sa.Column('is_public', sa.Boolean(), server_default='false', nullable=False),
-        sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
-        sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
         sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
-        sa.PrimaryKeyConstraint('id')
+        sa.PrimaryKeyConstraint('id'),
+        sa.Index('idx_collections_user_id', 'user_id'),
+        sa.Index('idx_collections_type', 'collection_type')
     )
-    op.create_index('idx_collections_user_id', 'collections', ['user_id'])
-    op.create_index('idx_collections_type', 'collections', ['collection_type'])
 
     # Create job_topics junction table
     op.create_table(
         'job_topics',
-        sa.Column('id', sa.Integer(), nullable=False),
-        sa.Column('job_id', sa.Integer(), nullable=False),
+        sa.Column('id', sa.BigInteger(), nullable=False),
+        sa.Column('job_id', sa.BigInteger(), nullable=False),
         sa.Column('topic_id', sa.Integer(), nullable=False),
         sa.Column('ai_confidence', sa.Float(), nullable=True),
         sa.Column('ai_reasoning', sa.Text(), nullable=True),
         sa.Column('assigned_by', sa.String(length=255), nullable=True),
         sa.Column('user_reviewed', sa.Boolean(), server_default='false', nullable=False),
-        sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
         sa.ForeignKeyConstraint(['job_id'], ['jobs.id'], ondelete='CASCADE'),
         sa.ForeignKeyConstraint(['topic_id'], ['topics.id'], ondelete='CASCADE'),
         sa.ForeignKeyConstraint(['assigned_by'], ['users.id'], ),
         sa.PrimaryKeyConstraint('id'),
-        sa.UniqueConstraint('job_id', 'topic_id', name='uq_job_topic')
+        # uq_job_topic (job_id, topic_id) also serves job_id lookups
+        sa.UniqueConstraint('job_id', 'topic_id', name='uq_job_topic'),
+        sa.Index('idx_job_topics_topic_id', 'topic_id'),
+        # Partial indexes for the review queue: only unreviewed and low-confidence
+        # assignments are ever filtered on, so index just those rows
+        sa.Index('idx_job_topics_unreviewed', 'job_id', postgresql_where=sa.text('user_reviewed = false')),
+        sa.Index('idx_job_topics_low_confidence', 'ai_confidence', postgresql_where=sa.text('ai_confidence < 0.5'))
     )
-    op.create_index('idx_job_topics_job_id', 'job_topics', ['job_id'])
-    op.create_index('idx_job_topics_topic_id', 'job_topics', ['topic_id'])
-    op.create_index('idx_job_topics_confidence', 'job_topics', ['ai_confidence'])
-    op.create_index('idx_job_topics_reviewed', 'job_topics', ['user_reviewed'])
 
     # Create job_collections junction table
     op.create_table(
         'job_collections',
-        sa.Column('id', sa.Integer(), nullable=False),
-        sa.Column('job_id', sa.Integer(), nullable=False),
+        sa.Column('id', sa.BigInteger(), nullable=False),
+        sa.Column('job_id', sa.BigInteger(), nullable=False),
         sa.Column('collection_id', sa.Integer(), nullable=False),
         sa.Column('position', sa.Integer(), nullable=True),
         sa.Column('assigned_by', sa.String(length=255), nullable=True),
-        sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
         sa.ForeignKeyConstraint(['job_id'], ['jobs.id'], ondelete='CASCADE'),
         sa.ForeignKeyConstraint(['collection_id'], ['collections.id'], ondelete='CASCADE'),
         sa.ForeignKeyConstraint(['assigned_by'], ['users.id'], ),
         sa.PrimaryKeyConstraint('id'),
-        sa.UniqueConstraint('job_id', 'collection_id', name='uq_job_collection')
+        # uq_job_collection (job_id, ...) and idx_job_collections_position
+        # (collection_id, ...) also serve the single-column lookups
+        sa.UniqueConstraint('job_id', 'collection_id', name='uq_job_collection'),
+        sa.Index('idx_job_collections_position', 'collection_id', 'position')
     )
-    op.create_index('idx_job_collections_job_id', 'job_collections', ['job_id'])
-    op.create_index('idx_job_collections_collection_id', 'job_collections', ['collection_id'])
-    op.create_index('idx_job_collections_position', 'job_collections', ['collection_id', 'position'])
+
+    # Assignments are inserted in bulk: let each session preallocate ids
+    op.execute('ALTER SEQUENCE job_topics_id_seq CACHE 50')
+    op.execute('ALTER SEQUENCE job_collections_id_seq CACHE 50')
 
 
 def downgrade() -> None:
@@ -8,8 +8,6 @@ Create Date: 2025-10-18 18:05:33.115811
 from typing import Sequence, Union
 
 from alembic import op
-import sqlalchemy as sa
-
 
 # revision identifiers, used by Alembic.
 revision: str = '4e0473c70895'
@@ -20,15 +18,23 @@ depends_on: Union[str, Sequence[str], None] = None
 
 def upgrade() -> None:
     """Upgrade schema - add Authentik token metadata columns to users table."""
-    op.add_column('users', sa.Column('authentik_token_identifier', sa.String(length=255), nullable=True))
-    op.add_column('users', sa.Column('token_created_at', sa.DateTime(), nullable=True))
-    op.add_column('users', sa.Column('token_expires_at', sa.DateTime(), nullable=True))
-    op.add_column('users', sa.Column('token_description', sa.String(length=500), nullable=True))
+    # Single ALTER TABLE so the users table is locked once for all four columns;
+    # IF NOT EXISTS keeps a re-run after a partial failure from erroring out
+    op.execute("""
+        ALTER TABLE users
+            ADD COLUMN IF NOT EXISTS authentik_token_identifier VARCHAR(255),
+            ADD COLUMN IF NOT EXISTS token_created_at TIMESTAMP WITHOUT TIME ZONE,
+            ADD COLUMN IF NOT EXISTS token_expires_at TIMESTAMP WITHOUT TIME ZONE,
+            ADD COLUMN IF NOT EXISTS token_description VARCHAR(500)
+    """)
 
 
 def downgrade() -> None:
     """Downgrade schema - remove Authentik token metadata columns from users table."""
-    op.drop_column('users', 'token_description')
-    op.drop_column('users', 'token_expires_at')
-    op.drop_column('users', 'token_created_at')
-    op.drop_column('users', 'authentik_token_identifier')
+    op.execute("""
+        ALTER TABLE users
+            DROP COLUMN IF EXISTS token_description,
+            DROP COLUMN IF EXISTS token_expires_at,
+            DROP COLUMN IF EXISTS token_created_at,
+            DROP COLUMN IF EXISTS authentik_token_identifier
+    """)
@@ -0,0 +1,35 @@
+"""convert_segments_to_jsonb
+
+Revision ID: 7a3e9c51d2b4
+Revises: 3bc82393171b
+Create Date: 2025-10-21 10:12:44.218309
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '7a3e9c51d2b4'
+down_revision: Union[str, Sequence[str], None] = '3bc82393171b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # transcriptions.segments was created as JSON on older databases; this is
+    # a no-op where 3bc82393171b already created it as JSONB
+    op.execute("ALTER TABLE transcriptions ALTER COLUMN segments TYPE jsonb USING segments::jsonb")
+
+    # jobs.segments holds serialized Whisper segments as TEXT; empty strings
+    # are not valid JSON, so store them as NULL
+    op.execute(
+        "ALTER TABLE jobs ALTER COLUMN segments TYPE jsonb USING NULLIF(segments, '')::jsonb"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("ALTER TABLE jobs ALTER COLUMN segments TYPE text USING segments::text")
+    # transcriptions.segments stays JSONB; 3bc82393171b drops the column
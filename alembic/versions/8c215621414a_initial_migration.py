@@ -27,8 +27,8 @@ def upgrade() -> None:
         sa.Column('filename', sa.String(length=255), nullable=False),
         sa.Column('status', sa.String(length=50), nullable=False, default='pending'),
         sa.Column('transcript', sa.Text(), nullable=True),
-        sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.text('now()')),
-        sa.Column('updated_at', sa.DateTime(), nullable=False, server_default=sa.text('now()')),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.text('now()')),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.text('now()')),
         sa.PrimaryKeyConstraint('id')
     )
 
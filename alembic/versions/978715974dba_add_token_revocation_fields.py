@@ -8,8 +8,6 @@ Create Date: 2025-10-18 21:28:45.415906
 from typing import Sequence, Union
 
 from alembic import op
-import sqlalchemy as sa
-
 
 # revision identifiers, used by Alembic.
 revision: str = '978715974dba'
@@ -20,17 +18,21 @@ depends_on: Union[str, Sequence[str], None] = None
 
 def upgrade() -> None:
     """Upgrade schema."""
-    # Add current_token_jti column
-    op.add_column('users', sa.Column('current_token_jti', sa.String(255), nullable=True))
-    
-    # Add token_revocation_counter column
-    op.add_column('users', sa.Column('token_revocation_counter', sa.Integer(), nullable=False, server_default='0'))
+    # Add current_token_jti and token_revocation_counter in a single ALTER TABLE
+    # (the constant default lets Postgres add the NOT NULL column without a rewrite);
+    # IF NOT EXISTS keeps a re-run after a partial failure from erroring out
+    op.execute("""
+        ALTER TABLE users
+            ADD COLUMN IF NOT EXISTS current_token_jti VARCHAR(255),
+            ADD COLUMN IF NOT EXISTS token_revocation_counter INTEGER DEFAULT '0' NOT NULL
+    """)
 
 
 def downgrade() -> None:
     """Downgrade schema."""
-    # Remove token_revocation_counter column
-    op.drop_column('users', 'token_revocation_counter')
-    
-    # Remove current_token_jti column
-    op.drop_column('users', 'current_token_jti')
+    # Remove token_revocation_counter and current_token_jti columns
+    op.execute("""
+        ALTER TABLE users
+            DROP COLUMN IF EXISTS token_revocation_counter,
+            DROP COLUMN IF EXISTS current_token_jti
+    """)
@@ -0,0 +1,94 @@
+"""use_enums_for_status_columns
+
+Revision ID: a2f6d8b4c195
+Revises: e1a8c5f3b762
+Create Date: 2025-10-30 14:48:22.370516
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'a2f6d8b4c195'
+down_revision: Union[str, Sequence[str], None] = 'e1a8c5f3b762'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PROCESSING_STATUSES = ('pending', 'processing', 'completed', 'failed')
+
+# Enum types and their labels
+ENUM_TYPES = {
+    'job_status': PROCESSING_STATUSES,
+    'transcription_status': PROCESSING_STATUSES,
+    'job_type': ('download', 'transcription'),
+    'audio_source_type': ('upload', 'download'),
+}
+
+# Columns converted from VARCHAR(50), per table: (column, enum type, server default)
+ENUM_COLUMNS = {
+    'jobs': [('status', 'job_status', None), ('job_type', 'job_type', 'transcription')],
+    'transcriptions': [('status', 'transcription_status', None)],
+    'audio_files': [('source_type', 'audio_source_type', None)],
+}
+
+
+def _check_values() -> None:
+    # A value outside the enum would abort the conversion halfway through with
+    # a bare cast error; name the offending rows instead
+    bind = op.get_bind()
+    for table_name, columns in ENUM_COLUMNS.items():
+        for column_name, type_name, _ in columns:
+            unknown = bind.execute(
+                sa.text(
+                    f'SELECT DISTINCT {column_name} FROM {table_name} '
+                    f'WHERE {column_name} IS NOT NULL AND {column_name} <> ALL(:labels)'
+                ),
+                {"labels": list(ENUM_TYPES[type_name])}
+            ).scalars().all()
+            if unknown:
+                raise RuntimeError(
+                    f"{table_name}.{column_name} has values outside {type_name} "
+                    f"({', '.join(map(repr, unknown))}); update those rows and retry"
+                )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _check_values()
+    for type_name, labels in ENUM_TYPES.items():
+        values = ', '.join(repr(label) for label in labels)
+        op.execute(f"CREATE TYPE {type_name} AS ENUM ({values})")
+
+    # One ALTER TABLE per table, so each table (and its indexes on these
+    # columns) is rewritten once, under ACCESS EXCLUSIVE
+    for table_name, columns in ENUM_COLUMNS.items():
+        clauses = []
+        for column_name, type_name, default in columns:
+            if default is not None:
+                # The VARCHAR default cannot be cast along with the column
+                clauses.append(f'ALTER COLUMN {column_name} DROP DEFAULT')
+            clauses.append(
+                f'ALTER COLUMN {column_name} TYPE {type_name} USING {column_name}::{type_name}'
+            )
+            if default is not None:
+                clauses.append(f"ALTER COLUMN {column_name} SET DEFAULT '{default}'")
+        op.execute(f"ALTER TABLE {table_name} {', '.join(clauses)}")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table_name, columns in ENUM_COLUMNS.items():
+        clauses = []
+        for column_name, _, default in columns:
+            if default is not None:
+                clauses.append(f'ALTER COLUMN {column_name} DROP DEFAULT')
+            clauses.append(f'ALTER COLUMN {column_name} TYPE varchar(50) USING {column_name}::text')
+            if default is not None:
+                clauses.append(f"ALTER COLUMN {column_name} SET DEFAULT '{default}'")
+        op.execute(f"ALTER TABLE {table_name} {', '.join(clauses)}")
+
+    for type_name in ENUM_TYPES:
+        op.execute(f'DROP TYPE {type_name}')
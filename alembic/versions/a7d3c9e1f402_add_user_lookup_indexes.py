@@ -0,0 +1,44 @@
+"""add_user_lookup_indexes
+
+Revision ID: a7d3c9e1f402
+Revises: e27b8f90c4a6
+Create Date: 2025-10-23 10:12:37.418290
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7d3c9e1f402'
+down_revision: Union[str, Sequence[str], None] = 'e27b8f90c4a6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Per-user job listings filter jobs by user_id, the management scripts look
+# users up by preferred_username, and chunk search joins job_chunks to jobs.
+# job_chunks.job_id lost its covering index when dbe1c2f7c955 dropped
+# uq_job_chunk_index.
+LOOKUP_INDEXES = [
+    ('idx_jobs_user_id', 'jobs', 'user_id'),
+    ('idx_users_preferred_username', 'users', 'preferred_username'),
+    ('idx_job_chunks_job_id', 'job_chunks', 'job_id'),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Live tables - build CONCURRENTLY so writes are not blocked
+    with op.get_context().autocommit_block():
+        for index_name, table_name, column_name in LOOKUP_INDEXES:
+            op.execute(
+                f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {index_name} '
+                f'ON {table_name} ({column_name})'
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for index_name, _, _ in LOOKUP_INDEXES:
+            op.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {index_name}')
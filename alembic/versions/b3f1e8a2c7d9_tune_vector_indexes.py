@@ -0,0 +1,91 @@
+"""tune_vector_indexes
+
+Revision ID: b3f1e8a2c7d9
+Revises: a7d3c9e1f402
+Create Date: 2025-10-24 14:03:18.552104
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3f1e8a2c7d9'
+down_revision: Union[str, Sequence[str], None] = 'a7d3c9e1f402'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Session settings for the HNSW index builds
+HNSW_MAINTENANCE_WORK_MEM = '2GB'
+HNSW_PARALLEL_WORKERS = 7
+
+# Chunk embedding indexes: (index, table)
+HNSW_INDEXES = [
+    ('idx_job_chunks_embedding_hnsw', 'job_chunks'),
+    ('idx_transcription_chunks_embedding_hnsw', 'transcription_chunks'),
+]
+
+# HNSW build parameters by rows: (exclusive upper bound, m, ef_construction).
+# Pinned here, like the DDL below, so this revision never changes with
+# app.data.vector_index
+HNSW_TIERS = [
+    (100_000, 16, 64),
+    (1_000_000, 24, 100),
+    (None, 32, 128),
+]
+
+# Planner estimate of a table's rows (reltuples is -1 before the first
+# VACUUM/ANALYZE)
+ESTIMATED_ROWS_SQL = (
+    "SELECT GREATEST(reltuples, 0)::bigint FROM pg_class WHERE oid = CAST(:table AS regclass)"
+)
+
+
+def _create_index_sql(index_name: str, table_name: str, row_count: int, opclass: str) -> str:
+    m, ef_construction = next(
+        (m, ef_construction) for limit, m, ef_construction in HNSW_TIERS
+        if limit is None or row_count < limit
+    )
+    return (
+        f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {index_name} ON {table_name} '
+        f'USING hnsw (embedding {opclass}) WITH (m = {m}, ef_construction = {ef_construction})'
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Live tables: build CONCURRENTLY (outside the migration transaction) so writes
+    # are not blocked, with a larger working set and parallel workers for this
+    # session only
+    with op.get_context().autocommit_block():
+        op.execute(f"SET maintenance_work_mem = '{HNSW_MAINTENANCE_WORK_MEM}'")
+        op.execute(f'SET max_parallel_maintenance_workers = {HNSW_PARALLEL_WORKERS}')
+        # A concurrent build does not block writers, so it is exempt from the
+        # migration statement_timeout
+        op.execute('SET statement_timeout = 0')
+        # dbe1c2f7c955 dropped the job_chunks HNSW index, and the transcription_chunks
+        # IVFFlat index was built on an empty table, so its lists are useless.
+        # Size each graph for the rows it will hold
+        bind = op.get_bind()
+        for index_name, table_name in HNSW_INDEXES:
+            row_count = bind.execute(sa.text(ESTIMATED_ROWS_SQL), {"table": table_name}).scalar()
+            op.execute(_create_index_sql(index_name, table_name, row_count, 'vector_cosine_ops'))
+        op.execute('DROP INDEX CONCURRENTLY IF EXISTS idx_transcription_chunks_embedding')
+        op.execute('RESET maintenance_work_mem')
+        op.execute('RESET max_parallel_maintenance_workers')
+        op.execute('RESET statement_timeout')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.execute('SET statement_timeout = 0')
+        op.execute(
+            'CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_transcription_chunks_embedding '
+            'ON transcription_chunks USING ivfflat (embedding vector_cosine_ops)'
+        )
+        for index_name, _ in HNSW_INDEXES:
+            op.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {index_name}')
+        op.execute('RESET statement_timeout')
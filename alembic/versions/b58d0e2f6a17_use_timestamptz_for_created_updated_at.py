@@ -0,0 +1,77 @@
+"""use_timestamptz_for_created_updated_at
+
+Revision ID: b58d0e2f6a17
+Revises: 7a3e9c51d2b4
+Create Date: 2025-10-21 14:03:27.551902
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'b58d0e2f6a17'
+down_revision: Union[str, Sequence[str], None] = '7a3e9c51d2b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Row timestamps written by DEFAULT now(); existing values are UTC
+TIMESTAMP_COLUMNS = [
+    ('jobs', 'created_at'),
+    ('jobs', 'updated_at'),
+    ('users', 'created_at'),
+    ('users', 'updated_at'),
+    ('roles', 'created_at'),
+    ('job_chunks', 'created_at'),
+    ('topics', 'created_at'),
+    ('topics', 'updated_at'),
+    ('collections', 'created_at'),
+    ('collections', 'updated_at'),
+    ('job_topics', 'created_at'),
+    ('job_collections', 'created_at'),
+    ('audio_files', 'created_at'),
+    ('audio_files', 'updated_at'),
+    ('transcriptions', 'created_at'),
+    ('transcriptions', 'updated_at'),
+    ('transcription_chunks', 'created_at'),
+    ('transcription_topics', 'created_at'),
+    ('transcription_collections', 'created_at'),
+]
+
+
+def _convert(table: str, column: str, from_type: str, to_type: str) -> None:
+    """Change a column type only if it still has from_type.
+
+    Databases created after the earlier migrations were switched to
+    timestamptz already have the new type, so the check happens server-side
+    (this also keeps offline --sql output correct).
+    """
+    op.execute(f"""
+        DO $$
+        BEGIN
+            IF EXISTS (
+                SELECT 1 FROM information_schema.columns
+                WHERE table_schema = current_schema()
+                  AND table_name = '{table}'
+                  AND column_name = '{column}'
+                  AND data_type = '{from_type}'
+            ) THEN
+                ALTER TABLE {table} ALTER COLUMN {column} TYPE {to_type}
+                    USING {column} AT TIME ZONE 'UTC';
+            END IF;
+        END
+        $$
+    """)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # One-time rewrite of each table; run during a maintenance window
+    for table, column in TIMESTAMP_COLUMNS:
+        _convert(table, column, 'timestamp without time zone', 'timestamptz')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table, column in reversed(TIMESTAMP_COLUMNS):
+        _convert(table, column, 'timestamp with time zone', 'timestamp')
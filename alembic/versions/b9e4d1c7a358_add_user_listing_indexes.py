@@ -0,0 +1,61 @@
+"""add_user_listing_indexes
+
+Revision ID: b9e4d1c7a358
+Revises: f3c7b2d8a416
+Create Date: 2025-10-29 15:26:51.904117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'b9e4d1c7a358'
+down_revision: Union[str, Sequence[str], None] = 'f3c7b2d8a416'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# The list endpoints filter by user and page newest first. With user_id alone
+# indexed, Postgres fetches every row of the user and sorts them for each page;
+# these return a page straight off the index. The audio file index also
+# carries the library listing's summary columns, for index-only scans.
+LISTING_INDEXES = [
+    ('ix_jobs_user_status_created', 'jobs', 'user_id, status, created_at DESC'),
+    ('ix_transcriptions_user_created', 'transcriptions', 'user_id, created_at DESC'),
+    (
+        'ix_audio_files_user_created',
+        'audio_files',
+        'user_id, created_at DESC) INCLUDE (id, original_filename, duration, file_size',
+    ),
+]
+
+# Single-column indexes the composites above (and uq_user_checksum for audio
+# files) lead with; dropping them saves a write per insert
+REDUNDANT_INDEXES = [
+    ('idx_jobs_user_id', 'jobs', 'user_id'),
+    ('idx_transcriptions_user_id', 'transcriptions', 'user_id'),
+    ('idx_audio_files_user_id', 'audio_files', 'user_id'),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Live tables - build CONCURRENTLY so writes are not blocked
+    with op.get_context().autocommit_block():
+        for index_name, table_name, columns in LISTING_INDEXES:
+            op.execute(
+                f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {index_name} ON {table_name} ({columns})'
+            )
+        for index_name, _, _ in REDUNDANT_INDEXES:
+            op.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {index_name}')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for index_name, table_name, columns in REDUNDANT_INDEXES:
+            op.execute(
+                f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {index_name} ON {table_name} ({columns})'
+            )
+        for index_name, _, _ in LISTING_INDEXES:
+            op.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {index_name}')
@@ -0,0 +1,62 @@
+"""compress_transcripts_with_lz4
+
+Revision ID: c4b7e2a9d613
+Revises: a2f6d8b4c195
+Create Date: 2025-10-31 09:27:40.118652
+
+"""
+import logging
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import context, op
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4b7e2a9d613'
+down_revision: Union[str, Sequence[str], None] = 'a2f6d8b4c195'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+logger = logging.getLogger('alembic.runtime.migration')
+
+# The largest values per row: Whisper's segment JSON and the full transcript,
+# always read and written whole. LZ4 decompresses several times faster than
+# the default pglz at a similar ratio
+LZ4_COLUMNS = [
+    ('transcriptions', 'segments'),
+    ('transcriptions', 'transcript'),
+]
+
+
+def _lz4_supported() -> bool:
+    # Offline (--sql) output has no server to ask: emit the ALTERs, which fail
+    # on a server without LZ4 when the script is applied
+    if context.is_offline_mode():
+        return True
+    # PostgreSQL 14+ built with --with-lz4 lists it as a TOAST compression method
+    return bool(op.get_bind().execute(sa.text(
+        "SELECT 'lz4' = ANY(enumvals) FROM pg_settings WHERE name = 'default_toast_compression'"
+    )).scalar())
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if not _lz4_supported():
+        logger.warning('Server has no LZ4 TOAST compression (PostgreSQL 14+ built with lz4); '
+                       'transcripts stay pglz-compressed')
+        return
+    # Catalog-only: applies to values written from now on. Existing values
+    # keep pglz until the table is rewritten (VACUUM FULL, pg_repack)
+    for table_name, column_name in LZ4_COLUMNS:
+        op.execute(f'ALTER TABLE {table_name} ALTER COLUMN {column_name} SET COMPRESSION lz4')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if not _lz4_supported():
+        return
+    for table_name, column_name in LZ4_COLUMNS:
+        op.execute(
+            f'ALTER TABLE {table_name} ALTER COLUMN {column_name} SET COMPRESSION DEFAULT'
+        )
@@ -0,0 +1,111 @@
+"""store_chunk_embeddings_as_halfvec
+
+Revision ID: c8e2a5d4f913
+Revises: b3f1e8a2c7d9
+Create Date: 2025-10-27 09:41:05.873316
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'c8e2a5d4f913'
+down_revision: Union[str, Sequence[str], None] = 'b3f1e8a2c7d9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Session settings for the HNSW index builds
+HNSW_MAINTENANCE_WORK_MEM = '2GB'
+HNSW_PARALLEL_WORKERS = 7
+
+# Chunk embedding indexes: (index, table)
+HNSW_INDEXES = [
+    ('idx_job_chunks_embedding_hnsw', 'job_chunks'),
+    ('idx_transcription_chunks_embedding_hnsw', 'transcription_chunks'),
+]
+
+# HNSW build parameters by rows: (exclusive upper bound, m, ef_construction).
+# Pinned here, like the DDL below, so this revision never changes with
+# app.data.vector_index
+HNSW_TIERS = [
+    (100_000, 16, 64),
+    (1_000_000, 24, 100),
+    (None, 32, 128),
+]
+
+# Planner estimate of a table's rows (reltuples is -1 before the first
+# VACUUM/ANALYZE)
+ESTIMATED_ROWS_SQL = (
+    "SELECT GREATEST(reltuples, 0)::bigint FROM pg_class WHERE oid = CAST(:table AS regclass)"
+)
+
+# First pgvector release with the halfvec type
+MIN_HALFVEC_VERSION = (0, 7)
+
+
+def _create_index_sql(index_name: str, table_name: str, row_count: int, opclass: str) -> str:
+    m, ef_construction = next(
+        (m, ef_construction) for limit, m, ef_construction in HNSW_TIERS
+        if limit is None or row_count < limit
+    )
+    return (
+        f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {index_name} ON {table_name} '
+        f'USING hnsw (embedding {opclass}) WITH (m = {m}, ef_construction = {ef_construction})'
+    )
+
+
+def _convert_embeddings(column_type: str, opclass: str) -> None:
+    # The HNSW operator class is tied to the column type, so the indexes are
+    # dropped first and rebuilt for the new type
+    with op.get_context().autocommit_block():
+        for index_name, _ in HNSW_INDEXES:
+            op.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {index_name}')
+
+    # Rewrites each table under ACCESS EXCLUSIVE; with no index left to rebuild
+    # this is a single sequential pass
+    for _, table_name in HNSW_INDEXES:
+        op.execute(
+            f'ALTER TABLE {table_name} ALTER COLUMN embedding '
+            f'TYPE {column_type} USING embedding::{column_type}'
+        )
+
+    with op.get_context().autocommit_block():
+        op.execute(f"SET maintenance_work_mem = '{HNSW_MAINTENANCE_WORK_MEM}'")
+        op.execute(f'SET max_parallel_maintenance_workers = {HNSW_PARALLEL_WORKERS}')
+        # A concurrent build does not block writers, so it is exempt from the
+        # migration statement_timeout
+        op.execute('SET statement_timeout = 0')
+        bind = op.get_bind()
+        for index_name, table_name in HNSW_INDEXES:
+            row_count = bind.execute(sa.text(ESTIMATED_ROWS_SQL), {"table": table_name}).scalar()
+            op.execute(_create_index_sql(index_name, table_name, row_count, opclass))
+        op.execute('RESET maintenance_work_mem')
+        op.execute('RESET max_parallel_maintenance_workers')
+        op.execute('RESET statement_timeout')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # halfvec needs pgvector 0.7+. A database created under an older release
+    # keeps the old extension version until it is updated explicitly
+    op.execute('ALTER EXTENSION vector UPDATE')
+    version = op.get_bind().execute(
+        sa.text("SELECT extversion FROM pg_extension WHERE extname = 'vector'")
+    ).scalar()
+    if tuple(int(part) for part in version.split('.')[:2]) < MIN_HALFVEC_VERSION:
+        raise RuntimeError(
+            f"pgvector {version} does not support halfvec; install pgvector 0.7 or "
+            "later on the database server (e.g. the pgvector/pgvector image) and retry"
+        )
+
+    # Half precision halves the bytes per embedding (768 instead of 1536) in
+    # the table and the index
+    _convert_embeddings('halfvec(384)', 'halfvec_cosine_ops')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _convert_embeddings('vector(384)', 'vector_cosine_ops')
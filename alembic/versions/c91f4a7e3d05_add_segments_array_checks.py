@@ -0,0 +1,39 @@
+"""add_segments_array_checks
+
+Revision ID: c91f4a7e3d05
+Revises: b58d0e2f6a17
+Create Date: 2025-10-21 16:48:09.730214
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'c91f4a7e3d05'
+down_revision: Union[str, Sequence[str], None] = 'b58d0e2f6a17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Whisper segments are always a JSON array. Added NOT VALID: new writes are
+    # checked immediately, existing rows are not scanned at deploy time. Validate
+    # off-hours with:
+    #   ALTER TABLE jobs VALIDATE CONSTRAINT jobs_segments_is_array;
+    #   ALTER TABLE transcriptions VALIDATE CONSTRAINT transcriptions_segments_is_array;
+    op.execute(
+        "ALTER TABLE jobs ADD CONSTRAINT jobs_segments_is_array "
+        "CHECK (segments IS NULL OR jsonb_typeof(segments) = 'array') NOT VALID"
+    )
+    op.execute(
+        "ALTER TABLE transcriptions ADD CONSTRAINT transcriptions_segments_is_array "
+        "CHECK (segments IS NULL OR jsonb_typeof(segments) = 'array') NOT VALID"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('transcriptions_segments_is_array', 'transcriptions', type_='check')
+    op.drop_constraint('jobs_segments_is_array', 'jobs', type_='check')
@@ -9,7 +9,7 @@ from typing import Sequence, Union
 
 import sqlalchemy as sa
 
-from alembic import op
+from alembic import context, op
 
 # revision identifiers, used by Alembic.
 revision: str = 'cbb495b34d80'
@@ -17,10 +17,43 @@ down_revision: Union[str, Sequence[str], None] = '8c215621414a'
 branch_labels: Union[str, Sequence[str], None] = None
 depends_on: Union[str, Sequence[str], None] = None
 
+BACKFILL_BATCH_SIZE = 1000
+
 
 def upgrade() -> None:
     """Upgrade schema."""
-    op.add_column('jobs', sa.Column('file_path', sa.String(length=500), nullable=False))
+    # Add the column nullable first - a NOT NULL column without a default would
+    # have to be validated against every existing row under an ACCESS EXCLUSIVE lock
+    op.add_column('jobs', sa.Column('file_path', sa.String(length=500), nullable=True))
+
+    # Backfill existing rows in small batches, each committed on its own (autocommit)
+    # so row locks are released after every batch rather than at the end of the
+    # migration (offline --sql output has no row counts to loop on, so emit a
+    # single UPDATE)
+    if context.is_offline_mode():
+        op.execute("UPDATE jobs SET file_path = '' WHERE file_path IS NULL")
+    else:
+        with op.get_context().autocommit_block():
+            conn = op.get_bind()
+            while True:
+                result = conn.execute(sa.text(
+                    "UPDATE jobs SET file_path = '' WHERE id IN "
+                    "(SELECT id FROM jobs WHERE file_path IS NULL LIMIT :batch_size)"
+                ), {"batch_size": BACKFILL_BATCH_SIZE})
+                if result.rowcount == 0:
+                    break
+
+    # Enforce NOT NULL via a CHECK constraint added NOT VALID and validated in its own
+    # transaction (SHARE UPDATE EXCLUSIVE lock only). With a valid CHECK in place,
+    # SET NOT NULL skips the full-table scan.
+    op.execute(
+        "ALTER TABLE jobs ADD CONSTRAINT jobs_file_path_not_null "
+        "CHECK (file_path IS NOT NULL) NOT VALID"
+    )
+    with op.get_context().autocommit_block():
+        op.execute("ALTER TABLE jobs VALIDATE CONSTRAINT jobs_file_path_not_null")
+    op.alter_column('jobs', 'file_path', existing_type=sa.String(length=500), nullable=False)
+    op.drop_constraint('jobs_file_path_not_null', 'jobs', type_='check')
 
 
 def downgrade() -> None:
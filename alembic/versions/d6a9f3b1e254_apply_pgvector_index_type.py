@@ -0,0 +1,111 @@
+"""apply_pgvector_index_type
+
+Revision ID: d6a9f3b1e254
+Revises: c8e2a5d4f913
+Create Date: 2025-10-28 11:12:47.209381
+
+"""
+import math
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+from app.config import settings
+
+# revision identifiers, used by Alembic.
+revision: str = 'd6a9f3b1e254'
+down_revision: Union[str, Sequence[str], None] = 'c8e2a5d4f913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Session settings for the index builds
+MAINTENANCE_WORK_MEM = '2GB'
+PARALLEL_WORKERS = 7
+
+# PGVECTOR_INDEX_TYPE only picks between the two index sets below. Their
+# names, operator class, sizing and DDL are pinned here rather than taken from
+# app.data.vector_index, so this revision always builds the same indexes
+VECTOR_INDEXES = {
+    'hnsw': [
+        ('idx_job_chunks_embedding_hnsw', 'job_chunks'),
+        ('idx_transcription_chunks_embedding_hnsw', 'transcription_chunks'),
+    ],
+    'ivfflat': [
+        ('idx_job_chunks_embedding_ivfflat', 'job_chunks'),
+        ('idx_transcription_chunks_embedding_ivfflat', 'transcription_chunks'),
+    ],
+}
+INDEX_OPCLASS = 'halfvec_cosine_ops'
+
+# HNSW build parameters by rows: (exclusive upper bound, m, ef_construction)
+HNSW_TIERS = [
+    (100_000, 16, 64),
+    (1_000_000, 24, 100),
+    (None, 32, 128),
+]
+# Above this many rows IVFFlat uses sqrt(rows) lists instead of rows / 1000
+IVFFLAT_SQRT_THRESHOLD = 1_000_000
+
+# Planner estimate of a table's rows (reltuples is -1 before the first
+# VACUUM/ANALYZE)
+ESTIMATED_ROWS_SQL = (
+    "SELECT GREATEST(reltuples, 0)::bigint FROM pg_class WHERE oid = CAST(:table AS regclass)"
+)
+
+
+def _create_index_sql(index_type: str, index_name: str, table_name: str, row_count: int) -> str:
+    if index_type == 'hnsw':
+        m, ef_construction = next(
+            (m, ef_construction) for limit, m, ef_construction in HNSW_TIERS
+            if limit is None or row_count < limit
+        )
+        options = f'm = {m}, ef_construction = {ef_construction}'
+    elif row_count < IVFFLAT_SQRT_THRESHOLD:
+        options = f'lists = {max(row_count // 1000, 1)}'
+    else:
+        options = f'lists = {math.isqrt(row_count)}'
+    return (
+        f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {index_name} ON {table_name} '
+        f'USING {index_type} (embedding {INDEX_OPCLASS}) WITH ({options})'
+    )
+
+
+def _use_index_type(index_type: str) -> None:
+    # Build the new indexes before dropping the old ones, so searches stay
+    # indexed throughout
+    with op.get_context().autocommit_block():
+        op.execute(f"SET maintenance_work_mem = '{MAINTENANCE_WORK_MEM}'")
+        op.execute(f'SET max_parallel_maintenance_workers = {PARALLEL_WORKERS}')
+        # A concurrent build does not block writers, so it is exempt from the
+        # migration statement_timeout
+        op.execute('SET statement_timeout = 0')
+        bind = op.get_bind()
+        for index_name, table_name in VECTOR_INDEXES[index_type]:
+            row_count = bind.execute(sa.text(ESTIMATED_ROWS_SQL), {"table": table_name}).scalar()
+            op.execute(_create_index_sql(index_type, index_name, table_name, row_count))
+        for other_type, indexes in VECTOR_INDEXES.items():
+            if other_type != index_type:
+                for index_name, _ in indexes:
+                    op.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {index_name}')
+        op.execute('RESET maintenance_work_mem')
+        op.execute('RESET max_parallel_maintenance_workers')
+        op.execute('RESET statement_timeout')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # PGVECTOR_INDEX_TYPE picks the index at migration time; nothing changes
+    # with the default (hnsw). Switch an existing database later with
+    # scripts/manage_vector_indexes.py rebuild
+    if settings.pgvector_index_type not in VECTOR_INDEXES:
+        raise RuntimeError(
+            f"PGVECTOR_INDEX_TYPE must be one of {', '.join(VECTOR_INDEXES)}, "
+            f"not {settings.pgvector_index_type!r}"
+        )
+    _use_index_type(settings.pgvector_index_type)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _use_index_type('hnsw')
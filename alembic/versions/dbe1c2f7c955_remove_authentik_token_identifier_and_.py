@@ -26,11 +26,18 @@ def upgrade() -> None:
                type_=sa.ARRAY(sa.String()),
                existing_nullable=True)
     op.drop_index(op.f('job_chunks_embedding_idx'), table_name='job_chunks', postgresql_ops={'embedding': 'vector_cosine_ops'}, postgresql_using='hnsw')
+    # Together with uq_job_chunk_index below this leaves job_chunks.job_id unindexed;
+    # a7d3c9e1f402 restores it as idx_job_chunks_job_id
     op.drop_index(op.f('job_chunks_job_id_idx'), table_name='job_chunks')
     op.drop_constraint(op.f('uq_job_chunk_index'), 'job_chunks', type_='unique')
     op.drop_index(op.f('jobs_embedding_idx'), table_name='jobs', postgresql_ops={'embedding': 'vector_cosine_ops'}, postgresql_using='hnsw')
-    op.create_foreign_key(None, 'jobs', 'users', ['user_id'], ['id'])
-    op.create_foreign_key(None, 'users', 'roles', ['role_id'], ['id'])
+    # jobs and users are populated tables: add the foreign keys NOT VALID (no scan) and
+    # validate them in a separate transaction that only takes SHARE UPDATE EXCLUSIVE
+    op.create_foreign_key('jobs_user_id_fkey', 'jobs', 'users', ['user_id'], ['id'], postgresql_not_valid=True)
+    op.create_foreign_key('users_role_id_fkey', 'users', 'roles', ['role_id'], ['id'], postgresql_not_valid=True)
+    with op.get_context().autocommit_block():
+        op.execute('ALTER TABLE jobs VALIDATE CONSTRAINT jobs_user_id_fkey')
+        op.execute('ALTER TABLE users VALIDATE CONSTRAINT users_role_id_fkey')
     op.drop_column('users', 'authentik_token_identifier')
     op.drop_column('users', 'token_description')
     # ### end Alembic commands ###
@@ -41,8 +48,8 @@ def downgrade() -> None:
     # ### commands auto generated by Alembic - please adjust! ###
     op.add_column('users', sa.Column('token_description', sa.VARCHAR(length=500), autoincrement=False, nullable=True))
     op.add_column('users', sa.Column('authentik_token_identifier', sa.VARCHAR(length=255), autoincrement=False, nullable=True))
-    op.drop_constraint(None, 'users', type_='foreignkey')
-    op.drop_constraint(None, 'jobs', type_='foreignkey')
+    op.drop_constraint('users_role_id_fkey', 'users', type_='foreignkey')
+    op.drop_constraint('jobs_user_id_fkey', 'jobs', type_='foreignkey')
     op.create_index(op.f('jobs_embedding_idx'), 'jobs', ['embedding'], unique=False, postgresql_ops={'embedding': 'vector_cosine_ops'}, postgresql_using='hnsw')
     op.create_unique_constraint(op.f('uq_job_chunk_index'), 'job_chunks', ['job_id', 'chunk_index'], postgresql_nulls_not_distinct=False)
     op.create_index(op.f('job_chunks_job_id_idx'), 'job_chunks', ['job_id'], unique=False)
@@ -0,0 +1,45 @@
+"""store_audio_checksums_as_bytea
+
+Revision ID: e1a8c5f3b762
+Revises: b9e4d1c7a358
+Create Date: 2025-10-30 10:03:18.552914
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'e1a8c5f3b762'
+down_revision: Union[str, Sequence[str], None] = 'b9e4d1c7a358'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The raw SHA-256 digest is 32 bytes instead of 64 hex characters, which
+    # halves uq_user_checksum and idx_audio_files_checksum. Rewrites the table
+    # and both indexes under ACCESS EXCLUSIVE (one row per file, so quick).
+    # Anything that isn't a SHA-256 hex digest (hand-made rows) keeps its text
+    # as bytes, so it stays distinct and the upgrade can't fail on it
+    op.execute(
+        "ALTER TABLE audio_files ALTER COLUMN checksum TYPE bytea USING "
+        "CASE WHEN checksum ~ '^[0-9a-fA-F]{64}$' THEN decode(checksum, 'hex') "
+        "ELSE convert_to(checksum, 'UTF8') END"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema.
+
+    Lossy for rows that were not lowercase SHA-256 hex digests before the
+    upgrade: every 32-byte value comes back hex-encoded, so uppercase digests
+    return in lowercase and a 32-character non-hex value returns as the hex of
+    its bytes. Other values get their original text back.
+    """
+    op.execute(
+        "ALTER TABLE audio_files ALTER COLUMN checksum TYPE varchar(64) USING "
+        "CASE WHEN octet_length(checksum) = 32 THEN encode(checksum, 'hex') "
+        "ELSE convert_from(checksum, 'UTF8') END"
+    )
@@ -0,0 +1,41 @@
+"""drop_redundant_transcription_id_indexes
+
+Revision ID: e27b8f90c4a6
+Revises: c91f4a7e3d05
+Create Date: 2025-10-22 09:26:51.104877
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'e27b8f90c4a6'
+down_revision: Union[str, Sequence[str], None] = 'c91f4a7e3d05'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Single-column transcription_id indexes whose column is already the leading
+# column of the table's unique (transcription_id, ...) constraint index
+REDUNDANT_INDEXES = [
+    ('idx_transcription_chunks_transcription', 'transcription_chunks'),
+    ('idx_transcription_collections_transcription', 'transcription_collections'),
+    ('idx_transcription_topics_transcription', 'transcription_topics'),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        for index_name, _ in REDUNDANT_INDEXES:
+            op.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {index_name}')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for index_name, table_name in REDUNDANT_INDEXES:
+            op.execute(
+                f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {index_name} '
+                f'ON {table_name} (transcription_id)'
+            )
@@ -25,20 +25,35 @@ def upgrade() -> None:
         sa.Column('id', sa.Integer(), nullable=False),
         sa.Column('name', sa.String(length=50), nullable=False),
         sa.Column('description', sa.String(length=255), nullable=True),
-        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
         sa.PrimaryKeyConstraint('id'),
         sa.UniqueConstraint('name')
     )
     
-    # Add role_id to users table
+    # Seed the default roles so existing users have a valid role to point at
+    # (users.role_id defaults to 2 = 'user'). UserService.initialize_roles
+    # looks roles up by name, so it skips these on startup.
+    op.execute("""
+        INSERT INTO roles (id, name, description, created_at) VALUES
+            (1, 'admin', 'Administrator with full access', now()),
+            (2, 'user', 'Regular user', now())
+        ON CONFLICT DO NOTHING
+    """)
+    op.execute("SELECT setval('roles_id_seq', (SELECT max(id) FROM roles))")
+
+    # Add role_id to users table (constant default: metadata-only, no table rewrite)
     op.add_column('users', sa.Column('role_id', sa.Integer(), nullable=False, server_default='2'))
-    
-    # Create foreign key constraint
+
+    # Add the foreign key NOT VALID (no scan of users under the ALTER TABLE lock)
+    # and validate it separately, which only takes SHARE UPDATE EXCLUSIVE
     op.create_foreign_key(
         'fk_users_role_id',
         'users', 'roles',
-        ['role_id'], ['id']
+        ['role_id'], ['id'],
+        postgresql_not_valid=True
     )
+    with op.get_context().autocommit_block():
+        op.execute('ALTER TABLE users VALIDATE CONSTRAINT fk_users_role_id')
 
 
 def downgrade() -> None:
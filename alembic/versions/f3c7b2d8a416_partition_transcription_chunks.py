@@ -0,0 +1,187 @@
+"""partition_transcription_chunks
+
+Revision ID: f3c7b2d8a416
+Revises: d6a9f3b1e254
+Create Date: 2025-10-29 09:41:05.613270
+
+"""
+import math
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3c7b2d8a416'
+down_revision: Union[str, Sequence[str], None] = 'd6a9f3b1e254'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Hash partitions of transcription_chunks, by transcription_id. Every query
+# filters on transcription_id, so each touches one partition, and each
+# partition keeps its own smaller vector index
+PARTITIONS = 16
+
+# Session settings for the index builds
+MAINTENANCE_WORK_MEM = '2GB'
+PARALLEL_WORKERS = 7
+
+# The copy drops the vector index, so it is rebuilt here with the type the
+# table had before (HNSW, or IVFFlat if d6a9f3b1e254 or
+# scripts/manage_vector_indexes.py switched it). Names, operator class, sizing
+# and DDL are pinned rather than read from settings and app.data.vector_index,
+# so this revision always builds the same schema
+INDEX_NAMES = {
+    'hnsw': 'idx_transcription_chunks_embedding_hnsw',
+    'ivfflat': 'idx_transcription_chunks_embedding_ivfflat',
+}
+INDEX_OPCLASS = 'halfvec_cosine_ops'
+
+# HNSW build parameters by rows per index: (exclusive upper bound, m, ef_construction)
+HNSW_TIERS = [
+    (100_000, 16, 64),
+    (1_000_000, 24, 100),
+    (None, 32, 128),
+]
+# Above this many rows IVFFlat uses sqrt(rows) lists instead of rows / 1000
+IVFFLAT_SQRT_THRESHOLD = 1_000_000
+
+# Access method of the current vector index on transcription_chunks, if any
+INDEX_TYPE_SQL = (
+    "SELECT am.amname FROM pg_index i "
+    "JOIN pg_class c ON c.oid = i.indexrelid JOIN pg_am am ON am.oid = c.relam "
+    "WHERE i.indrelid = 'transcription_chunks'::regclass "
+    "AND am.amname IN ('hnsw', 'ivfflat') LIMIT 1"
+)
+
+# Planner estimate of the rows in the largest index: the table's own count, or
+# its largest partition's (reltuples is -1 before the first VACUUM/ANALYZE)
+ESTIMATED_ROWS_SQL = (
+    "SELECT GREATEST(COALESCE(MAX(reltuples), 0), 0)::bigint FROM pg_class "
+    "WHERE (oid = 'transcription_chunks'::regclass AND relkind = 'r') "
+    "OR oid IN (SELECT inhrelid FROM pg_inherits "
+    "WHERE inhparent = 'transcription_chunks'::regclass)"
+)
+
+# Partitions of transcription_chunks, in creation order; none once unpartitioned
+PARTITIONS_SQL = (
+    "SELECT inhrelid::regclass::text FROM pg_inherits "
+    "WHERE inhparent = 'transcription_chunks'::regclass ORDER BY inhrelid"
+)
+
+
+def _copy_into(new_table: str, primary_key: str) -> None:
+    """Replace transcription_chunks with new_table, carrying over rows and constraints."""
+    op.execute(f'INSERT INTO {new_table} SELECT * FROM transcription_chunks')
+    # The id sequence is owned by the old table and would be dropped with it
+    op.execute('ALTER SEQUENCE transcription_chunks_id_seq OWNED BY NONE')
+    op.execute('DROP TABLE transcription_chunks')
+    op.execute(f'ALTER TABLE {new_table} RENAME TO transcription_chunks')
+    op.execute('ALTER SEQUENCE transcription_chunks_id_seq OWNED BY transcription_chunks.id')
+    op.execute(
+        'ALTER TABLE transcription_chunks ADD CONSTRAINT transcription_chunks_pkey '
+        f'PRIMARY KEY ({primary_key})'
+    )
+    op.execute(
+        'ALTER TABLE transcription_chunks ADD CONSTRAINT uq_transcription_chunk '
+        'UNIQUE (transcription_id, chunk_index)'
+    )
+    op.execute(
+        'ALTER TABLE transcription_chunks '
+        'ADD CONSTRAINT transcription_chunks_transcription_id_fkey '
+        'FOREIGN KEY (transcription_id) REFERENCES transcriptions(id) ON DELETE CASCADE'
+    )
+    # The new table has no statistics yet; the index sizing reads them
+    op.execute('ANALYZE transcription_chunks')
+
+
+def _vector_index_type() -> str:
+    """Type of the table's vector index, read before the copy drops it."""
+    return op.get_bind().execute(sa.text(INDEX_TYPE_SQL)).scalar() or 'hnsw'
+
+
+def _create_index_sql(
+    index_type: str, index_name: str, target: str, row_count: int, concurrently: bool = True
+) -> str:
+    if index_type == 'hnsw':
+        m, ef_construction = next(
+            (m, ef_construction) for limit, m, ef_construction in HNSW_TIERS
+            if limit is None or row_count < limit
+        )
+        options = f'm = {m}, ef_construction = {ef_construction}'
+    elif row_count < IVFFLAT_SQRT_THRESHOLD:
+        options = f'lists = {max(row_count // 1000, 1)}'
+    else:
+        options = f'lists = {math.isqrt(row_count)}'
+    create = 'CREATE INDEX CONCURRENTLY' if concurrently else 'CREATE INDEX'
+    return (
+        f'{create} IF NOT EXISTS {index_name} ON {target} '
+        f'USING {index_type} (embedding {INDEX_OPCLASS}) WITH ({options})'
+    )
+
+
+def _build_vector_index(index_type: str) -> None:
+    # Rebuild without blocking the writes that resume once the swap commits
+    index_name = INDEX_NAMES[index_type]
+    with op.get_context().autocommit_block():
+        op.execute(f"SET maintenance_work_mem = '{MAINTENANCE_WORK_MEM}'")
+        op.execute(f'SET max_parallel_maintenance_workers = {PARALLEL_WORKERS}')
+        # Concurrent builds do not block writers, so they are exempt from the
+        # migration statement_timeout
+        op.execute('SET statement_timeout = 0')
+        bind = op.get_bind()
+        row_count = bind.execute(sa.text(ESTIMATED_ROWS_SQL)).scalar()
+        partitions = bind.execute(sa.text(PARTITIONS_SQL)).scalars().all()
+        if partitions:
+            # Partitioned tables can't be indexed CONCURRENTLY: create the parent
+            # index ON ONLY the parent (invalid until every partition's index is
+            # attached), then build and attach each partition's concurrently
+            op.execute(_create_index_sql(
+                index_type, index_name, 'ONLY transcription_chunks', row_count,
+                concurrently=False,
+            ))
+            for partition in partitions:
+                partition_index = f"{index_name}_{partition.removeprefix('transcription_chunks_')}"
+                op.execute(_create_index_sql(index_type, partition_index, partition, row_count))
+                op.execute(f'ALTER INDEX {index_name} ATTACH PARTITION {partition_index}')
+        else:
+            op.execute(_create_index_sql(index_type, index_name, 'transcription_chunks', row_count))
+        op.execute('RESET maintenance_work_mem')
+        op.execute('RESET max_parallel_maintenance_workers')
+        op.execute('RESET statement_timeout')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    index_type = _vector_index_type()
+    # Writes wait from here until the swap commits; reads continue until the DROP
+    op.execute('LOCK TABLE transcription_chunks IN SHARE MODE')
+    op.execute('SET LOCAL statement_timeout = 0')
+    op.execute(
+        'CREATE TABLE transcription_chunks_partitioned '
+        '(LIKE transcription_chunks INCLUDING DEFAULTS INCLUDING STORAGE) '
+        'PARTITION BY HASH (transcription_id)'
+    )
+    for remainder in range(PARTITIONS):
+        op.execute(
+            f'CREATE TABLE transcription_chunks_p{remainder} '
+            'PARTITION OF transcription_chunks_partitioned '
+            f'FOR VALUES WITH (MODULUS {PARTITIONS}, REMAINDER {remainder})'
+        )
+    # A partitioned table's primary key must include the partition key
+    _copy_into('transcription_chunks_partitioned', 'id, transcription_id')
+    _build_vector_index(index_type)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    index_type = _vector_index_type()
+    op.execute('LOCK TABLE transcription_chunks IN SHARE MODE')
+    op.execute('SET LOCAL statement_timeout = 0')
+    op.execute(
+        'CREATE TABLE transcription_chunks_unpartitioned '
+        '(LIKE transcription_chunks INCLUDING DEFAULTS INCLUDING STORAGE)'
+    )
+    _copy_into('transcription_chunks_unpartitioned', 'id')
+    _build_vector_index(index_type)
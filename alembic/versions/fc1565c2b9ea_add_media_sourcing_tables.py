@@ -34,8 +34,8 @@ def upgrade() -> None:
     sa.Column('source_type', sa.String(length=50), nullable=False),
     sa.Column('source_url', sa.Text(), nullable=True),
     sa.Column('source_platform', sa.String(length=100), nullable=True),
-    sa.Column('created_at', sa.DateTime(), nullable=False),
-    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
     sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
     sa.PrimaryKeyConstraint('id'),
     sa.UniqueConstraint('user_id', 'checksum', name='uq_user_checksum')
@@ -56,8 +56,8 @@ def upgrade() -> None:
     sa.Column('processing_time', sa.Float(), nullable=True),
     sa.Column('status', sa.String(length=50), nullable=False),
     sa.Column('error_message', sa.Text(), nullable=True),
-    sa.Column('created_at', sa.DateTime(), nullable=False),
-    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
     sa.ForeignKeyConstraint(['audio_file_id'], ['audio_files.id'], ondelete='CASCADE'),
     sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
     sa.PrimaryKeyConstraint('id')
@@ -67,7 +67,7 @@ def upgrade() -> None:
     op.create_index('idx_transcriptions_status', 'transcriptions', ['status'])
     op.create_index('idx_transcriptions_created_at', 'transcriptions', [sa.text('created_at DESC')])
     op.create_table('transcription_chunks',
-    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('id', sa.BigInteger(), nullable=False),
     sa.Column('transcription_id', sa.Integer(), nullable=False),
     sa.Column('chunk_index', sa.Integer(), nullable=False),
     sa.Column('text', sa.Text(), nullable=False),
@@ -79,11 +79,13 @@ def upgrade() -> None:
     sa.Column('start_char_pos', sa.Integer(), nullable=True),
     sa.Column('end_char_pos', sa.Integer(), nullable=True),
     sa.Column('embedding', pgvector.sqlalchemy.vector.VECTOR(dim=384), nullable=True),
-    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
     sa.ForeignKeyConstraint(['transcription_id'], ['transcriptions.id'], ondelete='CASCADE'),
     sa.PrimaryKeyConstraint('id'),
     sa.UniqueConstraint('transcription_id', 'chunk_index', name='uq_transcription_chunk')
     )
+    # Chunks are inserted in bulk: let each session preallocate ids
+    op.execute('ALTER SEQUENCE transcription_chunks_id_seq CACHE 50')
     op.create_index('idx_transcription_chunks_transcription', 'transcription_chunks', ['transcription_id'])
     op.execute("CREATE INDEX idx_transcription_chunks_embedding ON transcription_chunks USING ivfflat (embedding vector_cosine_ops)")
     op.create_table('transcription_collections',
@@ -92,7 +94,7 @@ def upgrade() -> None:
     sa.Column('collection_id', sa.Integer(), nullable=False),
     sa.Column('position', sa.Integer(), nullable=True),
     sa.Column('assigned_by', sa.String(length=255), nullable=True),
-    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
     sa.ForeignKeyConstraint(['assigned_by'], ['users.id'], ),
     sa.ForeignKeyConstraint(['collection_id'], ['collections.id'], ondelete='CASCADE'),
     sa.ForeignKeyConstraint(['transcription_id'], ['transcriptions.id'], ondelete='CASCADE'),
@@ -110,7 +112,7 @@ def upgrade() -> None:
     sa.Column('ai_reasoning', sa.Text(), nullable=True),
     sa.Column('assigned_by', sa.String(length=255), nullable=True),
     sa.Column('user_reviewed', sa.Boolean(), nullable=False),
-    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
     sa.ForeignKeyConstraint(['assigned_by'], ['users.id'], ),
     sa.ForeignKeyConstraint(['topic_id'], ['topics.id'], ondelete='CASCADE'),
     sa.ForeignKeyConstraint(['transcription_id'], ['transcriptions.id'], ondelete='CASCADE'),
@@ -119,22 +121,27 @@ def upgrade() -> None:
     )
     op.create_index('idx_transcription_topics_transcription', 'transcription_topics', ['transcription_id'])
     op.create_index('idx_transcription_topics_topic', 'transcription_topics', ['topic_id'])
-    op.create_index('idx_transcription_topics_ai_confidence', 'transcription_topics', ['ai_confidence'])
+    # Partial indexes for the review queue (unreviewed / low-confidence AI assignments)
+    op.create_index('idx_transcription_topics_unreviewed', 'transcription_topics', ['transcription_id'],
+                    postgresql_where=sa.text('user_reviewed = false'))
+    op.create_index('idx_transcription_topics_low_confidence', 'transcription_topics', ['ai_confidence'],
+                    postgresql_where=sa.text('ai_confidence < 0.5'))
     op.drop_index(op.f('idx_collections_type'), table_name='collections')
     op.drop_index(op.f('idx_collections_user_id'), table_name='collections')
-    op.drop_index(op.f('idx_job_collections_collection_id'), table_name='job_collections')
-    op.drop_index(op.f('idx_job_collections_job_id'), table_name='job_collections')
     op.drop_index(op.f('idx_job_collections_position'), table_name='job_collections')
-    op.drop_index(op.f('idx_job_topics_confidence'), table_name='job_topics')
-    op.drop_index(op.f('idx_job_topics_job_id'), table_name='job_topics')
-    op.drop_index(op.f('idx_job_topics_reviewed'), table_name='job_topics')
+    op.drop_index(op.f('idx_job_topics_low_confidence'), table_name='job_topics')
+    op.drop_index(op.f('idx_job_topics_unreviewed'), table_name='job_topics')
     op.drop_index(op.f('idx_job_topics_topic_id'), table_name='job_topics')
     op.add_column('jobs', sa.Column('job_type', sa.String(length=50), nullable=False, server_default='transcription'))
     op.add_column('jobs', sa.Column('audio_file_id', sa.Integer(), nullable=True))
     op.add_column('jobs', sa.Column('source_url', sa.Text(), nullable=True))
-    op.create_foreign_key('fk_jobs_audio_file_id', 'jobs', 'audio_files', ['audio_file_id'], ['id'], ondelete='SET NULL')
-    op.create_index('idx_jobs_job_type', 'jobs', ['job_type'])
-    op.create_index('idx_jobs_audio_file_id', 'jobs', ['audio_file_id'])
+    op.create_foreign_key('fk_jobs_audio_file_id', 'jobs', 'audio_files', ['audio_file_id'], ['id'], ondelete='SET NULL', postgresql_not_valid=True)
+    with op.get_context().autocommit_block():
+        op.execute('ALTER TABLE jobs VALIDATE CONSTRAINT fk_jobs_audio_file_id')
+    # jobs is a live table - build its indexes CONCURRENTLY so writes are not blocked
+    with op.get_context().autocommit_block():
+        op.create_index('idx_jobs_job_type', 'jobs', ['job_type'], postgresql_concurrently=True)
+        op.create_index('idx_jobs_audio_file_id', 'jobs', ['audio_file_id'], postgresql_concurrently=True)
     op.drop_index(op.f('idx_topics_parent_id'), table_name='topics')
     # ### end Alembic commands ###
 
@@ -143,24 +150,23 @@ def downgrade() -> None:
     """Downgrade schema."""
     # ### commands auto generated by Alembic - please adjust! ###
     op.create_index(op.f('idx_topics_parent_id'), 'topics', ['parent_id'], unique=False)
-    op.drop_index('idx_jobs_audio_file_id', table_name='jobs')
-    op.drop_index('idx_jobs_job_type', table_name='jobs')
+    with op.get_context().autocommit_block():
+        op.drop_index('idx_jobs_audio_file_id', table_name='jobs', postgresql_concurrently=True)
+        op.drop_index('idx_jobs_job_type', table_name='jobs', postgresql_concurrently=True)
     op.drop_constraint('fk_jobs_audio_file_id', 'jobs', type_='foreignkey')
     op.drop_column('jobs', 'source_url')
     op.drop_column('jobs', 'audio_file_id')
     op.drop_column('jobs', 'job_type')
     op.create_index(op.f('idx_job_topics_topic_id'), 'job_topics', ['topic_id'], unique=False)
-    op.create_index(op.f('idx_job_topics_reviewed'), 'job_topics', ['user_reviewed'], unique=False)
-    op.create_index(op.f('idx_job_topics_job_id'), 'job_topics', ['job_id'], unique=False)
-    op.create_index(op.f('idx_job_topics_confidence'), 'job_topics', ['ai_confidence'], unique=False)
+    op.create_index(op.f('idx_job_topics_unreviewed'), 'job_topics', ['job_id'], unique=False, postgresql_where=sa.text('user_reviewed = false'))
+    op.create_index(op.f('idx_job_topics_low_confidence'), 'job_topics', ['ai_confidence'], unique=False, postgresql_where=sa.text('ai_confidence < 0.5'))
     op.create_index(op.f('idx_job_collections_position'), 'job_collections', ['collection_id', 'position'], unique=False)
-    op.create_index(op.f('idx_job_collections_job_id'), 'job_collections', ['job_id'], unique=False)
-    op.create_index(op.f('idx_job_collections_collection_id'), 'job_collections', ['collection_id'], unique=False)
     op.create_index(op.f('idx_collections_user_id'), 'collections', ['user_id'], unique=False)
     op.create_index(op.f('idx_collections_type'), 'collections', ['collection_type'], unique=False)
 
     # Drop transcription_topics indexes and table
-    op.drop_index('idx_transcription_topics_ai_confidence', table_name='transcription_topics')
+    op.drop_index('idx_transcription_topics_low_confidence', table_name='transcription_topics')
+    op.drop_index('idx_transcription_topics_unreviewed', table_name='transcription_topics')
     op.drop_index('idx_transcription_topics_topic', table_name='transcription_topics')
     op.drop_index('idx_transcription_topics_transcription', table_name='transcription_topics')
     op.drop_table('transcription_topics')
@@ -7,9 +7,7 @@ Create Date: 2025-10-17 00:00:00.000000
 """
 from typing import Sequence, Union
 
-import sqlalchemy as sa
 from alembic import op
-from pgvector.sqlalchemy import Vector
 
 # revision identifiers, used by Alembic.
 revision: str = 'k1l2m3n4o5p6'
@@ -17,6 +15,10 @@ down_revision: Union[str, Sequence[str], None] = 'd036d6780f9b'
 branch_labels: Union[str, Sequence[str], None] = None
 depends_on: Union[str, Sequence[str], None] = None
 
+# Session settings for the HNSW index build
+HNSW_MAINTENANCE_WORK_MEM = '2GB'
+HNSW_PARALLEL_WORKERS = 7
+
 
 def upgrade() -> None:
     """Upgrade schema."""
@@ -24,22 +26,37 @@ def upgrade() -> None:
     op.execute('CREATE EXTENSION IF NOT EXISTS vector')
 
     # Add embedding column (384 dimensions for all-MiniLM-L6-v2 model)
-    op.add_column('jobs', sa.Column('embedding', Vector(384), nullable=True))
+    op.execute('ALTER TABLE jobs ADD COLUMN IF NOT EXISTS embedding vector(384)')
 
     # Create an index for faster similarity search
-    # Using HNSW (Hierarchical Navigable Small World) index for fast approximate nearest neighbor search
-    op.execute(
-        'CREATE INDEX IF NOT EXISTS jobs_embedding_idx ON jobs USING hnsw (embedding vector_cosine_ops)'
-    )
+    # Using HNSW (Hierarchical Navigable Small World) index for fast approximate nearest neighbor search.
+    # jobs is a live table, so build CONCURRENTLY (outside the migration transaction) to avoid
+    # blocking writes for the duration of the build.
+    # The HNSW build is CPU and memory bound: give it a larger working set and parallel
+    # workers for this session only (SET LOCAL has no effect outside a transaction).
+    with op.get_context().autocommit_block():
+        op.execute(f"SET maintenance_work_mem = '{HNSW_MAINTENANCE_WORK_MEM}'")
+        op.execute(f'SET max_parallel_maintenance_workers = {HNSW_PARALLEL_WORKERS}')
+        # A concurrent build does not block writers, so it is exempt from the
+        # migration statement_timeout
+        op.execute('SET statement_timeout = 0')
+        op.execute(
+            'CREATE INDEX CONCURRENTLY IF NOT EXISTS jobs_embedding_idx '
+            'ON jobs USING hnsw (embedding vector_cosine_ops) WITH (m = 16, ef_construction = 64)'
+        )
+        op.execute('RESET maintenance_work_mem')
+        op.execute('RESET max_parallel_maintenance_workers')
+        op.execute('RESET statement_timeout')
 
 
 def downgrade() -> None:
     """Downgrade schema."""
     # Drop the index
-    op.execute('DROP INDEX IF EXISTS jobs_embedding_idx')
+    with op.get_context().autocommit_block():
+        op.execute('DROP INDEX CONCURRENTLY IF EXISTS jobs_embedding_idx')
 
     # Drop the embedding column
-    op.drop_column('jobs', 'embedding')
+    op.execute('ALTER TABLE jobs DROP COLUMN IF EXISTS embedding')
 
     # Note: We don't drop the pgvector extension in downgrade
     # as it might be used by other tables
@@ -2,7 +2,7 @@
 Authentication and authorization layer for MxWhisper
 """
 from .jwt import verify_token, verify_authentik_token, create_service_account_token, security
-from .authentik import authentik_api_client as authentik_client, AuthentikAPIClient
+from .authentik import get_authentik_client, AuthentikAPIClient
 from .permissions import (
     extract_user_info_from_token,
     has_admin_group,
@@ -16,7 +16,7 @@ __all__ = [
     "verify_authentik_token",
     "create_service_account_token",
     "security",
-    "authentik_client",  # Aliased from authentik_api_client for backward compatibility
+    "get_authentik_client",
     "AuthentikAPIClient",
     "extract_user_info_from_token",
     "has_admin_group",
@@ -3,124 +3,188 @@ Authentik API client for admin operations.
 """
 
 import asyncio
+import functools
 import logging
-from datetime import datetime, timedelta
-from typing import Any, Dict, Optional, List
-
-import authentik_client as authentik_sdk
-from authentik_client.api import CoreApi
-from authentik_client.models import (
-    UserPasswordSetRequest,
-    UserRequest,
-    TokenRequest,
-    IntentEnum
-)
-from authentik_client.rest import ApiException
+import re
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import httpx
 
 from app.config import settings
+from app.utils.ttl_cache import MISSING, TTLCache
 
 logger = logging.getLogger(__name__)
 
+# Group UUIDs effectively never change; unknown names are retried sooner
+GROUP_CACHE_TTL = 300  # seconds
+GROUP_NEGATIVE_CACHE_TTL = 30  # seconds
+GROUP_PREFETCH_PAGE_SIZE = 1000
 
-class AuthentikAPIClient:
-    """Client for Authentik API operations using the official SDK."""
+# Connection limits for the async HTTP client used on the hot read paths
+HTTP_MAX_CONNECTIONS = 100
+HTTP_MAX_KEEPALIVE_CONNECTIONS = 50
+HTTP_KEEPALIVE_EXPIRY = 60.0  # seconds
+HTTP_TIMEOUT = 30.0  # seconds
 
-    def __init__(self):
-        self.configuration = authentik_sdk.Configuration(
-            host=settings.authentik_api_url.rstrip('/'),
-            access_token=settings.authentik_admin_token
-        )
-        logger.debug("Authentik API client initialized", extra={
-            "base_url": self.configuration.host
-        })
+# Page size when listing a user's tokens
+TOKEN_PAGE_SIZE = 100
 
-    def _create_user_sync(self, user_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Synchronous implementation of create_user for SDK compatibility."""
-        logger.info("Creating user in Authentik", extra={
-            "username": user_data.get("username"),
-            "email": user_data.get("email"),
-            "groups": user_data.get("groups", [])
-        })
+# Short-lived user cache for repeated lookups within auth flows
+USER_CACHE_TTL = 15  # seconds
+
+_UUID_RE = re.compile(
+    r'^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$'
+)
 
+
+def _status_code(error: httpx.HTTPError) -> Optional[int]:
+    """HTTP status of a failed Authentik request, or None if no response was received."""
+    return error.response.status_code if isinstance(error, httpx.HTTPStatusError) else None
+
+
+@dataclass(frozen=True, slots=True)
+class AuthentikUser:
+    """
+    The fields of an Authentik user that MxWhisper uses.
+
+    Supports user["pk"] style access for code written against the old dict
+    results.
+    """
+    pk: int
+    username: str
+    email: Optional[str]
+    name: Optional[str]
+    is_active: Optional[bool]
+    groups: Tuple[str, ...]
+
+    def __getitem__(self, key: str) -> Any:
         try:
-            with authentik_sdk.ApiClient(self.configuration) as api_client:
-                core_api = CoreApi(api_client)
-
-                # Resolve group names to UUIDs if needed
-                group_uuids = []
-                if "groups" in user_data:
-                    for group_identifier in user_data["groups"]:
-                        # Check if it's already a UUID (contains hyphens)
-                        if "-" in str(group_identifier):
-                            group_uuids.append(group_identifier)
-                        else:
-                            # Look up group by name
-                            group_uuid = self._get_group_id_by_name_sync(group_identifier)
-                            if group_uuid:
-                                group_uuids.append(group_uuid)
-
-                # Create user request
-                user_request = UserRequest(
-                    username=user_data["username"],
-                    email=user_data["email"],
-                    name=user_data.get("name", ""),
-                    is_active=True,
-                    groups=group_uuids
-                )
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    @classmethod
+    def from_json(cls, user: Dict[str, Any]) -> "AuthentikUser":
+        """Build from an Authentik user JSON object."""
+        return cls(
+            pk=user["pk"],
+            username=user["username"],
+            email=user.get("email"),
+            name=user.get("name"),
+            is_active=user.get("is_active"),
+            groups=tuple(user.get("groups", ())),
+        )
 
-                # Create the user
-                created_user = core_api.core_users_create(user_request)
-
-                # Convert to dict for compatibility with existing code
-                result = {
-                    "pk": created_user.pk,
-                    "username": created_user.username,
-                    "email": created_user.email,
-                    "name": created_user.name,
-                    "is_active": created_user.is_active,
-                    "groups": (
-                        created_user.groups
-                        if hasattr(created_user, "groups")
-                        else group_uuids
-                    ),
-                }
-
-                logger.info("User created successfully in Authentik", extra={
-                    "username": result.get("username"),
-                    "user_id": result.get("pk"),
-                    "email": result.get("email")
-                })
 
-                # Set password if provided
-                if "password" in user_data:
-                    try:
-                        password_request = UserPasswordSetRequest(
-                            password=user_data["password"]
-                        )
-                        core_api.core_users_set_password_create(
-                            id=created_user.pk,
-                            user_password_set_request=password_request
-                        )
-                        logger.debug("Password set for user", extra={
-                            "user_id": created_user.pk
-                        })
-                    except ApiException as e:
-                        logger.warning("Failed to set password for user", extra={
-                            "user_id": created_user.pk,
-                            "error": str(e)
-                        })
+@dataclass(frozen=True, slots=True)
+class AuthentikToken:
+    """An Authentik API token as listed for a user (the key is never included)."""
+    identifier: str
+    pk: int
+    expires: Optional[datetime]
+    expiring: bool
+    description: str
 
-                return result
 
-        except ApiException as e:
-            logger.error("Failed to create user in Authentik", extra={
-                "username": user_data.get("username"),
-                "error": str(e),
-                "status_code": e.status if hasattr(e, 'status') else None
-            }, exc_info=True)
-            raise
+class AuthentikAPIClient:
+    """
+    Client for Authentik API operations.
 
-    async def create_user(self, user_data: Dict[str, Any]) -> Dict[str, Any]:
+    All calls go straight to the REST API through a shared httpx.AsyncClient.
+    """
+
+    def __init__(self):
+        self.base_url = settings.authentik_api_url.rstrip('/')
+        # Native async client, so concurrent calls are multiplexed on the event
+        # loop instead of each taking a worker thread
+        self._http = httpx.AsyncClient(
+            base_url=self.base_url + "/",
+            headers={"Authorization": f"Bearer {settings.authentik_admin_token}"},
+            limits=httpx.Limits(
+                max_connections=HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=HTTP_KEEPALIVE_EXPIRY
+            ),
+            timeout=HTTP_TIMEOUT
+        )
+        # Group name -> UUID (or None if the group does not exist)
+        self._group_cache = TTLCache(ttl=GROUP_CACHE_TTL)
+        # Users indexed both ways, so either lookup path hits after one fetch
+        self._users_by_pk = TTLCache(ttl=USER_CACHE_TTL)
+        self._users_by_username = TTLCache(ttl=USER_CACHE_TTL)
+        # Lookups currently on the wire, so concurrent callers share one request
+        self._inflight: Dict[Tuple[str, Any], asyncio.Future] = {}
+        logger.debug("Authentik API client initialized", extra={
+            "base_url": self.base_url
+        })
+
+    async def aclose(self) -> None:
+        """Close pooled connections to the Authentik API (call at shutdown)."""
+        await self._http.aclose()
+        logger.debug("Authentik API client closed")
+
+    async def _single_flight(
+        self, key: Tuple[str, Any], fetch: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Await fetch(), sharing its result with concurrent calls for the same key."""
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(fetch())
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # Shielded so one cancelled caller does not cancel the shared request
+        return await asyncio.shield(future)
+
+    def _cache_user(self, user: AuthentikUser) -> None:
+        """Store a fetched user under both its pk and username."""
+        self._users_by_pk.set(str(user.pk), user)
+        self._users_by_username.set(user.username, user)
+
+    def invalidate_user(
+        self, user_pk: Optional[Any] = None, username: Optional[str] = None
+    ) -> None:
+        """Drop a user from the lookup caches after it was changed or deleted."""
+        if user_pk is not None:
+            cached = self._users_by_pk.get(str(user_pk), None)
+            self._users_by_pk.invalidate(str(user_pk))
+            if cached is not None:
+                self._users_by_username.invalidate(cached.username)
+        if username is not None:
+            cached = self._users_by_username.get(username, None)
+            self._users_by_username.invalidate(username)
+            if cached is not None:
+                self._users_by_pk.invalidate(str(cached.pk))
+
+    async def _resolve_group_uuids(self, group_identifiers: List[str]) -> List[str]:
+        """Map group names/UUIDs to UUIDs, looking names up concurrently.
+
+        Order is preserved; names that do not resolve to a group are dropped.
+        """
+        # Anything that is not a UUID is a group name (names may contain hyphens)
+        named_groups = list(dict.fromkeys(
+            g for g in group_identifiers
+            if not (isinstance(g, str) and _UUID_RE.match(g))
+        ))
+        # More than one uncached name: one listing call warms the cache for all
+        uncached = [g for g in named_groups if self._group_cache.get(g) is MISSING]
+        if len(uncached) > 1:
+            await self._prefetch_groups(uncached)
+
+        resolved = dict(zip(
+            named_groups,
+            await asyncio.gather(*(self._get_group_id_by_name(g) for g in named_groups))
+        ))
+
+        group_uuids = []
+        for group_identifier in group_identifiers:
+            group_uuid = resolved.get(group_identifier, group_identifier)
+            if group_uuid:
+                group_uuids.append(group_uuid)
+        return group_uuids
+
+    async def create_user(self, user_data: Dict[str, Any]) -> AuthentikUser:
         """
         Create a user in Authentik.
 
@@ -133,180 +197,305 @@ class AuthentikAPIClient:
                 - groups: List[str] (optional, group names or UUIDs)
 
         Returns:
-            Dict with created user data from Authentik
+            AuthentikUser for the created user
+
+        Raises:
+            httpx.HTTPError: If Authentik rejects the user
         """
-        # Run synchronous SDK call in thread pool to avoid blocking
-        return await asyncio.to_thread(self._create_user_sync, user_data)
+        # Resolve group names to UUIDs if needed
+        group_uuids = await self._resolve_group_uuids(user_data.get("groups", []))
 
-    def _get_group_id_by_name_sync(self, group_name: str) -> Optional[str]:
-        """Synchronous implementation of get group UUID by name."""
-        logger.debug("Looking up group ID by name", extra={"group_name": group_name})
+        logger.debug("Creating user in Authentik", extra={
+            "username": user_data.get("username"),
+            "email": user_data.get("email"),
+            "groups": user_data.get("groups", [])
+        })
 
         try:
-            with authentik_sdk.ApiClient(self.configuration) as api_client:
-                core_api = CoreApi(api_client)
+            response = await self._http.post("core/users/", json={
+                "username": user_data["username"],
+                "email": user_data["email"],
+                "name": user_data.get("name", ""),
+                "is_active": True,
+                "groups": group_uuids
+            })
+            response.raise_for_status()
+            created_user = response.json()
 
-                # List groups filtered by name
-                groups_response = core_api.core_groups_list(name=group_name)
+        except httpx.HTTPError as e:
+            logger.error("Failed to create user in Authentik", extra={
+                "username": user_data.get("username"),
+                "error": str(e),
+                "status_code": _status_code(e)
+            }, exc_info=logger.isEnabledFor(logging.DEBUG))
+            raise
 
-                if groups_response.results and len(groups_response.results) > 0:
-                    group_uuid = groups_response.results[0].pk
-                    logger.debug("Group found", extra={
-                        "group_name": group_name,
-                        "group_id": group_uuid
-                    })
-                    return group_uuid
+        created_user.setdefault("groups", group_uuids)
+        result = AuthentikUser.from_json(created_user)
 
-                logger.debug("Group not found", extra={"group_name": group_name})
-                return None
+        self.invalidate_user(username=result.username)
 
-        except ApiException as e:
-            logger.error("Failed to look up group", extra={
-                "group_name": group_name,
-                "error": str(e)
-            }, exc_info=True)
-            return None
+        logger.debug("User created successfully in Authentik", extra={
+            "username": result.username,
+            "user_id": result.pk,
+            "email": result.email
+        })
 
-    async def _get_group_id_by_name(self, group_name: str) -> Optional[str]:
-        """Get group UUID by name."""
-        return await asyncio.to_thread(self._get_group_id_by_name_sync, group_name)
+        # Set password if provided
+        if "password" in user_data:
+            try:
+                response = await self._http.post(
+                    f"core/users/{result.pk}/set_password/",
+                    json={"password": user_data["password"]}
+                )
+                response.raise_for_status()
+                logger.debug("Password set for user", extra={
+                    "user_id": result.pk
+                })
+            except httpx.HTTPError as e:
+                logger.warning("Failed to set password for user", extra={
+                    "user_id": result.pk,
+                    "error": str(e)
+                })
 
-    def _add_user_to_group_sync(self, user_id: str, group_name: str) -> bool:
-        """Synchronous implementation of add user to group."""
-        logger.info("Adding user to group", extra={
-            "user_id": user_id,
-            "group_name": group_name
-        })
+        return result
 
+    async def create_users(
+        self,
+        users: List[Dict[str, Any]],
+        max_concurrency: int = 16
+    ) -> List[Any]:
+        """
+        Create several users in Authentik concurrently.
+
+        Args:
+            users: List of user_data dicts, as accepted by create_user
+            max_concurrency: Maximum number of users created at once
+
+        Returns:
+            One entry per input user, in order: the created AuthentikUser, or the
+            exception raised while creating that user
+        """
+        # Resolve every referenced group once up front so the per-user
+        # lookups below are all cache hits
+        all_groups = list(dict.fromkeys(g for u in users for g in u.get("groups", [])))
+        await self._resolve_group_uuids(all_groups)
+
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def create_one(user_data: Dict[str, Any]) -> AuthentikUser:
+            async with semaphore:
+                return await self.create_user(user_data)
+
+        return await asyncio.gather(
+            *(create_one(user_data) for user_data in users),
+            return_exceptions=True
+        )
+
+    async def _prefetch_groups(self, group_names: List[str]) -> None:
+        """Cache the UUIDs of all groups with one paginated listing.
+
+        Requested names missing from the listing are cached as negative
+        results. On HTTP errors nothing is cached, so callers fall back to
+        per-name lookups.
+        """
+        logger.debug("Prefetching groups", extra={"group_count": len(group_names)})
+
+        groups: Dict[str, str] = {}
+        page = 1
         try:
-            group_uuid = self._get_group_id_by_name_sync(group_name)
-            if not group_uuid:
-                logger.warning("Cannot add user to group - group not found", extra={
-                    "user_id": user_id,
-                    "group_name": group_name
+            while page:
+                response = await self._http.get("core/groups/", params={
+                    "page": page,
+                    "page_size": GROUP_PREFETCH_PAGE_SIZE,
+                    "include_users": "false",
                 })
-                return False
+                response.raise_for_status()
+                data = response.json()
+                for group in data.get("results", []):
+                    groups[group["name"]] = group["pk"]
+                page = data.get("pagination", {}).get("next") or 0
+        except httpx.HTTPError as e:
+            logger.warning("Failed to prefetch groups", extra={"error": str(e)})
+            return
+
+        for name, group_uuid in groups.items():
+            self._group_cache.set(name, group_uuid)
+        for name in group_names:
+            if name not in groups:
+                self._group_cache.set(name, None, ttl=GROUP_NEGATIVE_CACHE_TTL)
 
-            with authentik_sdk.ApiClient(self.configuration) as api_client:
-                core_api = CoreApi(api_client)
+    async def _get_group_id_by_name(self, group_name: str) -> Optional[str]:
+        """Get group UUID by name (cached)."""
+        group_uuid = self._group_cache.get(group_name)
+        if group_uuid is not MISSING:
+            return group_uuid
+        return await self._single_flight(
+            ("group", group_name), lambda: self._fetch_group_id(group_name)
+        )
 
-                # Add user to group
-                from authentik_client.models import UserAccountRequest
-                user_account_request = UserAccountRequest(pk=int(user_id))
-                core_api.core_groups_add_user_create(
-                    group_uuid=group_uuid,
-                    user_account_request=user_account_request
-                )
+    async def _fetch_group_id(self, group_name: str) -> Optional[str]:
+        logger.debug("Looking up group ID by name", extra={"group_name": group_name})
 
-                logger.info("User added to group successfully", extra={
-                    "user_id": user_id,
+        try:
+            # List groups filtered by name
+            response = await self._http.get("core/groups/", params={"name": group_name})
+            response.raise_for_status()
+            results = response.json().get("results", [])
+
+            if results:
+                group_uuid = results[0]["pk"]
+                logger.debug("Group found", extra={
                     "group_name": group_name,
                     "group_id": group_uuid
                 })
-                return True
+                self._group_cache.set(group_name, group_uuid)
+                return group_uuid
 
-        except ApiException as e:
-            logger.warning("Failed to add user to group", extra={
-                "user_id": user_id,
+            logger.debug("Group not found", extra={"group_name": group_name})
+            self._group_cache.set(group_name, None, ttl=GROUP_NEGATIVE_CACHE_TTL)
+            return None
+
+        except httpx.HTTPError as e:
+            # Not cached: a failed lookup says nothing about the group
+            logger.error("Failed to look up group", extra={
                 "group_name": group_name,
-                "error": str(e),
-                "status_code": e.status if hasattr(e, 'status') else None
-            }, exc_info=True)
-            return False
+                "error": str(e)
+            }, exc_info=logger.isEnabledFor(logging.DEBUG))
+            return None
 
     async def add_user_to_group(self, user_id: str, group_name: str) -> bool:
         """
         Add a user to a group.
 
         Args:
-            user_id: Authentik user ID (UUID or integer)
+            user_id: Authentik user ID (integer)
             group_name: Name of the group
 
         Returns:
             True if successful
+
+        Raises:
+            ValueError: If user_id is not an integer
         """
-        return await asyncio.to_thread(self._add_user_to_group_sync, user_id, group_name)
+        user_pk = int(user_id)
 
-    def _get_user_sync(self, user_id: str) -> Optional[Dict[str, Any]]:
-        """Synchronous implementation of get user."""
-        logger.debug("Getting user by ID", extra={"user_id": user_id})
+        logger.debug("Adding user to group", extra={
+            "user_id": user_id,
+            "group_name": group_name
+        })
+
+        group_uuid = await self._get_group_id_by_name(group_name)
+        if not group_uuid:
+            logger.warning("Cannot add user to group - group not found", extra={
+                "user_id": user_id,
+                "group_name": group_name
+            })
+            return False
 
         try:
-            with authentik_sdk.ApiClient(self.configuration) as api_client:
-                core_api = CoreApi(api_client)
+            response = await self._http.post(
+                f"core/groups/{group_uuid}/add_user/",
+                json={"pk": user_pk}
+            )
+            response.raise_for_status()
+
+        except httpx.HTTPError as e:
+            # The cached UUID may be stale (group deleted or recreated)
+            self._group_cache.invalidate(group_name)
+            logger.warning("Failed to add user to group", extra={
+                "user_id": user_id,
+                "group_name": group_name,
+                "error": str(e),
+                "status_code": _status_code(e)
+            }, exc_info=logger.isEnabledFor(logging.DEBUG))
+            return False
 
-                user = core_api.core_users_retrieve(id=int(user_id))
+        # The user's group list changed
+        self.invalidate_user(user_pk=user_pk)
 
-                # Convert to dict for compatibility
-                result = {
-                    "pk": user.pk,
-                    "username": user.username,
-                    "email": user.email,
-                    "name": user.name,
-                    "is_active": user.is_active,
-                    "groups": user.groups if hasattr(user, 'groups') else []
-                }
+        logger.debug("User added to group successfully", extra={
+            "user_id": user_id,
+            "group_name": group_name,
+            "group_id": group_uuid
+        })
+        return True
 
-                logger.debug("User found", extra={
-                    "user_id": user_id,
-                    "username": result.get("username")
-                })
-                return result
+    async def get_user(self, user_id: str) -> Optional[AuthentikUser]:
+        """Get user by ID (cached for USER_CACHE_TTL seconds).
+
+        Raises:
+            ValueError: If user_id is not an integer
+        """
+        user_pk = int(user_id)
+        cached = self._users_by_pk.get(str(user_pk), None)
+        if cached is not None:
+            return cached
+        return await self._single_flight(("user", user_pk), lambda: self._fetch_user(user_pk))
+
+    async def _fetch_user(self, user_id: int) -> Optional[AuthentikUser]:
+        logger.debug("Getting user by ID", extra={"user_id": user_id})
 
-        except ApiException as e:
-            logger.debug("User not found", extra={
+        try:
+            response = await self._http.get(f"core/users/{user_id}/")
+            response.raise_for_status()
+            result = AuthentikUser.from_json(response.json())
+            self._cache_user(result)
+
+            logger.debug("User found", extra={
                 "user_id": user_id,
-                "error": str(e),
-                "status_code": e.status if hasattr(e, 'status') else None
+                "username": result.username
             })
+            return result
+
+        except httpx.HTTPError as e:
+            # Hit on every 404; skip building the log record unless debugging
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("User not found", extra={
+                    "user_id": user_id,
+                    "error": str(e),
+                    "status_code": _status_code(e)
+                })
             return None
 
-    async def get_user(self, user_id: str) -> Optional[Dict[str, Any]]:
-        """Get user by ID."""
-        return await asyncio.to_thread(self._get_user_sync, user_id)
+    async def get_user_by_username(self, username: str) -> Optional[AuthentikUser]:
+        """Get user by username (cached for USER_CACHE_TTL seconds)."""
+        cached = self._users_by_username.get(username, None)
+        if cached is not None:
+            return cached
+        return await self._single_flight(
+            ("username", username), lambda: self._fetch_user_by_username(username)
+        )
 
-    def _get_user_by_username_sync(self, username: str) -> Optional[Dict[str, Any]]:
-        """Synchronous implementation of get user by username."""
+    async def _fetch_user_by_username(self, username: str) -> Optional[AuthentikUser]:
         logger.debug("Getting user by username", extra={"username": username})
 
         try:
-            with authentik_sdk.ApiClient(self.configuration) as api_client:
-                core_api = CoreApi(api_client)
-
-                # List users filtered by username
-                users_response = core_api.core_users_list(username=username)
-
-                if users_response.results and len(users_response.results) > 0:
-                    user = users_response.results[0]
-                    result = {
-                        "pk": user.pk,
-                        "username": user.username,
-                        "email": user.email,
-                        "name": user.name,
-                        "is_active": user.is_active,
-                        "groups": user.groups if hasattr(user, 'groups') else []
-                    }
-                    logger.debug("User found", extra={
-                        "username": username,
-                        "user_pk": result.get("pk")
-                    })
-                    return result
-
-                logger.debug("User not found", extra={"username": username})
-                return None
-
-        except ApiException as e:
+            # List users filtered by username
+            response = await self._http.get("core/users/", params={"username": username})
+            response.raise_for_status()
+            results = response.json().get("results", [])
+
+            if results:
+                result = AuthentikUser.from_json(results[0])
+                self._cache_user(result)
+                logger.debug("User found", extra={
+                    "username": username,
+                    "user_pk": result.pk
+                })
+                return result
+
+            logger.debug("User not found", extra={"username": username})
+            return None
+
+        except httpx.HTTPError as e:
             logger.error("Failed to look up user by username", extra={
                 "username": username,
                 "error": str(e)
-            }, exc_info=True)
+            }, exc_info=logger.isEnabledFor(logging.DEBUG))
             return None
 
-    async def get_user_by_username(self, username: str) -> Optional[Dict[str, Any]]:
-        """Get user by username."""
-        return await asyncio.to_thread(self._get_user_by_username_sync, username)
-
-    def _create_token_sync(
+    async def create_token(
         self,
         user_pk: int,
         identifier: str,
@@ -314,7 +503,7 @@ class AuthentikAPIClient:
         expires_days: int = 365
     ) -> Dict[str, Any]:
         """
-        Synchronous implementation of create Authentik API token.
+        Create an Authentik API token for a user.
 
         Args:
             user_pk: Authentik user primary key (integer ID)
@@ -329,91 +518,64 @@ class AuthentikAPIClient:
                 - expires: Expiration datetime
                 - pk: Token primary key
         """
-        logger.info("Creating Authentik API token", extra={
+        logger.debug("Creating Authentik API token", extra={
             "user_pk": user_pk,
             "identifier": identifier,
             "expires_days": expires_days
         })
 
         try:
-            with authentik_sdk.ApiClient(self.configuration) as api_client:
-                core_api = CoreApi(api_client)
-
-                # Calculate expiration date
-                expires_at = datetime.now() + timedelta(days=expires_days)
-
-                # Create token request
-                token_request = TokenRequest(
-                    identifier=identifier,
-                    user=user_pk,
-                    intent=IntentEnum.API,
-                    description=description,
-                    expires=expires_at,
-                    expiring=True
-                )
+            # Calculate expiration date
+            expires_at = datetime.now(timezone.utc) + timedelta(days=expires_days)
 
-                # Create the token
-                token = core_api.core_tokens_create(token_request)
-
-                # Retrieve the token key (actual secret value)
-                # The key is only available through view_key_retrieve and will be logged in Authentik
-                token_view = core_api.core_tokens_view_key_retrieve(identifier=identifier)
-
-                # Extract token data
-                result = {
-                    "key": token_view.key,  # The actual token value - shown only once!
-                    "identifier": token.identifier,
-                    "expires": token.expires,
-                    "pk": token.pk,
-                    "description": token.description if hasattr(token, "description") else description
-                }
-
-                logger.info("Authentik API token created successfully", extra={
-                    "identifier": identifier,
-                    "expires": expires_at.isoformat()
-                })
+            # Create the token
+            response = await self._http.post("core/tokens/", json={
+                "identifier": identifier,
+                "user": user_pk,
+                "intent": "api",
+                "description": description,
+                "expires": expires_at.isoformat(),
+                "expiring": True
+            })
+            response.raise_for_status()
+            token = response.json()
+
+            # Retrieve the token key (actual secret value) straight away on the same
+            # connection. The key is only available through view_key and will be
+            # logged in Authentik
+            response = await self._http.get(f"core/tokens/{token['identifier']}/view_key/")
+            response.raise_for_status()
+
+            # Extract token data
+            result = {
+                "key": response.json()["key"],  # The actual token value - shown only once!
+                "identifier": token["identifier"],
+                "expires": (
+                    datetime.fromisoformat(token["expires"]) if token.get("expires") else None
+                ),
+                "pk": token["pk"],
+                "description": token.get("description", description)
+            }
+
+            logger.debug("Authentik API token created successfully", extra={
+                "identifier": identifier,
+                "expires": expires_at.isoformat()
+            })
 
-                return result
+            return result
 
-        except ApiException as e:
+        except httpx.HTTPError as e:
             logger.error("Failed to create Authentik token", extra={
                 "user_pk": user_pk,
                 "identifier": identifier,
                 "error": str(e),
-                "status_code": e.status if hasattr(e, 'status') else None
-            }, exc_info=True)
+                "status_code": _status_code(e)
+            }, exc_info=logger.isEnabledFor(logging.DEBUG))
             raise
 
-    async def create_token(
-        self,
-        user_pk: int,
-        identifier: str,
-        description: str = "",
-        expires_days: int = 365
-    ) -> Dict[str, Any]:
-        """
-        Create an Authentik API token for a user.
-
-        Args:
-            user_pk: Authentik user primary key (integer ID)
-            identifier: Unique identifier for the token
-            description: Human-readable description
-            expires_days: Days until token expires (default: 365)
-
-        Returns:
-            Dict with token data including the token key (shown only once!)
-        """
-        return await asyncio.to_thread(
-            self._create_token_sync,
-            user_pk,
-            identifier,
-            description,
-            expires_days
-        )
-
-    def _revoke_token_sync(self, token_identifier: str) -> bool:
+    async def revoke_token(self, token_identifier: str) -> bool:
         """
-        Synchronous implementation of revoke Authentik token.
+        Revoke an Authentik API token.
 
         Args:
             token_identifier: The token identifier to revoke
@@ -421,87 +583,98 @@ class AuthentikAPIClient:
         Returns:
             True if successful
         """
-        logger.info("Revoking Authentik token", extra={
+        logger.debug("Revoking Authentik token", extra={
             "identifier": token_identifier
         })
 
         try:
-            with authentik_sdk.ApiClient(self.configuration) as api_client:
-                core_api = CoreApi(api_client)
-
-                # Delete the token
-                core_api.core_tokens_destroy(identifier=token_identifier)
+            response = await self._http.delete(f"core/tokens/{token_identifier}/")
+            response.raise_for_status()
 
-                logger.info("Authentik token revoked successfully", extra={
-                    "identifier": token_identifier
-                })
-                return True
+            logger.debug("Authentik token revoked successfully", extra={
+                "identifier": token_identifier
+            })
+            return True
 
-        except ApiException as e:
+        except httpx.HTTPError as e:
             logger.error("Failed to revoke Authentik token", extra={
                 "identifier": token_identifier,
                 "error": str(e),
-                "status_code": e.status if hasattr(e, 'status') else None
-            }, exc_info=True)
+                "status_code": _status_code(e)
+            }, exc_info=logger.isEnabledFor(logging.DEBUG))
             return False
 
-    async def revoke_token(self, token_identifier: str) -> bool:
+    async def revoke_tokens(
+        self,
+        token_identifiers: List[str],
+        max_concurrency: int = 16
+    ) -> Dict[str, Any]:
         """
-        Revoke an Authentik API token.
+        Revoke several Authentik API tokens concurrently.
 
         Args:
-            token_identifier: The token identifier to revoke
+            token_identifiers: Identifiers of the tokens to revoke
+            max_concurrency: Maximum number of tokens revoked at once
 
         Returns:
-            True if successful
+            Mapping of identifier to True/False (as from revoke_token), or the
+            exception raised while revoking that token
         """
-        return await asyncio.to_thread(self._revoke_token_sync, token_identifier)
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def revoke_one(token_identifier: str) -> bool:
+            async with semaphore:
+                return await self.revoke_token(token_identifier)
 
-    def _list_user_tokens_sync(self, username: str) -> List[Dict[str, Any]]:
+        results = await asyncio.gather(
+            *(revoke_one(identifier) for identifier in token_identifiers),
+            return_exceptions=True
+        )
+        return dict(zip(token_identifiers, results))
+
+    async def iter_user_tokens(self, username: str) -> AsyncIterator[AuthentikToken]:
         """
-        Synchronous implementation of list tokens for a user.
+        Iterate over a user's Authentik API tokens, one page at a time.
 
         Args:
             username: Authentik username
 
-        Returns:
-            List of token dictionaries
+        Yields:
+            AuthentikToken for each token; stops early on API errors
         """
         logger.debug("Listing tokens for user", extra={"username": username})
 
+        page = 1
         try:
-            with authentik_sdk.ApiClient(self.configuration) as api_client:
-                core_api = CoreApi(api_client)
-
-                # List tokens filtered by username
-                tokens_response = core_api.core_tokens_list(user__username=username)
-
-                tokens = []
-                if tokens_response.results:
-                    for token in tokens_response.results:
-                        tokens.append({
-                            "identifier": token.identifier,
-                            "expires": token.expires,
-                            "expiring": token.expiring if hasattr(token, 'expiring') else True,
-                            "description": token.description if hasattr(token, 'description') else "",
-                            "pk": token.pk
-                        })
-
-                logger.debug("Found tokens for user", extra={
-                    "username": username,
-                    "count": len(tokens)
+            while page:
+                response = await self._http.get("core/tokens/", params={
+                    "user__username": username,
+                    "page": page,
+                    "page_size": TOKEN_PAGE_SIZE,
                 })
-
-                return tokens
-
-        except ApiException as e:
+                response.raise_for_status()
+                data = response.json()
+                for token in data.get("results", []):
+                    yield AuthentikToken(
+                        identifier=token["identifier"],
+                        pk=token["pk"],
+                        expires=(
+                            datetime.fromisoformat(token["expires"])
+                            if token.get("expires")
+                            else None
+                        ),
+                        expiring=token.get("expiring", True),
+                        description=token.get("description") or "",
+                    )
+                page = data.get("pagination", {}).get("next") or 0
+
+        except httpx.HTTPError as e:
             logger.error("Failed to list user tokens", extra={
                 "username": username,
                 "error": str(e)
-            }, exc_info=True)
-            return []
+            }, exc_info=logger.isEnabledFor(logging.DEBUG))
 
-    async def list_user_tokens(self, username: str) -> List[Dict[str, Any]]:
+    async def list_user_tokens(self, username: str) -> List[AuthentikToken]:
         """
         List all Authentik API tokens for a user.
 
@@ -509,9 +682,9 @@ class AuthentikAPIClient:
             username: Authentik username
 
         Returns:
-            List of token dictionaries
+            List of AuthentikToken (empty on API errors)
         """
-        return await asyncio.to_thread(self._list_user_tokens_sync, username)
+        return [token async for token in self.iter_user_tokens(username)]
 
     async def delete_user(self, user_id: str) -> bool:
         """
@@ -522,43 +695,66 @@ class AuthentikAPIClient:
 
         Returns:
             True if deletion was successful, False otherwise
+
+        Raises:
+            ValueError: If user_id is not an integer
         """
-        return await asyncio.to_thread(self._delete_user_sync, user_id)
+        user_pk = int(user_id)
 
-    def _delete_user_sync(self, user_id: str) -> bool:
-        """Synchronous implementation of delete_user for SDK compatibility."""
-        logger.info("Deleting user from Authentik", extra={
-            "user_id": user_id
+        logger.debug("Deleting user from Authentik", extra={
+            "user_id": user_pk
         })
 
         try:
-            with authentik_sdk.ApiClient(self.configuration) as api_client:
-                core_api = CoreApi(api_client)
-
-                # Delete the user
-                core_api.core_users_destroy(id=user_id)
-
-                logger.info("User deleted successfully from Authentik", extra={
-                    "user_id": user_id
-                })
-
-                return True
+            response = await self._http.delete(f"core/users/{user_pk}/")
+            response.raise_for_status()
 
-        except ApiException as e:
+        except httpx.HTTPError as e:
             logger.error("Failed to delete user from Authentik", extra={
-                "user_id": user_id,
+                "user_id": user_pk,
                 "error": str(e),
-                "status_code": e.status if hasattr(e, 'status') else None
-            }, exc_info=True)
-            return False
-        except Exception as e:
-            logger.error("Unexpected error deleting user from Authentik", extra={
-                "user_id": user_id,
-                "error": str(e)
-            }, exc_info=True)
+                "status_code": _status_code(e)
+            }, exc_info=logger.isEnabledFor(logging.DEBUG))
             return False
 
+        self.invalidate_user(user_pk=user_pk)
+
+        logger.debug("User deleted successfully from Authentik", extra={
+            "user_id": user_pk
+        })
+        return True
+
+    async def delete_users(
+        self,
+        user_ids: List[str],
+        max_concurrency: int = 16
+    ) -> Dict[str, Any]:
+        """
+        Delete several users from Authentik concurrently.
+
+        Args:
+            user_ids: Authentik user IDs (pk)
+            max_concurrency: Maximum number of users deleted at once
+
+        Returns:
+            Mapping of user ID to True/False (as from delete_user), or the
+            exception raised while deleting that user, e.g. ValueError for a
+            malformed ID
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def delete_one(user_id: str) -> bool:
+            async with semaphore:
+                return await self.delete_user(user_id)
+
+        results = await asyncio.gather(
+            *(delete_one(user_id) for user_id in user_ids),
+            return_exceptions=True
+        )
+        return dict(zip(user_ids, results))
+
 
-# Global client instance
-# Note: Variable name must be different from the imported module
-authentik_api_client = AuthentikAPIClient()
+@functools.lru_cache(maxsize=1)
+def get_authentik_client() -> AuthentikAPIClient:
+    """Return the shared Authentik API client, creating it on first use."""
+    return AuthentikAPIClient()
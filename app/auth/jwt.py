@@ -1,60 +1,243 @@
 """
 JWT token handling and verification for MxWhisper
 """
-from datetime import datetime, timedelta
-from typing import Any, Dict, Optional
+import asyncio
+import functools
+import hashlib
+import json
 import logging
+import os
+import string
+import tempfile
+import time
+from datetime import timedelta
+from typing import Any, Dict, Optional, Tuple
 
 import httpx
-from fastapi import Depends, HTTPException
-from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from jose import JWTError, jwt
+from fastapi import Depends, HTTPException, Request
+from fastapi.security import HTTPBearer
+from jose import JWTError, jwk, jwt
+from jose.exceptions import JOSEError
 
 from app.config import settings
+from app.utils.ttl_cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
-security = HTTPBearer()
+
+class _BearerToken(HTTPBearer):
+    """HTTPBearer that returns the raw token rather than building an
+    HTTPAuthorizationCredentials model; OpenAPI still documents the scheme."""
+
+    async def __call__(self, request: Request) -> str:
+        authorization = request.headers.get("Authorization")
+        if authorization:
+            scheme, _, token = authorization.partition(" ")
+            if token and scheme.lower() == "bearer":
+                return token
+        # Let HTTPBearer raise its usual "Not authenticated" error
+        await super().__call__(request)
+
+
+security = _BearerToken(scheme_name="HTTPBearer")
+
+# Characters allowed in a compact JWT (base64url segments and separators)
+_JWT_CHARS = frozenset(string.ascii_letters + string.digits + "-_.")
+
+# Expected claims and algorithms for Authentik JWTs, bound once from settings
+_EXPECTED_AUDIENCE = settings.authentik_expected_audience
+_EXPECTED_ISSUER = settings.authentik_expected_issuer
+_AUTHENTIK_ALGORITHMS = ["RS256"]  # Authentik typically uses RS256
+
+# Shared client for JWKS and userinfo requests, created on first use
+_authentik_http: Optional[httpx.AsyncClient] = None
+
+# Verified Authentik API tokens (SHA-256 of token -> userinfo)
+_api_token_cache = TTLCache(ttl=settings.authentik_api_token_cache_ttl, maxsize=10_000)
+_api_token_inflight: Dict[str, asyncio.Future] = {}
+
+# Verified Authentik JWT payloads (SHA-256 of token -> claims), never kept past exp
+JWT_PAYLOAD_CACHE_TTL = 30.0
+_jwt_payload_cache = TTLCache(ttl=JWT_PAYLOAD_CACHE_TTL, maxsize=10_000)
 
 # Cache for JWKS keys
 _jwks_cache: Optional[Dict[str, Any]] = None
-_jwks_cache_time: Optional[datetime] = None
-JWKS_CACHE_DURATION = timedelta(hours=24)  # Cache JWKS for 24 hours
+_jwks_cache_time: float = 0.0  # time.monotonic() of the last fetch
+# Verification keys from the cached JWKS, by kid, constructed once per fetch
+_jwks_keys: Dict[str, Any] = {}
+JWKS_CACHE_DURATION = 86400.0  # Cache JWKS for 24 hours (seconds)
+# Serializes refreshes so a cold-cache burst fetches the JWKS only once
+_jwks_lock = asyncio.Lock()
+
+
+def _jwks_cache_fresh() -> bool:
+    return bool(_jwks_cache) and time.monotonic() - _jwks_cache_time < JWKS_CACHE_DURATION
+
+
+def _get_http() -> httpx.AsyncClient:
+    """Return the pooled HTTP client used for Authentik auth endpoints."""
+    global _authentik_http
+    if _authentik_http is None:
+        _authentik_http = httpx.AsyncClient(
+            timeout=10.0,
+            limits=httpx.Limits(max_keepalive_connections=20)
+        )
+    return _authentik_http
+
+
+async def close_http_client() -> None:
+    """Close the shared Authentik HTTP client (call at shutdown)."""
+    global _authentik_http
+    if _authentik_http is not None:
+        await _authentik_http.aclose()
+        _authentik_http = None
+
+
+def _token_key(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def _get_cached_jwt_payload(token: str) -> Optional[Dict[str, Any]]:
+    """Return the cached claims of a previously verified JWT, if still valid."""
+    payload = _jwt_payload_cache.get(_token_key(token), None)
+    if payload is None:
+        return None
+    exp = payload.get("exp")
+    if exp and exp <= time.time():
+        return None
+    return payload
+
+
+def _cache_jwt_payload(token: str, payload: Dict[str, Any]) -> None:
+    """Cache verified claims for a short while, never past the token's exp."""
+    ttl = JWT_PAYLOAD_CACHE_TTL
+    exp = payload.get("exp")
+    if exp:
+        ttl = min(ttl, exp - time.time())
+    if ttl > 0:
+        _jwt_payload_cache.set(_token_key(token), payload, ttl=ttl)
+
+
+def _looks_like_jwt(token: str) -> bool:
+    """Cheap structural check: three base64url segments separated by dots."""
+    return token.count(".") == 2 and _JWT_CHARS.issuperset(token)
+
+
+def _issued_by_authentik(token: str) -> bool:
+    """Whether the token's (unverified) iss claim is the Authentik issuer."""
+    if not _EXPECTED_ISSUER:
+        return False
+    try:
+        claims = jwt.get_unverified_claims(token)
+    except JWTError:
+        return False
+    return claims.get("iss") == _EXPECTED_ISSUER
+
+
+def _construct_keys(jwks: Dict[str, Any]) -> Dict[str, Any]:
+    """Build verification keys for every usable JWK, indexed by kid."""
+    keys = {}
+    for key in jwks.get("keys", []):
+        kid = key.get("kid")
+        if not kid:
+            continue
+        try:
+            keys[kid] = jwk.construct(key, key.get("alg", "RS256"))
+        except JOSEError as e:
+            logger.warning("Skipping unusable JWKS key", extra={
+                "kid": kid,
+                "error": str(e)
+            })
+    return keys
+
+
+def _read_jwks_file() -> Optional[Tuple[Dict[str, Any], float]]:
+    """Return (jwks, age in seconds) from the shared JWKS file if fresh."""
+    path = settings.authentik_jwks_cache_file
+    if not path:
+        return None
+    try:
+        st = os.stat(path)
+        # Only trust a file we wrote: the keys in it decide which tokens verify
+        if st.st_uid != os.getuid() or st.st_mode & 0o022:
+            logger.warning("Ignoring JWKS cache file writable by other users", extra={"path": path})
+            return None
+        age = time.time() - st.st_mtime
+        if not 0 <= age < JWKS_CACHE_DURATION:
+            return None
+        with open(path) as f:
+            return json.load(f), age
+    except (OSError, ValueError):
+        return None
+
+
+def _write_jwks_file(jwks: Dict[str, Any]) -> None:
+    """Atomically replace the shared JWKS file (best effort)."""
+    path = settings.authentik_jwks_cache_file
+    if not path:
+        return
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", prefix=".jwks-")
+        with os.fdopen(fd, "w") as f:
+            json.dump(jwks, f)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning("Failed to write JWKS cache file", extra={
+            "path": path,
+            "error": str(e)
+        })
 
 
 async def get_jwks() -> Dict[str, Any]:
     """Fetch and cache JWKS from Authentik."""
-    global _jwks_cache, _jwks_cache_time
+    global _jwks_cache, _jwks_cache_time, _jwks_keys
 
-    now = datetime.utcnow()
-    if _jwks_cache and _jwks_cache_time and (now - _jwks_cache_time) < JWKS_CACHE_DURATION:
+    if _jwks_cache_fresh():
         logger.debug("Using cached JWKS")
         return _jwks_cache
 
-    logger.info("Fetching JWKS from Authentik", extra={
-        "jwks_url": settings.authentik_jwks_url
-    })
+    async with _jwks_lock:
+        # Another request may have refreshed the cache while we waited
+        if _jwks_cache_fresh():
+            return _jwks_cache
 
-    try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(settings.authentik_jwks_url)
+        # Another worker process may have fetched it recently
+        cached = await asyncio.to_thread(_read_jwks_file)
+        if cached:
+            _jwks_cache, age = cached
+            _jwks_keys = _construct_keys(_jwks_cache)
+            _jwks_cache_time = time.monotonic() - age
+            logger.debug("Loaded JWKS from cache file")
+            return _jwks_cache
+
+        logger.info("Fetching JWKS from Authentik", extra={
+            "jwks_url": settings.authentik_jwks_url
+        })
+
+        try:
+            response = await _get_http().get(settings.authentik_jwks_url)
             response.raise_for_status()
             _jwks_cache = response.json()
-            _jwks_cache_time = now
+            _jwks_keys = _construct_keys(_jwks_cache)
+            _jwks_cache_time = time.monotonic()
+            await asyncio.to_thread(_write_jwks_file, _jwks_cache)
             logger.info("JWKS fetched and cached successfully", extra={
                 "keys_count": len(_jwks_cache.get("keys", []))
             })
             return _jwks_cache
-    except Exception as e:
-        logger.error("Failed to fetch JWKS", extra={
-            "error": str(e),
-            "error_type": type(e).__name__
-        }, exc_info=True)
-        raise HTTPException(status_code=500, detail=f"Failed to fetch JWKS: {str(e)}")
+        except Exception as e:
+            logger.error("Failed to fetch JWKS", extra={
+                "error": str(e),
+                "error_type": type(e).__name__
+            }, exc_info=True)
+            raise HTTPException(status_code=500, detail=f"Failed to fetch JWKS: {str(e)}")
 
 
-def get_public_key(token: str) -> str:
-    """Extract public key from JWKS based on token's 'kid' header."""
+async def get_public_key(token: str) -> Any:
+    """Look up the verification key for the token's 'kid' header.
+
+    The JWKS is only (re)fetched when the cached copy is missing or stale.
+    """
     try:
         header = jwt.get_unverified_header(token)
         kid = header.get("kid")
@@ -62,15 +245,18 @@ def get_public_key(token: str) -> str:
             logger.warning("Token missing 'kid' header")
             raise HTTPException(status_code=401, detail="Token missing 'kid' header")
 
-        jwks = _jwks_cache
-        if not jwks:
+        if not _jwks_cache_fresh():
+            await get_jwks()
+
+        if not _jwks_cache:
             logger.warning("JWKS not available for token verification")
             raise HTTPException(status_code=401, detail="JWKS not available")
 
-        for key in jwks.get("keys", []):
-            if key.get("kid") == kid:
+        key = _jwks_keys.get(kid)
+        if key is not None:
+            if logger.isEnabledFor(logging.DEBUG):
                 logger.debug("Public key found for token", extra={"kid": kid})
-                return key
+            return key
 
         logger.warning("Public key not found for token", extra={"kid": kid})
         raise HTTPException(status_code=401, detail="Public key not found for token")
@@ -86,45 +272,64 @@ async def verify_authentik_api_token(token: str) -> Optional[Dict[str, Any]]:
     Verify Authentik API token by calling Authentik's user info endpoint.
 
     Authentik API tokens are opaque tokens (not JWTs) that need to be verified
-    by calling Authentik's API.
+    by calling Authentik's API. Successful lookups are cached for
+    AUTHENTIK_API_TOKEN_CACHE_TTL seconds, and concurrent lookups of the same
+    token share one request.
     """
     if not settings.authentik_server_url:
         logger.warning("Authentik server URL not configured")
         return None
 
+    # Keyed by hash so raw tokens are never held in the cache
+    cache_key = _token_key(token)
+    user_info = _api_token_cache.get(cache_key, None)
+    if user_info is not None:
+        return dict(user_info)
+
+    future = _api_token_inflight.get(cache_key)
+    if future is None:
+        future = asyncio.ensure_future(_fetch_authentik_userinfo(token, cache_key))
+        _api_token_inflight[cache_key] = future
+        future.add_done_callback(lambda _: _api_token_inflight.pop(cache_key, None))
+    user_info = await asyncio.shield(future)
+    return dict(user_info) if user_info is not None else None
+
+
+async def _fetch_authentik_userinfo(token: str, cache_key: str) -> Optional[Dict[str, Any]]:
     try:
         # Call Authentik's user info endpoint with the token
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{settings.authentik_server_url}/application/o/userinfo/",
-                headers={"Authorization": f"Bearer {token}"},
-                timeout=10.0
-            )
-
-            if response.status_code == 200:
-                user_info = response.json()
+        response = await _get_http().get(
+            f"{settings.authentik_server_url}/application/o/userinfo/",
+            headers={"Authorization": f"Bearer {token}"}
+        )
+
+        if response.status_code == 200:
+            user_info = response.json()
+            _api_token_cache.set(cache_key, user_info)
+            if logger.isEnabledFor(logging.INFO):
                 logger.info("Authentik API token verified successfully", extra={
                     "sub": user_info.get("sub"),
                     "username": user_info.get("preferred_username")
                 })
-                return user_info
-            else:
+            return user_info
+        else:
+            if logger.isEnabledFor(logging.DEBUG):
                 logger.debug("Authentik API token verification failed", extra={
                     "status_code": response.status_code
                 })
-                return None
+            return None
 
     except Exception as e:
-        logger.debug("Failed to verify Authentik API token", extra={
-            "error": str(e),
-            "error_type": type(e).__name__
-        })
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Failed to verify Authentik API token", extra={
+                "error": str(e),
+                "error_type": type(e).__name__
+            })
         return None
 
 
-async def verify_authentik_token(credentials: HTTPAuthorizationCredentials = Depends(security)) -> Dict[str, Any]:
+async def verify_authentik_token(token: str = Depends(security)) -> Dict[str, Any]:
     """Verify JWT token or API token issued by Authentik."""
-    token = credentials.credentials
     logger.debug("Verifying Authentik token")
 
     # First, try to verify as an Authentik API token (opaque token)
@@ -139,44 +344,37 @@ async def verify_authentik_token(credentials: HTTPAuthorizationCredentials = Dep
             logger.warning("Authentik API token verification failed")
             raise HTTPException(status_code=401, detail="Invalid or expired token")
 
+    # Anything else must at least be shaped like a JWT before we touch JWKS
+    if not _looks_like_jwt(token):
+        logger.warning("Token is neither an API token nor a JWT")
+        raise HTTPException(status_code=401, detail="Invalid token")
+
+    payload = _get_cached_jwt_payload(token)
+    if payload is not None:
+        return payload
+
     # Try to verify as a JWT token
     try:
-        # Get JWKS
-        await get_jwks()
-
         # Get public key
-        public_key = get_public_key(token)
+        public_key = await get_public_key(token)
 
         # Decode and verify token
         payload = jwt.decode(
             token,
             public_key,
-            algorithms=["RS256"],  # Authentik typically uses RS256
-            audience=settings.authentik_expected_audience,
-            issuer=settings.authentik_expected_issuer
+            algorithms=_AUTHENTIK_ALGORITHMS,
+            audience=_EXPECTED_AUDIENCE,
+            issuer=_EXPECTED_ISSUER
         )
 
-        # Check if token is expired (skip for non-expiring tokens)
-        exp = payload.get("exp")
-        if exp and datetime.utcfromtimestamp(exp) < datetime.utcnow():
-            logger.warning("Token expired", extra={
-                "exp": exp,
-                "current_time": datetime.utcnow().timestamp()
-            })
-            raise HTTPException(status_code=401, detail="Token expired")
-        elif exp:
-            logger.debug("Token has expiration", extra={"exp": exp})
-        else:
-            logger.info("Non-expiring token verified", extra={
+        # jwt.decode has already rejected an expired token (exp is optional)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("JWT token verified successfully", extra={
                 "sub": payload.get("sub"),
-                "username": payload.get("preferred_username")
+                "username": payload.get("preferred_username"),
+                "exp": payload.get("exp")
             })
-
-        logger.info("JWT token verified successfully", extra={
-            "sub": payload.get("sub"),
-            "username": payload.get("preferred_username"),
-            "exp": exp
-        })
+        _cache_jwt_payload(token, payload)
         return payload
 
     except JWTError as e:
@@ -187,6 +385,15 @@ async def verify_authentik_token(credentials: HTTPAuthorizationCredentials = Dep
         raise HTTPException(status_code=401, detail=f"Token validation failed: {str(e)}")
 
 
+@functools.lru_cache(maxsize=1)
+def _get_token_service():
+    """Shared TokenService, so its Redis clients and pools are set up once."""
+    # Imported here: app.services imports app.auth, so a module-level import
+    # would be circular
+    from app.services.token_service import TokenService
+    return TokenService()
+
+
 def create_service_account_token(user_data: dict, expires_days: int = 365) -> str:
     """
     Create a service account JWT token for API access.
@@ -201,9 +408,7 @@ def create_service_account_token(user_data: dict, expires_days: int = 365) -> st
     Returns:
         JWT token string
     """
-    from app.services.token_service import TokenService
-
-    token_service = TokenService()
+    token_service = _get_token_service()
 
     # Prepare token data
     token_data = {
@@ -231,12 +436,10 @@ async def verify_service_account_token(token: str) -> Optional[Dict[str, Any]]:
 
     These are self-signed JWTs for API access without OAuth2.
     """
-    from app.services.token_service import TokenService
-
-    token_service = TokenService()
+    token_service = _get_token_service()
 
     # Use TokenService to verify token (includes Redis blacklist check)
-    token_data = token_service.verify_token(token)
+    token_data = await token_service.verify_token_async(token)
 
     if not token_data:
         logger.debug("Service account token validation failed or token revoked")
@@ -253,26 +456,28 @@ async def verify_service_account_token(token: str) -> Optional[Dict[str, Any]]:
         "token_type": "service_account"
     }
 
-    logger.info("Service account token verified successfully", extra={
-        "sub": payload.get("sub"),
-        "username": payload.get("username")
-    })
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Service account token verified successfully", extra={
+            "sub": payload.get("sub"),
+            "username": payload.get("username")
+        })
 
     return payload
 
 
-async def verify_token_with_fallback(credentials: HTTPAuthorizationCredentials = Depends(security)) -> Dict[str, Any]:
+async def verify_token_with_fallback(token: str = Depends(security)) -> Dict[str, Any]:
     """
     Verify token with multiple fallback methods:
     1. Service account JWT (self-signed for API access)
     2. Authentik API token (opaque token)
     3. Authentik JWT token (OAuth2/OIDC)
     """
-    token = credentials.credentials
     logger.debug("Verifying token with fallback methods")
 
-    # Try service account JWT first (most common for API access)
-    if '.' in token:  # JWTs have dots
+    # Try service account JWT first (most common for API access). Malformed
+    # tokens skip it, saving the Redis blacklist lookup, and so do tokens
+    # issued by Authentik, saving a signature check that is bound to fail
+    if _looks_like_jwt(token) and not _issued_by_authentik(token):
         service_account_payload = await verify_service_account_token(token)
         if service_account_payload:
             return service_account_payload
@@ -288,37 +493,37 @@ async def verify_token_with_fallback(credentials: HTTPAuthorizationCredentials =
             logger.warning("Authentik API token verification failed")
             raise HTTPException(status_code=401, detail="Invalid or expired token")
 
+    # Anything else must at least be shaped like a JWT before we touch JWKS
+    if not _looks_like_jwt(token):
+        logger.warning("Token is neither an API token nor a JWT")
+        raise HTTPException(status_code=401, detail="Invalid token")
+
+    payload = _get_cached_jwt_payload(token)
+    if payload is not None:
+        return payload
+
     # Try Authentik JWT token (OAuth2/OIDC)
     try:
-        # Get JWKS
-        await get_jwks()
-
         # Get public key
-        public_key = get_public_key(token)
+        public_key = await get_public_key(token)
 
         # Decode and verify token
         payload = jwt.decode(
             token,
             public_key,
-            algorithms=["RS256"],  # Authentik typically uses RS256
-            audience=settings.authentik_expected_audience,
-            issuer=settings.authentik_expected_issuer
+            algorithms=_AUTHENTIK_ALGORITHMS,
+            audience=_EXPECTED_AUDIENCE,
+            issuer=_EXPECTED_ISSUER
         )
 
-        # Check if token is expired
-        exp = payload.get("exp")
-        if exp and datetime.utcfromtimestamp(exp) < datetime.utcnow():
-            logger.warning("Authentik JWT token expired", extra={
-                "exp": exp,
-                "current_time": datetime.utcnow().timestamp()
+        # jwt.decode has already rejected an expired token
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Authentik JWT token verified successfully", extra={
+                "sub": payload.get("sub"),
+                "username": payload.get("preferred_username"),
+                "exp": payload.get("exp")
             })
-            raise HTTPException(status_code=401, detail="Token expired")
-
-        logger.info("Authentik JWT token verified successfully", extra={
-            "sub": payload.get("sub"),
-            "username": payload.get("preferred_username"),
-            "exp": exp
-        })
+        _cache_jwt_payload(token, payload)
         return payload
 
     except JWTError as e:
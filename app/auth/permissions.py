@@ -6,6 +6,9 @@ from typing import Dict, Any, Optional
 
 logger = logging.getLogger(__name__)
 
+# Authentik groups whose members get admin privileges
+_ADMIN_GROUPS = frozenset({"admin", "administrators", "Admins", "admin.mxwhisper", "mxwhisper-admin"})
+
 
 def extract_user_info_from_token(token_payload: Dict[str, Any]) -> Dict[str, Any]:
     """
@@ -17,12 +20,15 @@ def extract_user_info_from_token(token_payload: Dict[str, Any]) -> Dict[str, Any
     Returns:
         Dict with user information
     """
+    groups = token_payload.get("groups", [])
     return {
         "sub": token_payload.get("sub"),
         "email": token_payload.get("email"),
         "name": token_payload.get("name"),
         "preferred_username": token_payload.get("preferred_username"),
-        "groups": token_payload.get("groups", [])
+        "groups": groups,
+        # Decided once here so the permission checks below don't rescan groups
+        "is_admin": not _ADMIN_GROUPS.isdisjoint(groups)
     }
 
 
@@ -36,15 +42,19 @@ def has_admin_group(user_info: Dict[str, Any]) -> bool:
     Returns:
         True if user has admin privileges
     """
-    groups = user_info.get("groups", [])
-    admin_groups = ["admin", "administrators", "Admins", "admin.mxwhisper", "mxwhisper-admin"]
+    has_admin = user_info.get("is_admin")
+    if has_admin is not None:
+        return has_admin
 
-    has_admin = any(group in admin_groups for group in groups)
-    logger.debug("Admin group check", extra={
-        "username": user_info.get("preferred_username"),
-        "groups": groups,
-        "has_admin": has_admin
-    })
+    # user_info not built by extract_user_info_from_token
+    groups = user_info.get("groups", [])
+    has_admin = not _ADMIN_GROUPS.isdisjoint(groups)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Admin group check", extra={
+            "username": user_info.get("preferred_username"),
+            "groups": groups,
+            "has_admin": has_admin
+        })
 
     return has_admin
 
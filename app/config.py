@@ -3,10 +3,31 @@ from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
     database_url: str = "postgresql+asyncpg://localhost/mxwhisper"
+    database_pool_size: int = 20  # Persistent connections per process
+    database_max_overflow: int = 10  # Extra connections allowed under burst load
+    database_pool_recycle: int = 3600  # Seconds before a pooled connection is replaced (outlives idle timeouts in proxies/firewalls)
+    database_statement_timeout: str = "60s"  # Per-statement limit for API and worker queries
+    # HNSW candidates examined per vector search (higher = better recall, slower);
+    # scripts/manage_vector_indexes.py show suggests a value for the corpus size
+    pgvector_hnsw_ef_search: int = 100
+    # Keep scanning the HNSW index until a filtered search (e.g. by user) has
+    # LIMIT rows, instead of stopping after ef_search candidates (pgvector 0.8+)
+    pgvector_hnsw_iterative_scan: str = "strict_order"  # Options: strict_order, relaxed_order, off
+    # Index type for chunk embeddings, applied by migrations and
+    # scripts/manage_vector_indexes.py rebuild
+    pgvector_index_type: str = "hnsw"  # Options: hnsw (read-heavy), ivfflat (write-heavy/bulk loads)
+    # IVFFlat lists scanned per vector search; about sqrt(lists), which
+    # scripts/manage_vector_indexes.py show suggests for the corpus size
+    pgvector_ivfflat_probes: int = 10
     temporal_host: str = "localhost:7233"
     upload_dir: str = "uploads"
     max_file_size: int = 1 * 1024 * 1024 * 1024  # 1GB
 
+    # Migration Settings (applied to every Alembic migration session)
+    migration_mode: str = "skip"  # Options: skip (run alembic manually), sync (before serving), async (in background)
+    migration_lock_timeout: str = "3s"  # Fail fast instead of queueing behind long-running queries
+    migration_statement_timeout: str = "5min"
+
     # Whisper Configuration
     whisper_model_size: str = "base"  # Options: tiny, base, small, medium, large
 
@@ -40,6 +61,10 @@ class Settings(BaseSettings):
     authentik_expected_issuer: str = ""
     authentik_expected_audience: str = ""
     authentik_scopes: str = "openid profile email"
+    # Seconds a verified Authentik API token is trusted before re-checking userinfo
+    authentik_api_token_cache_ttl: int = 60
+    # JWKS shared between worker processes; empty disables the file cache
+    authentik_jwks_cache_file: str = "/tmp/mxwhisper-jwks.json"
     # Authentik API Configuration (for admin operations)
     authentik_api_url: str = ""
     authentik_admin_token: str = ""  # Admin token for API access
@@ -60,6 +85,7 @@ class Settings(BaseSettings):
     redis_port: int = 6379
     redis_db: int = 1
     redis_password: str = ""
+    redis_max_connections: int = 50  # Pooled connections shared by all Redis clients in a process
 
     # Test token for API verification
     test_token: str = ""
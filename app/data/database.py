@@ -7,8 +7,37 @@ from app.config import settings
 from .models import Base
 
 DATABASE_URL = settings.database_url
+# Compiled SQL kept by SQLAlchemy (default 500), so the many endpoint
+# queries don't evict each other
+QUERY_CACHE_SIZE = 2048
+# Server-side prepared statements kept per asyncpg connection (default 100)
+PREPARED_STATEMENT_CACHE_SIZE = 256
+
 # Disable SQL echo for management scripts - set to False to reduce noise
-engine = create_async_engine(DATABASE_URL, echo=False)
+engine = create_async_engine(
+    DATABASE_URL,
+    echo=False,
+    pool_size=settings.database_pool_size,
+    max_overflow=settings.database_max_overflow,
+    pool_recycle=settings.database_pool_recycle,
+    query_cache_size=QUERY_CACHE_SIZE,
+    connect_args={
+        "prepared_statement_cache_size": PREPARED_STATEMENT_CACHE_SIZE,
+        # Sent in the startup packet, so every pooled connection has them without
+        # an extra round trip
+        "server_settings": {
+            "hnsw.ef_search": str(settings.pgvector_hnsw_ef_search),
+            # pgvector releases before 0.8 don't know this setting and drop it
+            # with a warning when the extension loads
+            "hnsw.iterative_scan": settings.pgvector_hnsw_iterative_scan,
+            "ivfflat.probes": str(settings.pgvector_ivfflat_probes),
+            "statement_timeout": settings.database_statement_timeout,
+            # Vector scans have high planner costs, which trips JIT compilation
+            # that takes longer than the short queries it is meant to speed up
+            "jit": "off",
+        },
+    },
+)
 async_session = async_sessionmaker(engine, expire_on_commit=False)
 
 
@@ -0,0 +1,43 @@
+"""
+Run Alembic migrations from inside the API process
+"""
+import asyncio
+import logging
+from pathlib import Path
+
+from alembic import command
+from alembic.config import Config
+
+logger = logging.getLogger(__name__)
+
+ALEMBIC_INI = Path(__file__).resolve().parents[2] / "config" / "alembic.ini"
+
+# Progress of the startup migration run, reported by /healthz and /ready
+migration_state = {"status": "pending", "error": None}
+
+
+def _upgrade_head() -> None:
+    """Upgrade the database to head (blocking)."""
+    alembic_cfg = Config(str(ALEMBIC_INI))
+    # Keep the application's logging setup instead of alembic.ini's
+    alembic_cfg.attributes["configure_logger"] = False
+    command.upgrade(alembic_cfg, "head")
+
+
+async def run_migrations() -> None:
+    """Upgrade the database to head without blocking the event loop.
+
+    alembic/env.py drives its async engine with asyncio.run(), so the upgrade
+    runs in a worker thread with its own event loop. The caller marks
+    migration_state "complete" once the rest of startup has succeeded.
+    """
+    migration_state["status"] = "running"
+    logger.info("Running database migrations")
+    try:
+        await asyncio.to_thread(_upgrade_head)
+    except Exception as e:
+        migration_state["status"] = "failed"
+        migration_state["error"] = str(e)
+        logger.exception("Database migrations failed")
+        raise
+    logger.info("Database migrations complete")
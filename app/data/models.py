@@ -4,22 +4,29 @@ SQLAlchemy models for MxWhisper
 from datetime import datetime
 from typing import Optional, List
 
-from sqlalchemy import DateTime, String, Text, func, ForeignKey, Float, Integer, ARRAY, Boolean, UniqueConstraint, BigInteger
+from sqlalchemy import DateTime, String, Text, func, ForeignKey, Float, Integer, ARRAY, Boolean, UniqueConstraint, BigInteger, LargeBinary, Enum
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
-from pgvector.sqlalchemy import Vector
+from pgvector.sqlalchemy import HALFVEC, Vector
 
 
 class Base(DeclarativeBase):
     pass
 
 
+# Fixed-vocabulary columns are native Postgres enums: 4 bytes per row,
+# compared as integers, and unknown values are rejected by the database
+PROCESSING_STATUSES = ("pending", "processing", "completed", "failed")
+JOB_TYPES = ("download", "transcription")
+SOURCE_TYPES = ("upload", "download")
+
+
 class Role(Base):
     __tablename__ = "roles"
 
     id: Mapped[int] = mapped_column(primary_key=True)
     name: Mapped[str] = mapped_column(String(50), unique=True)  # admin, user, etc.
     description: Mapped[Optional[str]] = mapped_column(String(255))
-    created_at: Mapped[DateTime] = mapped_column(DateTime, default=func.now())
+    created_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), default=func.now())
 
 
 class User(Base):
@@ -30,7 +37,7 @@ class User(Base):
     name: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
     preferred_username: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
     role_id: Mapped[int] = mapped_column(ForeignKey("roles.id"), default=2)  # Foreign key to roles table
-    role: Mapped[Role] = relationship("Role")  # Relationship to Role table
+    role: Mapped[Role] = relationship("Role", lazy="joined")  # Loaded with the user in the same SELECT
 
     # Authentik token metadata for service accounts
     token_created_at: Mapped[Optional[DateTime]] = mapped_column(DateTime, nullable=True)  # When token was issued
@@ -38,8 +45,8 @@ class User(Base):
     current_token_jti: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)  # Current active token JTI for revocation
     token_revocation_counter: Mapped[int] = mapped_column(Integer, default=0)  # Counter for token revocation
 
-    created_at: Mapped[DateTime] = mapped_column(DateTime, default=func.now())
-    updated_at: Mapped[DateTime] = mapped_column(DateTime, default=func.now(), onupdate=func.now())
+    created_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), default=func.now())
+    updated_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), default=func.now(), onupdate=func.now())
 
     # Relationships
     collections: Mapped[List["Collection"]] = relationship(back_populates="user", cascade="all, delete-orphan")
@@ -52,17 +59,18 @@ class Job(Base):
     user_id: Mapped[Optional[str]] = mapped_column(String(255), ForeignKey("users.id"), nullable=True)  # Foreign key to users.id
     filename: Mapped[str] = mapped_column(String(255))
     file_path: Mapped[str] = mapped_column(String(500))
-    status: Mapped[str] = mapped_column(String(50), default="pending")  # pending, processing, completed, failed
+    status: Mapped[str] = mapped_column(Enum(*PROCESSING_STATUSES, name="job_status"), default="pending")
     transcript: Mapped[Optional[Text]] = mapped_column(Text, nullable=True)
-    embedding: Mapped[Optional[Vector]] = mapped_column(Vector(384), nullable=True)  # Semantic embedding for search (384-dim) - deprecated, use chunks
+    # Deprecated, use chunks. Deferred so Job queries don't fetch 1.5 KB of vector per row
+    embedding: Mapped[Optional[Vector]] = mapped_column(Vector(384), nullable=True, deferred=True)  # Semantic embedding for search (384-dim)
 
     # New columns for job type polymorphism
-    job_type: Mapped[str] = mapped_column(String(50), nullable=False, default="transcription")  # 'download' | 'transcription'
+    job_type: Mapped[str] = mapped_column(Enum(*JOB_TYPES, name="job_type"), nullable=False, default="transcription")
     audio_file_id: Mapped[Optional[int]] = mapped_column(ForeignKey("audio_files.id", ondelete="SET NULL"), nullable=True)  # For transcription jobs
     source_url: Mapped[Optional[str]] = mapped_column(Text, nullable=True)  # For download jobs
 
-    created_at: Mapped[DateTime] = mapped_column(DateTime, default=func.now())
-    updated_at: Mapped[DateTime] = mapped_column(DateTime, default=func.now(), onupdate=func.now())
+    created_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), default=func.now())
+    updated_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), default=func.now(), onupdate=func.now())
 
     user: Mapped["User"] = relationship()
     audio_file: Mapped[Optional["AudioFile"]] = relationship(back_populates="jobs")
@@ -79,11 +87,13 @@ class Topic(Base):
     name: Mapped[str] = mapped_column(String(100), unique=True, nullable=False)
     description: Mapped[Optional[str]] = mapped_column(Text)
     parent_id: Mapped[Optional[int]] = mapped_column(ForeignKey("topics.id"))
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=func.now())
-    updated_at: Mapped[datetime] = mapped_column(DateTime, default=func.now(), onupdate=func.now())
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=func.now())
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=func.now(), onupdate=func.now())
 
     # Relationships
-    parent: Mapped[Optional["Topic"]] = relationship("Topic", remote_side=[id], backref="children")
+    parent: Mapped[Optional["Topic"]] = relationship("Topic", remote_side=[id], back_populates="children")
+    # Left lazy: the topic tree is assembled from parent_id (TopicService.build_topic_hierarchy)
+    children: Mapped[List["Topic"]] = relationship("Topic", back_populates="parent")
 
 
 class Collection(Base):
@@ -99,8 +109,8 @@ class Collection(Base):
     collection_type: Mapped[Optional[str]] = mapped_column(String(50))  # 'book', 'course', 'series', 'album', etc.
     user_id: Mapped[str] = mapped_column(String(255), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     is_public: Mapped[bool] = mapped_column(Boolean, default=False)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=func.now())
-    updated_at: Mapped[datetime] = mapped_column(DateTime, default=func.now(), onupdate=func.now())
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=func.now())
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=func.now(), onupdate=func.now())
 
     # Relationships
     user: Mapped["User"] = relationship(back_populates="collections")
@@ -124,16 +134,16 @@ class AudioFile(Base):
     duration: Mapped[Optional[float]] = mapped_column(Float)  # Seconds
 
     # Deduplication
-    checksum: Mapped[str] = mapped_column(String(64), nullable=False)  # SHA256 hash
+    checksum: Mapped[bytes] = mapped_column(LargeBinary(32), nullable=False)  # SHA256 digest (raw 32 bytes)
 
     # Source tracking
-    source_type: Mapped[str] = mapped_column(String(50), nullable=False)  # 'upload' | 'download'
+    source_type: Mapped[str] = mapped_column(Enum(*SOURCE_TYPES, name="audio_source_type"), nullable=False)
     source_url: Mapped[Optional[str]] = mapped_column(Text)  # Original URL if downloaded
     source_platform: Mapped[Optional[str]] = mapped_column(String(100))  # 'youtube', 'soundcloud', etc.
 
     # Metadata
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=func.now())
-    updated_at: Mapped[datetime] = mapped_column(DateTime, default=func.now(), onupdate=func.now())
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=func.now())
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=func.now(), onupdate=func.now())
 
     # Relationships
     user: Mapped["User"] = relationship()
@@ -159,7 +169,9 @@ class Transcription(Base):
     # Transcription content
     transcript: Mapped[str] = mapped_column(Text, nullable=False)  # Full plaintext transcript
     from sqlalchemy.dialects.postgresql import JSONB
-    segments: Mapped[Optional[dict]] = mapped_column(JSONB, nullable=True)  # Whisper segments as JSONB
+    # Whisper segments as JSONB, often many KB per row. Deferred: only chunking
+    # reads them, so other queries don't fetch and decompress them
+    segments: Mapped[Optional[dict]] = mapped_column(JSONB, nullable=True, deferred=True)
     language: Mapped[Optional[str]] = mapped_column(String(10))  # Detected/specified language code
 
     # Model information
@@ -171,12 +183,12 @@ class Transcription(Base):
     processing_time: Mapped[Optional[float]] = mapped_column(Float)  # Seconds taken to transcribe
 
     # Status tracking
-    status: Mapped[str] = mapped_column(String(50), nullable=False, default="pending")  # 'pending' | 'processing' | 'completed' | 'failed'
+    status: Mapped[str] = mapped_column(Enum(*PROCESSING_STATUSES, name="transcription_status"), nullable=False, default="pending")
     error_message: Mapped[Optional[str]] = mapped_column(Text)  # If status = 'failed'
 
     # Metadata
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=func.now())
-    updated_at: Mapped[datetime] = mapped_column(DateTime, default=func.now(), onupdate=func.now())
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=func.now())
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=func.now(), onupdate=func.now())
 
     # Relationships
     audio_file: Mapped["AudioFile"] = relationship(back_populates="transcriptions")
@@ -193,8 +205,10 @@ class TranscriptionChunk(Base):
     """
     __tablename__ = "transcription_chunks"
 
-    id: Mapped[int] = mapped_column(primary_key=True)
-    transcription_id: Mapped[int] = mapped_column(ForeignKey("transcriptions.id", ondelete="CASCADE"), nullable=False)
+    # Hash-partitioned by transcription_id (16 partitions), so the primary key
+    # includes it; every chunk query filters on transcription_id
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)  # BIGINT: many chunks per transcription
+    transcription_id: Mapped[int] = mapped_column(ForeignKey("transcriptions.id", ondelete="CASCADE"), primary_key=True)
 
     # Chunk content
     chunk_index: Mapped[int] = mapped_column(Integer, nullable=False)  # Sequential order within transcription
@@ -214,15 +228,16 @@ class TranscriptionChunk(Base):
     end_char_pos: Mapped[Optional[int]] = mapped_column(Integer)
 
     # Semantic search
-    embedding: Mapped[Optional[Vector]] = mapped_column(Vector(384))  # pgvector embedding
+    embedding: Mapped[Optional[HALFVEC]] = mapped_column(HALFVEC(384))  # pgvector half-precision embedding
 
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=func.now())
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=func.now())
 
     # Relationships
     transcription: Mapped["Transcription"] = relationship(back_populates="chunks")
 
     __table_args__ = (
         UniqueConstraint('transcription_id', 'chunk_index', name='uq_transcription_chunk'),
+        {"postgresql_partition_by": "HASH (transcription_id)"},
     )
 
 
@@ -245,7 +260,7 @@ class TranscriptionTopic(Base):
     assigned_by: Mapped[Optional[str]] = mapped_column(String(255), ForeignKey("users.id"))  # NULL if AI-assigned
     user_reviewed: Mapped[bool] = mapped_column(Boolean, default=False)  # User confirmed/rejected
 
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=func.now())
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=func.now())
 
     # Relationships
     transcription: Mapped["Transcription"] = relationship(back_populates="transcription_topics")
@@ -271,7 +286,7 @@ class TranscriptionCollection(Base):
     position: Mapped[Optional[int]] = mapped_column(Integer)  # Order within collection
     assigned_by: Mapped[Optional[str]] = mapped_column(String(255), ForeignKey("users.id"))  # Who added to collection
 
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=func.now())
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=func.now())
 
     # Relationships
     transcription: Mapped["Transcription"] = relationship(back_populates="transcription_collections")
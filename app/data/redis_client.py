@@ -1,84 +1,151 @@
-import redis
-from typing import Optional
+import asyncio
+import hashlib
 import logging
+from typing import Callable, Dict, List, Optional
+
+import redis.asyncio as redis
 
 from app.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Revoked tokens are keyed by their hash: 64 characters per key instead of
+# the whole JWT, which runs to several hundred bytes
+REVOKED_TOKEN_KEY = "mxwhisper:revoked_token_sha256:{}"
+# Keys written before that, by the raw token. Still checked until the last
+# of them expires (at most one token lifetime)
+LEGACY_REVOKED_TOKEN_KEY = "mxwhisper:revoked_token:{}"
+
+# Each revocation is announced here (as the token's hash) so every process can
+# drop the token from its in-process "not revoked" cache
+REVOCATION_CHANNEL = "mxwhisper:revocations"
+RESUBSCRIBE_DELAY = 5.0  # seconds between attempts to restore a lost subscription
+
+# Shared by every RedisClient, so concurrent requests reuse a bounded set of
+# connections instead of each client opening its own
+_pool: Optional[redis.ConnectionPool] = None
+
+
+def _get_pool() -> redis.ConnectionPool:
+    global _pool
+    if _pool is None:
+        _pool = redis.ConnectionPool(
+            host=settings.redis_host,
+            port=settings.redis_port,
+            db=settings.redis_db,
+            password=settings.redis_password,
+            decode_responses=True,
+            socket_connect_timeout=5,
+            socket_timeout=5,
+            retry_on_timeout=True,
+            max_connections=settings.redis_max_connections
+        )
+    return _pool
+
+
+def hash_token(token: str) -> str:
+    """SHA-256 of a token: how tokens are keyed in caches and announced on REVOCATION_CHANNEL."""
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def _revocation_keys(token: str) -> tuple:
+    return REVOKED_TOKEN_KEY.format(hash_token(token)), LEGACY_REVOKED_TOKEN_KEY.format(token)
+
+
+async def close_redis_pool() -> None:
+    """Close the shared Redis connection pool (call at shutdown)."""
+    global _pool
+    if _pool is not None:
+        await _pool.aclose()
+        _pool = None
+
 
 class RedisClient:
     def __init__(self):
-        self.client: Optional[redis.Redis] = None
-        self._connect()
-
-    def _connect(self):
-        """Establish connection to Redis."""
-        try:
-            self.client = redis.Redis(
-                host=settings.redis_host,
-                port=settings.redis_port,
-                db=settings.redis_db,
-                password=settings.redis_password,
-                decode_responses=True,
-                socket_connect_timeout=5,
-                socket_timeout=5,
-                retry_on_timeout=True
-            )
-            # Test connection
-            self.client.ping()
-            logger.info("Connected to Redis successfully")
-        except redis.ConnectionError as e:
-            logger.error(f"Failed to connect to Redis: {e}")
-            self.client = None
-        except Exception as e:
-            logger.error(f"Unexpected error connecting to Redis: {e}")
-            self.client = None
+        # Connects lazily on first command, from the shared pool
+        self.client = redis.Redis(connection_pool=_get_pool())
 
-    def is_connected(self) -> bool:
+    async def is_connected(self) -> bool:
         """Check if Redis client is connected."""
-        if not self.client:
-            return False
         try:
-            self.client.ping()
+            await self.client.ping()
             return True
-        except:
+        except Exception:
             return False
 
-    def set_revoked_token(self, token: str, ttl_seconds: int) -> bool:
+    async def set_revoked_token(self, token: str, ttl_seconds: int) -> bool:
         """Add token to revocation blacklist with TTL."""
-        if not self.client:
-            logger.error("Redis client not available")
-            return False
-
+        token_hash = hash_token(token)
         try:
-            # Use token as key, store minimal data or just use as set
-            result = self.client.setex(f"mxwhisper:revoked_token:{token}", ttl_seconds, "1")
+            async with self.client.pipeline(transaction=False) as pipe:
+                pipe.setex(REVOKED_TOKEN_KEY.format(token_hash), ttl_seconds, "1")
+                pipe.publish(REVOCATION_CHANNEL, token_hash)
+                result, _ = await pipe.execute()
             return result is True
         except Exception as e:
             logger.error(f"Failed to revoke token: {e}")
             return False
 
-    def is_token_revoked(self, token: str) -> bool:
+    async def is_token_revoked(self, token: str) -> bool:
         """Check if token is in revocation blacklist."""
-        if not self.client:
-            logger.error("Redis client not available")
+        try:
+            result = await self.client.exists(*_revocation_keys(token))
+            return result > 0
+        except Exception as e:
+            logger.error(f"Failed to check token revocation: {e}")
             return False
 
+    async def set_revoked_tokens(self, tokens: Dict[str, int]) -> bool:
+        """Add several tokens (token -> TTL seconds) to the blacklist in one round trip."""
         try:
-            result = self.client.exists(f"mxwhisper:revoked_token:{token}")
-            return result == 1
+            async with self.client.pipeline(transaction=False) as pipe:
+                for token, ttl_seconds in tokens.items():
+                    token_hash = hash_token(token)
+                    pipe.setex(REVOKED_TOKEN_KEY.format(token_hash), ttl_seconds, "1")
+                    pipe.publish(REVOCATION_CHANNEL, token_hash)
+                results = await pipe.execute()
+            # Replies alternate SETEX, PUBLISH
+            return all(result is True for result in results[::2])
         except Exception as e:
-            logger.error(f"Failed to check token revocation: {e}")
+            logger.error(f"Failed to revoke tokens: {e}")
             return False
 
-    def health_check(self) -> dict:
-        """Perform health check on Redis connection."""
-        if not self.client:
-            return {"status": "disconnected", "error": "Redis client not initialized"}
+    async def are_tokens_revoked(self, tokens: List[str]) -> Optional[List[bool]]:
+        """Check several tokens against the blacklist in one round trip; None if Redis failed."""
+        try:
+            async with self.client.pipeline(transaction=False) as pipe:
+                for token in tokens:
+                    pipe.exists(*_revocation_keys(token))
+                results = await pipe.execute()
+            return [result > 0 for result in results]
+        except Exception as e:
+            logger.error(f"Failed to check token revocation: {e}")
+            return None
 
+    async def listen_for_revocations(self, on_revoked: Callable[[str], None]) -> None:
+        """Call on_revoked with the hash of every token revoked by any process.
+
+        Runs until cancelled, resubscribing after connection errors.
+        """
+        while True:
+            try:
+                async with self.client.pubsub() as pubsub:
+                    await pubsub.subscribe(REVOCATION_CHANNEL)
+                    async for message in pubsub.listen():
+                        if message["type"] == "message":
+                            on_revoked(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(
+                    f"Lost revocation subscription, retrying in {RESUBSCRIBE_DELAY}s: {e}"
+                )
+                await asyncio.sleep(RESUBSCRIBE_DELAY)
+
+    async def health_check(self) -> dict:
+        """Perform health check on Redis connection."""
         try:
-            self.client.ping()
+            await self.client.ping()
             return {"status": "connected"}
         except Exception as e:
-            return {"status": "error", "error": str(e)}
\ No newline at end of file
+            return {"status": "error", "error": str(e)}
@@ -0,0 +1,217 @@
+"""
+pgvector index sizing and nearest-neighbour queries for MxWhisper
+"""
+import math
+from typing import Dict, List, Optional
+
+# HNSW parameters by number of indexed vectors: (exclusive upper bound, params).
+# Small corpora get the pgvector defaults (fast builds, little memory); larger
+# ones need more links per node and wider searches to keep recall up
+HNSW_TIERS = [
+    (100_000, {"m": 16, "ef_construction": 64, "ef_search": 40}),
+    (1_000_000, {"m": 24, "ef_construction": 100, "ef_search": 100}),
+    (None, {"m": 32, "ef_construction": 128, "ef_search": 200}),
+]
+
+# Chunk embedding indexes semantic search runs against: (index, table)
+HNSW_INDEXES = [
+    ("idx_job_chunks_embedding_hnsw", "job_chunks"),
+    ("idx_transcription_chunks_embedding_hnsw", "transcription_chunks"),
+]
+
+# IVFFlat alternative (settings.pgvector_index_type): builds far faster and
+# smaller than HNSW, at some recall cost, for write-heavy or bulk-loaded corpora
+IVFFLAT_INDEXES = [
+    ("idx_job_chunks_embedding_ivfflat", "job_chunks"),
+    ("idx_transcription_chunks_embedding_ivfflat", "transcription_chunks"),
+]
+
+VECTOR_INDEXES = {"hnsw": HNSW_INDEXES, "ivfflat": IVFFLAT_INDEXES}
+
+# Above this many rows IVFFlat uses sqrt(rows) lists instead of rows / 1000
+IVFFLAT_SQRT_THRESHOLD = 1_000_000
+
+# Chunk embeddings are stored as halfvec (2 bytes per dimension)
+EMBEDDING_OPCLASS = "halfvec_cosine_ops"
+
+# Query embeddings are cast to the column type: the index only serves
+# <=> between two halfvecs
+QUERY_EMBEDDING_SQL = "CAST(:query_embedding AS halfvec(384))"
+
+# Type of a table's embedding column ('vector' or 'halfvec'); the HNSW
+# operator class is named after it
+EMBEDDING_TYPE_SQL = (
+    "SELECT format_type(atttypid, NULL) FROM pg_attribute "
+    "WHERE attrelid = CAST(:table AS regclass) AND attname = 'embedding'"
+)
+
+# Planner estimate of the rows in each of a table's vector indexes: the
+# table's own row count, or its largest partition's for a partitioned table
+# (each partition has its own index). Free, unlike count(*), and close enough
+# to pick a tier (reltuples is -1 before the first VACUUM/ANALYZE)
+ESTIMATED_ROWS_SQL = (
+    "SELECT GREATEST(COALESCE(MAX(reltuples), 0), 0)::bigint FROM pg_class "
+    "WHERE (oid = CAST(:table AS regclass) AND relkind = 'r') "
+    "OR oid IN (SELECT inhrelid FROM pg_inherits WHERE inhparent = CAST(:table AS regclass))"
+)
+
+# Partitions of a table, in creation order; none for a plain table
+PARTITIONS_SQL = (
+    "SELECT inhrelid::regclass::text FROM pg_inherits "
+    "WHERE inhparent = CAST(:table AS regclass) ORDER BY inhrelid"
+)
+
+
+def configure_hnsw_params(vector_count: int) -> Dict[str, int]:
+    """Return m, ef_construction and ef_search for an index over vector_count rows."""
+    limit: Optional[int]
+    for limit, params in HNSW_TIERS:
+        if limit is None or vector_count < limit:
+            return dict(params)
+    raise AssertionError("HNSW_TIERS must end with an unbounded tier")
+
+
+def configure_ivfflat_params(vector_count: int) -> Dict[str, int]:
+    """Return lists and probes for an IVFFlat index over vector_count rows."""
+    if vector_count < IVFFLAT_SQRT_THRESHOLD:
+        lists = max(vector_count // 1000, 1)
+    else:
+        lists = math.isqrt(vector_count)
+    return {"lists": lists, "probes": max(round(math.sqrt(lists)), 1)}
+
+
+def embedding_distance_sql(table_name: str) -> str:
+    """Cosine distance from table_name.embedding to the :query_embedding parameter.
+
+    Order nearest-neighbour queries by this expression, ascending: that is the
+    only ordering the HNSW/IVFFlat indexes can produce. Ordering by a derived
+    similarity (1 - distance) DESC forces a sequential scan and sort.
+    """
+    return f"{table_name}.embedding <=> {QUERY_EMBEDDING_SQL}"
+
+
+def job_chunk_search_sql() -> str:
+    """Semantic search over one user's completed jobs (POST /search).
+
+    Takes :query_embedding, :user_id and :limit. The user and status filters
+    apply to the rows the HNSW index returns; hnsw.iterative_scan, set on
+    every connection, keeps the scan going until :limit rows pass them.
+    """
+    distance = embedding_distance_sql("job_chunks")
+    return f"""
+        SELECT
+            job_chunks.id as chunk_id,
+            job_chunks.job_id,
+            job_chunks.chunk_index,
+            job_chunks.text as matched_text,
+            job_chunks.topic_summary,
+            job_chunks.keywords,
+            job_chunks.start_time,
+            job_chunks.end_time,
+            jobs.filename,
+            jobs.created_at,
+            (1 - ({distance})) as similarity
+        FROM job_chunks
+        JOIN jobs ON job_chunks.job_id = jobs.id
+        WHERE
+            jobs.status = 'completed'
+            AND job_chunks.embedding IS NOT NULL
+            AND jobs.user_id = :user_id
+        ORDER BY {distance}
+        LIMIT :limit
+    """
+
+
+def create_hnsw_index_sql(
+    index_name: str,
+    table_name: str,
+    params: Dict[str, int],
+    opclass: str = EMBEDDING_OPCLASS,
+) -> str:
+    """CREATE INDEX CONCURRENTLY statement for a cosine HNSW index on table_name.embedding."""
+    return create_vector_index_sql("hnsw", index_name, table_name, params, opclass)
+
+
+def create_ivfflat_index_sql(
+    index_name: str,
+    table_name: str,
+    params: Dict[str, int],
+    opclass: str = EMBEDDING_OPCLASS,
+) -> str:
+    """CREATE INDEX CONCURRENTLY statement for a cosine IVFFlat index on table_name.embedding."""
+    return create_vector_index_sql("ivfflat", index_name, table_name, params, opclass)
+
+
+def configure_index_params(index_type: str, vector_count: int) -> Dict[str, int]:
+    """Return build and search parameters for an index_type index over vector_count rows."""
+    if index_type == "hnsw":
+        return configure_hnsw_params(vector_count)
+    if index_type == "ivfflat":
+        return configure_ivfflat_params(vector_count)
+    raise ValueError(f"Unknown pgvector index type: {index_type!r} (expected 'hnsw' or 'ivfflat')")
+
+
+def create_vector_index_sql(
+    index_type: str,
+    index_name: str,
+    table_name: str,
+    params: Dict[str, int],
+    opclass: str = EMBEDDING_OPCLASS,
+    parent_only: bool = False,
+) -> str:
+    """CREATE INDEX CONCURRENTLY statement for an index_type index on table_name.embedding.
+
+    With parent_only the index is created ON ONLY a partitioned table, and not
+    concurrently (which partitioned tables don't support); see
+    create_partitioned_index_sql.
+    """
+    if index_type == "hnsw":
+        options = f"m = {params['m']}, ef_construction = {params['ef_construction']}"
+    elif index_type == "ivfflat":
+        options = f"lists = {params['lists']}"
+    else:
+        raise ValueError(
+            f"Unknown pgvector index type: {index_type!r} (expected 'hnsw' or 'ivfflat')"
+        )
+    if parent_only:
+        create = "CREATE INDEX IF NOT EXISTS"
+    else:
+        create = "CREATE INDEX CONCURRENTLY IF NOT EXISTS"
+    target = f"ONLY {table_name}" if parent_only else table_name
+    return (
+        f"{create} {index_name} ON {target} "
+        f"USING {index_type} (embedding {opclass}) WITH ({options})"
+    )
+
+
+def partition_index_name(index_name: str, table_name: str, partition: str) -> str:
+    """Name of index_name's index on a partition, e.g. <index_name>_p3 for <table_name>_p3."""
+    return f"{index_name}_{partition[len(table_name) + 1:]}"
+
+
+def create_partitioned_index_sql(
+    index_type: str,
+    index_name: str,
+    table_name: str,
+    partitions: List[str],
+    params: Dict[str, int],
+    opclass: str = EMBEDDING_OPCLASS,
+) -> List[str]:
+    """Statements building an index_type index on a partitioned table without blocking writes.
+
+    The parent index is created ON ONLY the parent (empty and invalid), each
+    partition's index is built CONCURRENTLY and attached, and the parent index
+    becomes valid once the last partition is attached. Run outside a transaction.
+    """
+    statements = [
+        create_vector_index_sql(
+            index_type, index_name, table_name, params, opclass, parent_only=True
+        )
+    ]
+    for partition in partitions:
+        partition_index = partition_index_name(index_name, table_name, partition)
+        statements.append(
+            create_vector_index_sql(index_type, partition_index, partition, params, opclass)
+        )
+        statements.append(f"ALTER INDEX {index_name} ATTACH PARTITION {partition_index}")
+    return statements
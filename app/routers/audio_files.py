@@ -3,7 +3,7 @@ Audio File Management API Endpoints
 Upload local files or download from URLs
 """
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Literal, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from temporalio.client import Client
@@ -62,7 +62,7 @@ async def upload_audio_file(
             filename=audio_file.original_filename,
             file_size=audio_file.file_size,
             duration=audio_file.duration,
-            checksum=audio_file.checksum,
+            checksum=audio_file.checksum.hex(),
             is_duplicate=is_duplicate,
             created_at=audio_file.created_at,
             message=message
@@ -160,7 +160,9 @@ async def download_audio_from_url(
 
 @router.get("", response_model=AudioFileListResponse)
 async def list_audio_files(
-    source_type: Optional[str] = Query(None, description="Filter by source type (upload/download)"),
+    source_type: Optional[Literal["upload", "download"]] = Query(
+        None, description="Filter by source type (upload/download)"
+    ),
     limit: int = Query(50, ge=1, le=100, description="Maximum number of results"),
     offset: int = Query(0, ge=0, description="Pagination offset"),
     db: AsyncSession = Depends(get_db),
@@ -188,22 +190,16 @@ async def list_audio_files(
         # Get total count
         total = await AudioFileService.count_user_files(db, user_id, source_type)
 
+        # Transcription counts for the whole page in one query
+        transcription_counts = await AudioFileService.count_transcriptions(
+            db, [audio_file.id for audio_file in audio_files]
+        )
+
         # Convert to response models
         audio_file_responses = []
         for audio_file in audio_files:
-            # Get transcription count
-            from sqlalchemy import select, func
-            from app.data.models import Transcription
-
-            result = await db.execute(
-                select(func.count(Transcription.id)).where(
-                    Transcription.audio_file_id == audio_file.id
-                )
-            )
-            transcription_count = result.scalar_one()
-
             response = AudioFileResponse.model_validate(audio_file)
-            response.transcription_count = transcription_count
+            response.transcription_count = transcription_counts[audio_file.id]
             audio_file_responses.append(response)
 
         return AudioFileListResponse(
@@ -49,11 +49,13 @@ async def list_collections(
         )
 
         # Add job counts
+        job_counts = await CollectionService.get_collection_job_counts(
+            db, [collection.id for collection in collections]
+        )
         collection_responses = []
         for collection in collections:
-            job_count = await CollectionService.get_collection_job_count(db, collection.id)
             collection_data = CollectionResponse.model_validate(collection)
-            collection_data.job_count = job_count
+            collection_data.job_count = job_counts[collection.id]
             collection_responses.append(collection_data)
 
         return CollectionListResponse(collections=collection_responses)
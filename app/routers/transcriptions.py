@@ -3,10 +3,11 @@ Transcription Management API Endpoints
 Create and manage transcriptions for audio files
 """
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Literal, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
+from sqlalchemy.orm import raiseload, selectinload
 from temporalio.client import Client
 
 from app.data.database import get_db
@@ -149,7 +150,9 @@ async def create_transcription(
 @router.get("", response_model=TranscriptionListResponse)
 async def list_transcriptions(
     audio_file_id: Optional[int] = Query(None, description="Filter by audio file ID"),
-    status_filter: Optional[str] = Query(None, description="Filter by status"),
+    status_filter: Optional[Literal["pending", "processing", "completed", "failed"]] = Query(
+        None, description="Filter by status"
+    ),
     limit: int = Query(50, ge=1, le=100, description="Maximum number of results"),
     offset: int = Query(0, ge=0, description="Pagination offset"),
     db: AsyncSession = Depends(get_db),
@@ -188,28 +191,21 @@ async def list_transcriptions(
         result = await db.execute(count_query)
         total = result.scalar_one()
 
-        # Get transcriptions
-        query = query.order_by(Transcription.created_at.desc()).limit(limit).offset(offset)
+        # Get transcriptions, with their audio files in one extra query; any
+        # other relationship access raises instead of querying per row
+        query = (
+            query.options(selectinload(Transcription.audio_file), raiseload("*"))
+            .order_by(Transcription.created_at.desc())
+            .limit(limit)
+            .offset(offset)
+        )
         result = await db.execute(query)
         transcriptions = result.scalars().all()
 
         # Convert to response models
-        transcription_responses = []
-        for transcription in transcriptions:
-            # Get audio file info
-            audio_file = await AudioFileService.get_by_id(db, transcription.audio_file_id)
-            audio_file_summary = None
-            if audio_file:
-                audio_file_summary = AudioFileSummaryResponse(
-                    id=audio_file.id,
-                    filename=audio_file.original_filename,
-                    duration=audio_file.duration,
-                    source_type=audio_file.source_type
-                )
-
-            response = TranscriptionResponse.model_validate(transcription)
-            response.audio_file = audio_file_summary
-            transcription_responses.append(response)
+        transcription_responses = [
+            TranscriptionResponse.model_validate(transcription) for transcription in transcriptions
+        ]
 
         return TranscriptionListResponse(
             total=total,
@@ -3,7 +3,7 @@ Pydantic schemas for audio file endpoints
 """
 from datetime import datetime
 from typing import Optional, List
-from pydantic import BaseModel, Field, HttpUrl
+from pydantic import BaseModel, Field, HttpUrl, field_validator
 
 
 # Request schemas
@@ -24,7 +24,7 @@ class AudioFileResponse(BaseModel):
     file_size: int = Field(..., description="File size in bytes")
     mime_type: Optional[str] = None
     duration: Optional[float] = Field(None, description="Duration in seconds")
-    checksum: str
+    checksum: str = Field(..., description="SHA256 hex digest")
     source_type: str = Field(..., description="'upload' or 'download'")
     source_url: Optional[str] = None
     source_platform: Optional[str] = None
@@ -34,6 +34,12 @@ class AudioFileResponse(BaseModel):
     # Count of related transcriptions (optional, for list views)
     transcription_count: Optional[int] = None
 
+    @field_validator("checksum", mode="before")
+    @classmethod
+    def checksum_to_hex(cls, value):
+        # Stored as the raw 32-byte digest
+        return value.hex() if isinstance(value, bytes) else value
+
     class Config:
         from_attributes = True
 
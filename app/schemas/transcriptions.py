@@ -3,7 +3,7 @@ Pydantic schemas for transcription endpoints
 """
 from datetime import datetime
 from typing import Optional, List
-from pydantic import BaseModel, Field
+from pydantic import AliasChoices, BaseModel, Field
 
 
 # Request schemas
@@ -64,10 +64,14 @@ class TranscriptionCollectionResponse(BaseModel):
 class AudioFileSummaryResponse(BaseModel):
     """Summary of audio file for transcription responses"""
     id: int
-    filename: str
+    # Also read from AudioFile.original_filename when built from the ORM object
+    filename: str = Field(validation_alias=AliasChoices("filename", "original_filename"))
     duration: Optional[float] = None
     source_type: str
 
+    class Config:
+        from_attributes = True
+
 
 class TranscriptionSummaryResponse(BaseModel):
     """Summary response for transcription (for lists)"""
@@ -14,7 +14,7 @@ from fastapi import UploadFile
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.data.models import AudioFile
+from app.data.models import AudioFile, Transcription
 from app.config import settings
 
 
@@ -22,7 +22,7 @@ class AudioFileService:
     """Service for managing audio files with deduplication and user folder organization"""
 
     @staticmethod
-    async def calculate_checksum(file_path: str) -> str:
+    async def calculate_checksum(file_path: str) -> bytes:
         """
         Calculate SHA256 checksum for deduplication.
         Reads file in chunks to handle large files efficiently.
@@ -31,7 +31,7 @@ class AudioFileService:
             file_path: Path to the file
 
         Returns:
-            SHA256 hex digest
+            SHA256 digest (32 bytes)
         """
         sha256 = hashlib.sha256()
 
@@ -42,7 +42,7 @@ class AudioFileService:
                     break
                 sha256.update(chunk)
 
-        return sha256.hexdigest()
+        return sha256.digest()
 
     @staticmethod
     def sanitize_filename(filename: str, max_length: int = 200) -> str:
@@ -77,7 +77,7 @@ class AudioFileService:
         return f"{name}{ext}" if name else f"file{ext}"
 
     @staticmethod
-    def generate_file_path(user_id: str, original_filename: str, checksum: str) -> str:
+    def generate_file_path(user_id: str, original_filename: str, checksum: bytes) -> str:
         """
         Generate user-specific file path with date-based organization.
 
@@ -98,8 +98,8 @@ class AudioFileService:
         # Sanitize filename
         safe_filename = AudioFileService.sanitize_filename(original_filename)
 
-        # Use first 16 chars of checksum as prefix
-        checksum_prefix = checksum[:16]
+        # Use first 16 hex chars of checksum as prefix
+        checksum_prefix = checksum.hex()[:16]
 
         # Construct filename: checksum_prefix_original_name.ext
         filename = f"{checksum_prefix}_{safe_filename}"
@@ -208,7 +208,7 @@ class AudioFileService:
     async def check_duplicate(
         db: AsyncSession,
         user_id: str,
-        checksum: str
+        checksum: bytes
     ) -> Optional[AudioFile]:
         """
         Check if a file with the same checksum already exists for this user.
@@ -508,3 +508,30 @@ class AudioFileService:
 
         result = await db.execute(query)
         return result.scalar_one()
+
+    @staticmethod
+    async def count_transcriptions(
+        db: AsyncSession,
+        audio_file_ids: List[int]
+    ) -> Dict[int, int]:
+        """
+        Count transcriptions for several audio files in one query.
+
+        Args:
+            db: Database session
+            audio_file_ids: Audio file IDs
+
+        Returns:
+            Mapping of audio file ID to transcription count (0 if none)
+        """
+        from sqlalchemy import func
+
+        counts = dict.fromkeys(audio_file_ids, 0)
+        if audio_file_ids:
+            result = await db.execute(
+                select(Transcription.audio_file_id, func.count(Transcription.id))
+                .where(Transcription.audio_file_id.in_(audio_file_ids))
+                .group_by(Transcription.audio_file_id)
+            )
+            counts.update(result.all())
+        return counts
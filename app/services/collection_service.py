@@ -2,7 +2,7 @@
 Collection Service - Business logic for collection management
 """
 import logging
-from typing import List, Optional
+from typing import Dict, List, Optional
 from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload, joinedload
@@ -64,6 +64,19 @@ class CollectionService:
         )
         return result.scalar_one()
 
+    @staticmethod
+    async def get_collection_job_counts(db: AsyncSession, collection_ids: List[int]) -> Dict[int, int]:
+        """Get job counts for several collections in one query"""
+        counts = dict.fromkeys(collection_ids, 0)
+        if collection_ids:
+            result = await db.execute(
+                select(TranscriptionCollection.collection_id, func.count(TranscriptionCollection.id))
+                .where(TranscriptionCollection.collection_id.in_(collection_ids))
+                .group_by(TranscriptionCollection.collection_id)
+            )
+            counts.update(result.all())
+        return counts
+
     @staticmethod
     async def get_collection_transcriptions(
         db: AsyncSession,
@@ -1,17 +1,44 @@
+import logging
+import time
 import uuid
 from datetime import datetime, timedelta
-from typing import Optional
-import logging
+from typing import List, Optional
 
 from jose import JWTError, jwt
 from pydantic import BaseModel
 
 from app.config import settings
-from app.data.redis_client import RedisClient
-from app.data import get_db_session, User
+from app.data import User, get_db_session
+from app.data.redis_client import RedisClient, hash_token
+from app.utils.ttl_cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
+# Tokens seen revoked, by SHA-256. Revocations are never undone, so repeat
+# requests with a revoked token can skip Redis
+REVOKED_TOKEN_CACHE_TTL = 60  # seconds
+_revoked_tokens = TTLCache(ttl=REVOKED_TOKEN_CACHE_TTL, maxsize=50_000)
+
+# Tokens Redis reported as not revoked, by SHA-256: the answer for almost
+# every request. A revocation in any process evicts the entry through
+# watch_token_revocations(); the TTL bounds staleness if that subscription
+# is down
+UNREVOKED_TOKEN_CACHE_TTL = 60  # seconds
+_unrevoked_tokens = TTLCache(ttl=UNREVOKED_TOKEN_CACHE_TTL, maxsize=10_000)
+
+
+def _mark_revoked(token_hash: str) -> None:
+    _unrevoked_tokens.invalidate(token_hash)
+    _revoked_tokens.set(token_hash, True)
+
+
+async def watch_token_revocations() -> None:
+    """Keep this process's revocation caches in step with revocations made anywhere.
+
+    Runs until cancelled; start it as a task.
+    """
+    await RedisClient().listen_for_revocations(_mark_revoked)
+
 
 class TokenData(BaseModel):
     user_id: str
@@ -29,6 +56,7 @@ class TokenService:
         self.secret_key = settings.service_account_jwt_secret
         self.algorithm = settings.service_account_jwt_algorithm
         self.access_token_expire_minutes = 60 * 24 * 365  # 1 year in minutes
+        self.access_token_expire = timedelta(minutes=self.access_token_expire_minutes)
 
     def _get_user_revocation_counter(self, user_id: str) -> int:
         """Get the current revocation counter for a user."""
@@ -59,93 +87,145 @@ class TokenService:
             logger.error(f"Failed to get user revocation counter: {e}")
             return 0
 
-    def create_access_token(self, data: dict, expires_delta: Optional[timedelta] = None, revocation_counter: int = 0) -> str:
+    def create_access_token(
+        self,
+        data: dict,
+        expires_delta: Optional[timedelta] = None,
+        revocation_counter: int = 0,
+    ) -> str:
         """Create a JWT access token with JTI for revocation support."""
-        to_encode = data.copy()
+        now = int(time.time())
+        if not expires_delta:
+            expires_delta = self.access_token_expire
 
-        if expires_delta:
-            expire = datetime.utcnow() + expires_delta
-        else:
-            expire = datetime.utcnow() + timedelta(minutes=self.access_token_expire_minutes)
-
-        to_encode.update({
-            "exp": expire,
-            "iat": datetime.utcnow(),
+        to_encode = {
+            **data,
+            "exp": now + int(expires_delta.total_seconds()),
+            "iat": now,
             "jti": str(uuid.uuid4()),  # Unique token identifier for revocation
             "revocation_counter": revocation_counter  # Include revocation counter
-        })
+        }
 
         encoded_jwt = jwt.encode(to_encode, self.secret_key, algorithm=self.algorithm)
         return encoded_jwt
 
-    def verify_token(self, token: str) -> Optional[TokenData]:
-        """Verify JWT token and check if it's revoked."""
+    async def verify_token_async(self, token: str) -> Optional[TokenData]:
+        """Verify JWT token and check if it's revoked, without blocking the event loop."""
         try:
             # First check if token is revoked
-            if self.redis_client.is_token_revoked(token):
+            if await self._is_token_revoked_async(token):
                 return None
 
-            # Decode and validate token
-            payload = jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
-
-            # Extract token data
-            token_data = TokenData(
-                user_id=payload.get("sub"),
-                username=payload.get("username"),
-                roles=payload.get("roles", []),
-                exp=datetime.fromtimestamp(payload.get("exp")),
-                iat=datetime.fromtimestamp(payload.get("iat")),
-                jti=payload.get("jti"),
-                revocation_counter=payload.get("revocation_counter", 0)
-            )
-
-            # Check revocation counter against current user counter
-            current_counter = self._get_user_revocation_counter(token_data.user_id)
-            if token_data.revocation_counter < current_counter:
-                logger.info("Token revoked due to counter mismatch", extra={
-                    "user_id": token_data.user_id,
-                    "token_counter": token_data.revocation_counter,
-                    "current_counter": current_counter
-                })
-                return None
-
-            return token_data
+            return self._decode_token(token)
 
         except JWTError:
             return None
         except Exception:
             return None
 
-    def revoke_token(self, token: str) -> bool:
+    async def _is_token_revoked_async(self, token: str) -> bool:
+        return (await self.are_tokens_revoked([token]))[0]
+
+    async def are_tokens_revoked(self, tokens: List[str]) -> List[bool]:
+        """Check several tokens for revocation; cache misses go to Redis in one round trip."""
+        token_hashes = [hash_token(token) for token in tokens]
+        revoked = [_revoked_tokens.get(token_hash, False) for token_hash in token_hashes]
+        unknown = [
+            i for i, token_hash in enumerate(token_hashes)
+            if not revoked[i] and not _unrevoked_tokens.get(token_hash, False)
+        ]
+        if unknown:
+            results = await self.redis_client.are_tokens_revoked([tokens[i] for i in unknown])
+            if results is None:
+                # Redis unreachable: fail open, but don't cache the answer, so
+                # revocations apply again as soon as Redis is back
+                return revoked
+            for i, is_revoked in zip(unknown, results):
+                cache = _revoked_tokens if is_revoked else _unrevoked_tokens
+                cache.set(token_hashes[i], True)
+                revoked[i] = is_revoked
+        return revoked
+
+    def _decode_token(self, token: str) -> Optional[TokenData]:
+        """Decode and validate token claims; raises JWTError if invalid."""
+        # Decode and validate token
+        payload = jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
+
+        # Extract token data
+        token_data = TokenData(
+            user_id=payload.get("sub"),
+            username=payload.get("username"),
+            roles=payload.get("roles", []),
+            exp=datetime.fromtimestamp(payload.get("exp")),
+            iat=datetime.fromtimestamp(payload.get("iat")),
+            jti=payload.get("jti"),
+            revocation_counter=payload.get("revocation_counter", 0)
+        )
+
+        # Check revocation counter against current user counter
+        current_counter = self._get_user_revocation_counter(token_data.user_id)
+        if token_data.revocation_counter < current_counter:
+            logger.info("Token revoked due to counter mismatch", extra={
+                "user_id": token_data.user_id,
+                "token_counter": token_data.revocation_counter,
+                "current_counter": current_counter
+            })
+            return None
+
+        return token_data
+
+    @staticmethod
+    def _revocation_ttl(token: str) -> Optional[int]:
+        """Seconds until a token naturally expires (1 hour if unknown); None if it is not a JWT."""
+        # Manually decode the JWT payload to get expiration time
+        import base64
+        import json
+
+        parts = token.split('.')
+        if len(parts) != 3:
+            return None
+
+        payload_b64 = parts[1]
+        # Add padding if needed
+        payload_b64 += '=' * (4 - len(payload_b64) % 4)
+        payload_bytes = base64.urlsafe_b64decode(payload_b64)
+        payload_str = payload_bytes.decode('utf-8')
+        payload = json.loads(payload_str)
+
+        exp_timestamp = payload.get("exp")
+
+        # If no expiration or already expired, still revoke but with default TTL
+        ttl_seconds = 3600  # 1 hour default
+        if exp_timestamp:
+            # Calculate TTL until token naturally expires; both sides are epoch
+            # seconds, so the host's time zone doesn't matter
+            remaining = int(exp_timestamp - time.time())
+            if remaining > 0:
+                ttl_seconds = remaining
+        return ttl_seconds
+
+    async def revoke_token(self, token: str) -> bool:
         """Revoke a JWT token by adding it to the blacklist."""
+        return await self.revoke_tokens([token])
+
+    async def revoke_tokens(self, tokens: List[str]) -> bool:
+        """Revoke several JWT tokens, writing them to the blacklist in one round trip."""
+        if not tokens:
+            return True
         try:
-            # Manually decode the JWT payload to get expiration time
-            import base64
-            import json
-            
-            parts = token.split('.')
-            if len(parts) != 3:
+            ttls = {}
+            for token in tokens:
+                ttl_seconds = self._revocation_ttl(token)
+                if ttl_seconds is None:
+                    return False
+                ttls[token] = ttl_seconds
+
+            if not await self.redis_client.set_revoked_tokens(ttls):
                 return False
-                
-            payload_b64 = parts[1]
-            # Add padding if needed
-            payload_b64 += '=' * (4 - len(payload_b64) % 4)
-            payload_bytes = base64.urlsafe_b64decode(payload_b64)
-            payload_str = payload_bytes.decode('utf-8')
-            payload = json.loads(payload_str)
-            
-            exp_timestamp = payload.get("exp")
-
-            if exp_timestamp:
-                # Calculate TTL until token naturally expires
-                expire_time = datetime.fromtimestamp(exp_timestamp)
-                ttl_seconds = int((expire_time - datetime.utcnow()).total_seconds())
-
-                if ttl_seconds > 0:
-                    return self.redis_client.set_revoked_token(token, ttl_seconds)
-
-            # If no expiration or already expired, still revoke but with default TTL
-            return self.redis_client.set_revoked_token(token, 3600)  # 1 hour default
+            # Other processes hear of them on the revocation channel
+            for token in tokens:
+                _mark_revoked(hash_token(token))
+            return True
 
         except Exception as e:
             logger.error(f"Failed to revoke token: {e}")
@@ -9,7 +9,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.data import Role, User, Job, get_db_session
-from app.auth import authentik_client
+from app.auth import get_authentik_client
 
 logger = logging.getLogger(__name__)
 
@@ -81,12 +81,12 @@ class UserService:
     @staticmethod
     async def is_admin(db: AsyncSession, user_id: str) -> bool:
         """Check if user has admin role."""
+        # The role is joined into the user SELECT, so this is one round trip
         user = await db.get(User, user_id)
         if not user:
             return False
 
-        role = await db.get(Role, user.role_id)
-        return role and role.name == "admin"
+        return user.role is not None and user.role.name == "admin"
 
     @staticmethod
     async def user_creation_flow(db: AsyncSession, user_info: dict):
@@ -259,7 +259,7 @@ async def create_user_in_authentik_and_db(db: AsyncSession, email: str, name: st
             "password": password,
             "groups": groups
         }
-        authentik_user = await authentik_client.create_user(authentik_user_data)
+        authentik_user = await get_authentik_client().create_user(authentik_user_data)
         logger.info("Authentik user created successfully", extra={
             "username": authentik_user['username'],
             "authentik_id": authentik_user['pk'],
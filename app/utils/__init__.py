@@ -1,3 +1,3 @@
 """
-Shared utility functions for SRT generation and timestamp formatting.
+Shared utility functions for SRT generation, timestamp formatting and caching.
 """
\ No newline at end of file
@@ -154,12 +154,12 @@ async def download_audio_activity(input_data: Dict[str, Any]) -> Dict[str, Any]:
                 "job_id": job_id,
                 "audio_file_id": audio_file.id,
                 "is_duplicate": is_duplicate,
-                "checksum": audio_file.checksum
+                "checksum": audio_file.checksum.hex()
             })
 
             return {
                 "audio_file_id": audio_file.id,
-                "checksum": audio_file.checksum,
+                "checksum": audio_file.checksum.hex(),
                 "file_path": audio_file.file_path,
                 "is_duplicate": is_duplicate,
                 "platform": download_result["platform"],
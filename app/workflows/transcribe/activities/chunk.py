@@ -8,6 +8,7 @@ from typing import Dict, Any, List
 
 from temporalio import activity
 from sqlalchemy import select
+from sqlalchemy.orm import undefer
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 
 from app.config import settings
@@ -51,7 +52,9 @@ async def chunk_with_ollama_activity(input_data: Dict[str, Any]) -> Dict[str, An
     try:
         async with async_session_maker() as session:
             # Load transcription
-            transcription = await session.get(Transcription, transcription_id)
+            transcription = await session.get(
+                Transcription, transcription_id, options=[undefer(Transcription.segments)]
+            )
             if not transcription:
                 raise ValueError(f"Transcription {transcription_id} not found")
 
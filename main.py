@@ -1,15 +1,22 @@
 from fastapi import Depends, FastAPI, File, HTTPException, UploadFile, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
+import asyncio
 import logging
 
 from app.data import get_db, Role, User, async_session, Job
-from app.auth import verify_token
+from app.auth import get_authentik_client, verify_token
+from app.auth.jwt import close_http_client
+from app.data.redis_client import close_redis_pool
+from app.data.vector_index import job_chunk_search_sql
 from app.config import settings
+from app.data.migrations import migration_state, run_migrations
 from app.logging_config import setup_logging
 from app.services import JobService, UserService, create_user_in_authentik_and_db, update_user, delete_user
+from app.services.token_service import watch_token_revocations
 from app.services.websocket_manager import active_connections, send_job_update
 from app.services.embedding_service import generate_embedding
 from app.utils.srt import generate_srt
@@ -40,14 +47,69 @@ class SearchRequest(BaseModel):
 
 app = FastAPI(title="MxWhisper API")
 
-# Initialize roles on startup
+async def initialize_roles():
+    async with async_session() as db:
+        await UserService.initialize_roles(db)
+
+
+async def migrate_and_initialize():
+    """Background startup for MIGRATION_MODE=async."""
+    try:
+        await run_migrations()
+        await initialize_roles()
+    except Exception as e:
+        migration_state["status"] = "failed"
+        migration_state["error"] = str(e)
+        logger.exception("Background startup failed; /ready will keep returning 503")
+        return
+    migration_state["status"] = "complete"
+
+
+# Run migrations (per MIGRATION_MODE) and initialize roles on startup
 @app.on_event("startup")
 async def startup_event():
     logger.info("Starting MxWhisper API server")
-    async with async_session() as db:
-        await UserService.initialize_roles(db)
+    # Create the Authentik client up front so misconfiguration fails at startup
+    get_authentik_client()
+    # Evict cached "not revoked" answers when any process revokes a token
+    app.state.revocation_watcher = asyncio.create_task(watch_token_revocations())
+    if settings.migration_mode == "async":
+        # Serve /healthz immediately; /ready reports 503 until migrations finish
+        app.state.migration_task = asyncio.create_task(migrate_and_initialize())
+    else:
+        if settings.migration_mode == "sync":
+            await run_migrations()
+        await initialize_roles()
+        migration_state["status"] = "complete" if settings.migration_mode == "sync" else "skipped"
     logger.info("MxWhisper API server startup complete")
 
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    app.state.revocation_watcher.cancel()
+    await get_authentik_client().aclose()
+    get_authentik_client.cache_clear()
+    await close_http_client()
+    await close_redis_pool()
+    logger.info("MxWhisper API server shutdown complete")
+
+
+@app.get("/healthz")
+async def healthz():
+    """Liveness probe: the process is up, whatever the migration state."""
+    return {"status": "ok", "migrations": migration_state["status"]}
+
+
+@app.get("/ready")
+async def ready():
+    """Readiness probe: 503 until startup migrations have completed."""
+    if migration_state["status"] in ("complete", "skipped"):
+        return {"status": "ready", "migrations": migration_state["status"]}
+    return JSONResponse(
+        status_code=503,
+        content={"status": "not ready", "migrations": migration_state["status"], "error": migration_state["error"]},
+    )
+
 # CORS
 app.add_middleware(
     CORSMiddleware,
@@ -216,31 +278,15 @@ async def semantic_search(
     query_embedding = generate_embedding(search_request.query)
 
     # Perform vector similarity search on chunks
-    # Using cosine distance (1 - cosine similarity)
-    from sqlalchemy import select, text
-
-    query = text("""
-        SELECT
-            job_chunks.id as chunk_id,
-            job_chunks.job_id,
-            job_chunks.chunk_index,
-            job_chunks.text as matched_text,
-            job_chunks.topic_summary,
-            job_chunks.keywords,
-            job_chunks.start_time,
-            job_chunks.end_time,
-            jobs.filename,
-            jobs.created_at,
-            (1 - (job_chunks.embedding <=> :query_embedding)) as similarity
-        FROM job_chunks
-        JOIN jobs ON job_chunks.job_id = jobs.id
-        WHERE
-            jobs.status = 'completed'
-            AND job_chunks.embedding IS NOT NULL
-            AND jobs.user_id = :user_id
-        ORDER BY job_chunks.embedding <=> :query_embedding
-        LIMIT :limit
-    """)
+    # Using cosine distance (1 - cosine similarity); ordered by the distance
+    # itself so the HNSW index can serve the ORDER BY ... LIMIT. The user and
+    # status filters apply to the rows the index returns, so the connection's
+    # hnsw.iterative_scan keeps the scan going until LIMIT rows pass them
+    # (otherwise only hnsw.ef_search candidates are examined, which for most
+    # users holds few or none of their chunks)
+    from sqlalchemy import text
+
+    query = text(job_chunk_search_sql())
 
     result = await db.execute(
         query,
@@ -47,6 +47,7 @@ from dotenv import load_dotenv
 from sqlalchemy import select
 from sqlalchemy.orm import selectinload
 from app.data import Job, JobChunk, User, get_db_session
+from app.data.models import PROCESSING_STATUSES
 from app.utils.srt import generate_srt
 
 # Load environment variables
@@ -213,7 +214,7 @@ def parse_arguments():
     # List command
     list_parser = subparsers.add_parser('list', help='List all jobs with their status')
     list_parser.add_argument('--user', help='Filter by username')
-    list_parser.add_argument('--status', help='Filter by job status (pending, processing, completed, failed)')
+    list_parser.add_argument('--status', choices=PROCESSING_STATUSES, help='Filter by job status')
 
     # Show command
     show_parser = subparsers.add_parser('show', help='Show detailed information about a job')
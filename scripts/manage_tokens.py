@@ -54,7 +54,7 @@ from dotenv import load_dotenv
 from sqlalchemy import select
 from datetime import datetime, timedelta
 from app.data import User, get_db_session
-from app.auth import authentik_client, create_service_account_token
+from app.auth import create_service_account_token
 from app.services.user_service import UserService
 from app.services.token_service import TokenService
 from app.config import settings
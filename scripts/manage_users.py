@@ -56,7 +56,7 @@ sys.path.insert(0, str(project_root))
 from dotenv import load_dotenv
 from sqlalchemy import select, func
 from app.data import User, Job, Role, get_db_session
-from app.auth import authentik_client, create_service_account_token
+from app.auth import get_authentik_client, create_service_account_token
 from app.services.user_service import UserService
 from app.config import settings
 
@@ -155,7 +155,7 @@ async def create_user(username: str, email: str, name: str = None, role: str = "
             "password": f"service-account-{username}",  # Auto-generated password
             "groups": groups
         }
-        authentik_user = await authentik_client.create_user(authentik_user_data)
+        authentik_user = await get_authentik_client().create_user(authentik_user_data)
         authentik_user_pk = authentik_user["pk"]
         print("✅ Authentik user created successfully!")
 
@@ -317,10 +317,10 @@ async def delete_user(username: str, force: bool = False):
         print("🗑️  Deleting user from Authentik...")
         try:
             # Get Authentik user
-            authentik_user = await authentik_client.get_user_by_username(username)
+            authentik_user = await get_authentik_client().get_user_by_username(username)
             if authentik_user:
                 # Delete the user from Authentik
-                deletion_success = await authentik_client.delete_user(authentik_user['pk'])
+                deletion_success = await get_authentik_client().delete_user(authentik_user['pk'])
                 if deletion_success:
                     print("✅ User deleted from Authentik")
                 else:
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+Manage Vector Indexes
+
+This script sizes the vector indexes on chunk embeddings for the current corpus.
+The index type (HNSW or IVFFlat) comes from PGVECTOR_INDEX_TYPE.
+
+Commands:
+    show                  Show row counts, current index definitions and recommended parameters
+    rebuild               Rebuild indexes whose type or parameters don't match the recommendation
+
+Usage:
+    uv run python scripts/manage_vector_indexes.py show
+    uv run python scripts/manage_vector_indexes.py rebuild [--table TABLE] [--force]
+
+Examples:
+    # Check whether the indexes still fit the corpus size
+    uv run python scripts/manage_vector_indexes.py show
+
+    # Rebuild only the transcription chunk index, even if it already matches
+    uv run python scripts/manage_vector_indexes.py rebuild --table transcription_chunks --force
+
+    # Switch to IVFFlat indexes for a bulk-loaded corpus
+    PGVECTOR_INDEX_TYPE=ivfflat uv run python scripts/manage_vector_indexes.py rebuild
+
+Rebuilds run CONCURRENTLY: a new index is built next to the old one, then swapped
+in, so searches and inserts keep working throughout. On a partitioned table
+(transcription_chunks) each partition has its own index, sized by the rows of the
+largest partition, and the swap briefly locks the table. Set PGVECTOR_HNSW_EF_SEARCH
+(HNSW) or PGVECTOR_IVFFLAT_PROBES (IVFFlat) to the value shown and restart the API
+after the corpus changes tier. IVFFlat lists are computed from the rows present at
+build time, so rebuild after a bulk load.
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+from pathlib import Path
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from dotenv import load_dotenv
+from sqlalchemy import text
+
+from app.config import settings
+from app.data import engine
+from app.data.vector_index import (
+    EMBEDDING_TYPE_SQL,
+    ESTIMATED_ROWS_SQL,
+    PARTITIONS_SQL,
+    VECTOR_INDEXES,
+    configure_index_params,
+    create_partitioned_index_sql,
+    create_vector_index_sql,
+    partition_index_name,
+)
+
+# Load environment variables
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Session settings for the index builds
+MAINTENANCE_WORK_MEM = '2GB'
+PARALLEL_WORKERS = 7
+
+# Per index type: build parameters with the pgvector defaults used when an index
+# was created without them, and the search parameter with its setting
+BUILD_DEFAULTS = {
+    "hnsw": {"m": 16, "ef_construction": 64},
+    "ivfflat": {"lists": 100},
+}
+SEARCH_SETTINGS = {
+    "hnsw": ("ef_search", "PGVECTOR_HNSW_EF_SEARCH"),
+    "ivfflat": ("probes", "PGVECTOR_IVFFLAT_PROBES"),
+}
+
+
+async def get_index_options(conn, index_name: str):
+    """Return the index's storage options as a dict, or None if it doesn't exist."""
+    result = await conn.execute(
+        text("SELECT reloptions FROM pg_class WHERE oid = to_regclass(:index)"),
+        {"index": index_name}
+    )
+    row = result.first()
+    if row is None:
+        return None
+    return dict(option.split("=", 1) for option in row.reloptions or [])
+
+
+async def table_scalar(conn, sql: str, table_name: str):
+    """Run a catalog query taking a :table parameter and return its first column, or None."""
+    return (await conn.execute(text(sql), {"table": table_name})).scalar()
+
+
+def format_build_params(index_type: str, params) -> str:
+    """Format an index's build parameters, e.g. '24/100' for HNSW."""
+    return "/".join(
+        str(params.get(key, default)) for key, default in BUILD_DEFAULTS[index_type].items()
+    )
+
+
+async def show_indexes():
+    """Show current and recommended index parameters for each chunk table."""
+    index_type = settings.pgvector_index_type
+    search_param, _ = SEARCH_SETTINGS[index_type]
+    try:
+        async with engine.connect() as conn:
+            print("=" * 100)
+            print(
+                f"{'Table':<24} {'Rows/index':<14} {'Index':<46} {'Current':<10} "
+                f"{'Recommended'}"
+            )
+            print("=" * 100)
+
+            for index_name, table_name in VECTOR_INDEXES[index_type]:
+                row_count = await table_scalar(conn, ESTIMATED_ROWS_SQL, table_name)
+                params = configure_index_params(index_type, row_count)
+                options = await get_index_options(conn, index_name)
+
+                if options is None:
+                    current = "missing"
+                else:
+                    current = format_build_params(index_type, options)
+                recommended = (
+                    f"{format_build_params(index_type, params)} "
+                    f"({search_param} {params[search_param]})"
+                )
+
+                print(
+                    f"{table_name:<24} {row_count:<14} {index_name:<46} {current:<10} "
+                    f"{recommended}"
+                )
+
+            print("=" * 100)
+            print(
+                f"Parameters are {'/'.join(BUILD_DEFAULTS[index_type])} "
+                f"(PGVECTOR_INDEX_TYPE={index_type})"
+            )
+
+    except Exception as e:
+        print(f"❌ Failed to show vector indexes: {e}")
+        import traceback
+        traceback.print_exc()
+    finally:
+        await engine.dispose()
+
+
+async def rebuild_indexes(table_filter: str = None, force: bool = False):
+    """Rebuild indexes with the type and parameters recommended for their row counts."""
+    index_type = settings.pgvector_index_type
+    search_param, search_setting = SEARCH_SETTINGS[index_type]
+    try:
+        async with engine.connect() as conn:
+            # CREATE/DROP INDEX CONCURRENTLY cannot run inside a transaction
+            conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+            await conn.execute(text(f"SET maintenance_work_mem = '{MAINTENANCE_WORK_MEM}'"))
+            await conn.execute(text(f"SET max_parallel_maintenance_workers = {PARALLEL_WORKERS}"))
+            await conn.execute(text("SET statement_timeout = 0"))
+
+            for index_name, table_name in VECTOR_INDEXES[index_type]:
+                if table_filter and table_name != table_filter:
+                    continue
+
+                row_count = await table_scalar(conn, ESTIMATED_ROWS_SQL, table_name)
+                params = configure_index_params(index_type, row_count)
+                options = await get_index_options(conn, index_name)
+                build_params = ", ".join(
+                    f"{key}={params[key]}" for key in BUILD_DEFAULTS[index_type]
+                )
+
+                if (
+                    not force
+                    and options is not None
+                    and format_build_params(index_type, options)
+                    == format_build_params(index_type, params)
+                ):
+                    print(f"✓ {index_name} already matches {build_params}")
+                else:
+                    print(
+                        f"🔨 Building {index_name} on {table_name} ({row_count} rows): "
+                        f"{build_params}"
+                    )
+                    column_type = await table_scalar(conn, EMBEDDING_TYPE_SQL, table_name)
+                    opclass = f"{column_type}_cosine_ops"
+                    partitions = (
+                        await conn.execute(text(PARTITIONS_SQL), {"table": table_name})
+                    ).scalars().all()
+                    new_index = f"{index_name}_new"
+                    if partitions:
+                        # Indexes on a partitioned table can't be dropped concurrently;
+                        # dropping one only takes a brief lock on the table
+                        await conn.execute(text(f"DROP INDEX IF EXISTS {new_index}"))
+                        for statement in create_partitioned_index_sql(
+                            index_type, new_index, table_name, partitions, params, opclass
+                        ):
+                            await conn.execute(text(statement))
+                        await conn.execute(text(f"DROP INDEX IF EXISTS {index_name}"))
+                        await conn.execute(text(f"ALTER INDEX {new_index} RENAME TO {index_name}"))
+                        for partition in partitions:
+                            old_name = partition_index_name(new_index, table_name, partition)
+                            new_name = partition_index_name(index_name, table_name, partition)
+                            await conn.execute(
+                                text(f"ALTER INDEX {old_name} RENAME TO {new_name}")
+                            )
+                    else:
+                        await conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {new_index}"))
+                        await conn.execute(text(create_vector_index_sql(
+                            index_type, new_index, table_name, params, opclass
+                        )))
+                        await conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {index_name}"))
+                        await conn.execute(text(f"ALTER INDEX {new_index} RENAME TO {index_name}"))
+                    print(f"✅ Rebuilt {index_name}; set {search_setting}={params[search_param]}")
+
+                # Drop the table's index of the other type once this one exists
+                partitioned = await table_scalar(conn, PARTITIONS_SQL, table_name) is not None
+                for other_type, indexes in VECTOR_INDEXES.items():
+                    for other_index, other_table in indexes:
+                        if other_type != index_type and other_table == table_name:
+                            if await get_index_options(conn, other_index) is not None:
+                                concurrently = "" if partitioned else "CONCURRENTLY "
+                                await conn.execute(text(f"DROP INDEX {concurrently}{other_index}"))
+                                print(f"🗑️  Dropped {other_index}")
+
+    except Exception as e:
+        print(f"❌ Failed to rebuild vector indexes: {e}")
+        import traceback
+        traceback.print_exc()
+    finally:
+        await engine.dispose()
+
+
+def parse_arguments():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Manage vector indexes",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__
+    )
+
+    subparsers = parser.add_subparsers(dest='command', help='Command to execute')
+    subparsers.required = True
+
+    # Show command
+    subparsers.add_parser('show', help='Show current and recommended index parameters')
+
+    # Rebuild command
+    rebuild_parser = subparsers.add_parser(
+        'rebuild', help='Rebuild vector indexes for the current corpus size'
+    )
+    rebuild_parser.add_argument('--table', choices=[table for _, table in VECTOR_INDEXES['hnsw']],
+                                help='Only rebuild the index on this table')
+    rebuild_parser.add_argument('--force', action='store_true',
+                                help='Rebuild even if the parameters already match')
+
+    return parser.parse_args()
+
+
+async def main():
+    """Main script execution."""
+    args = parse_arguments()
+
+    if settings.pgvector_index_type not in VECTOR_INDEXES:
+        print(f"❌ PGVECTOR_INDEX_TYPE must be one of {', '.join(VECTOR_INDEXES)}, "
+              f"not {settings.pgvector_index_type!r}")
+        sys.exit(1)
+
+    if args.command == 'show':
+        await show_indexes()
+    elif args.command == 'rebuild':
+        await rebuild_indexes(args.table, args.force)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -17,7 +17,7 @@ sys.path.insert(0, '/home/geo/develop/mxwhisper')
 
 # Import only what we need, avoiding the workflow imports
 from app.data import async_session
-from app.auth import authentik_client
+from app.auth import get_authentik_client
 from sqlalchemy import select
 import pytest
 
@@ -38,7 +38,7 @@ async def create_user_in_authentik_and_db(db, email: str, name: str, preferred_u
             "password": password,
             "groups": ["users"] if role == "user" else ["users", "admin.mxwhisper"]
         }
-        authentik_user = await authentik_client.create_user(authentik_user_data)
+        authentik_user = await get_authentik_client().create_user(authentik_user_data)
         print(f"✅ Authentik user created: {authentik_user['username']} (ID: {authentik_user['pk']})")
 
         # 2. Create user in our database
@@ -69,7 +69,7 @@ async def test_audio_file_creation(async_session: AsyncSession, test_user: User)
         file_size=1024 * 1024,  # 1MB
         mime_type="audio/mpeg",
         duration=60.5,
-        checksum="abc123def456",
+        checksum=b"abc123def456",
         source_type="upload",
     )
 
@@ -80,7 +80,7 @@ async def test_audio_file_creation(async_session: AsyncSession, test_user: User)
     assert audio_file.id is not None
     assert audio_file.user_id == test_user.id
     assert audio_file.source_type == "upload"
-    assert audio_file.checksum == "abc123def456"
+    assert audio_file.checksum == b"abc123def456"
     assert audio_file.created_at is not None
 
     # Cleanup
@@ -98,7 +98,7 @@ async def test_audio_file_with_download_source(async_session: AsyncSession, test
         file_size=5 * 1024 * 1024,  # 5MB
         mime_type="audio/mpeg",
         duration=180.0,
-        checksum="xyz789",
+        checksum=b"xyz789",
         source_type="download",
         source_url="https://www.youtube.com/watch?v=test123",
         source_platform="youtube"
@@ -126,7 +126,7 @@ async def test_checksum_uniqueness(async_session: AsyncSession, test_user: User)
         file_path="uploads/user_test/2025/10/dup123_file1.mp3",
         original_filename="file1.mp3",
         file_size=1024,
-        checksum="duplicate_checksum",
+        checksum=b"duplicate_checksum",
         source_type="upload",
     )
     async_session.add(audio_file1)
@@ -138,7 +138,7 @@ async def test_checksum_uniqueness(async_session: AsyncSession, test_user: User)
         file_path="uploads/user_test/2025/10/dup123_file2.mp3",
         original_filename="file2.mp3",
         file_size=1024,
-        checksum="duplicate_checksum",
+        checksum=b"duplicate_checksum",
         source_type="upload",
     )
     async_session.add(audio_file2)
@@ -163,7 +163,7 @@ async def test_transcription_creation(async_session: AsyncSession, test_user: Us
         file_path="uploads/user_test/2025/10/trans123_test.mp3",
         original_filename="test.mp3",
         file_size=1024,
-        checksum="trans123",
+        checksum=b"trans123",
         source_type="upload",
     )
     async_session.add(audio_file)
@@ -205,7 +205,7 @@ async def test_transcription_chunks(async_session: AsyncSession, test_user: User
         file_path="uploads/user_test/2025/10/chunk123_test.mp3",
         original_filename="test.mp3",
         file_size=1024,
-        checksum="chunk123",
+        checksum=b"chunk123",
         source_type="upload",
     )
     async_session.add(audio_file)
@@ -271,7 +271,7 @@ async def test_cascade_delete_audio_file(async_session: AsyncSession, test_user:
         file_path="uploads/user_test/2025/10/cascade123_test.mp3",
         original_filename="test.mp3",
         file_size=1024,
-        checksum="cascade123",
+        checksum=b"cascade123",
         source_type="upload",
     )
     async_session.add(audio_file)
@@ -317,7 +317,7 @@ async def test_transcription_topics_assignment(async_session: AsyncSession, test
         file_path="uploads/user_test/2025/10/topic123_test.mp3",
         original_filename="test.mp3",
         file_size=1024,
-        checksum="topic123",
+        checksum=b"topic123",
         source_type="upload",
     )
     async_session.add(audio_file)
@@ -381,7 +381,7 @@ async def test_transcription_collections_assignment(async_session: AsyncSession,
         file_path="uploads/user_test/2025/10/coll123_test.mp3",
         original_filename="test.mp3",
         file_size=1024,
-        checksum="coll123",
+        checksum=b"coll123",
         source_type="upload",
     )
     async_session.add(audio_file)
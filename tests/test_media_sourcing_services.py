@@ -1,6 +1,7 @@
 """
 Unit tests for media sourcing services
 """
+import hashlib
 import pytest
 import os
 import tempfile
@@ -87,7 +88,7 @@ async def test_generate_file_path():
     path = AudioFileService.generate_file_path(
         user_id="user123",
         original_filename="test file.mp3",
-        checksum="abc123def456789"
+        checksum=bytes.fromhex("abc123def4567890")
     )
 
     # Should contain user folder
@@ -99,7 +100,7 @@ async def test_generate_file_path():
     assert now.strftime("%m") in path
 
     # Should contain checksum prefix
-    assert "abc123def456789"[:16] in path
+    assert "abc123def4567890" in path
 
     # Should be sanitized
     assert "test_file.mp3" in path
@@ -116,9 +117,8 @@ async def test_calculate_checksum():
     try:
         checksum = await AudioFileService.calculate_checksum(temp_path)
 
-        # Should return SHA256 hex (64 characters)
-        assert len(checksum) == 64
-        assert all(c in '0123456789abcdef' for c in checksum)
+        # Should return the raw SHA256 digest (32 bytes)
+        assert checksum == hashlib.sha256(b"Test content for checksum").digest()
 
         # Same content should produce same checksum
         checksum2 = await AudioFileService.calculate_checksum(temp_path)
@@ -137,7 +137,7 @@ async def test_check_duplicate(async_session: AsyncSession, test_user: User):
         file_path="uploads/test/file.mp3",
         original_filename="file.mp3",
         file_size=1024,
-        checksum="test_checksum_123",
+        checksum=b"test_checksum_123",
         source_type="upload"
     )
     async_session.add(audio_file)
@@ -147,7 +147,7 @@ async def test_check_duplicate(async_session: AsyncSession, test_user: User):
     duplicate = await AudioFileService.check_duplicate(
         async_session,
         test_user.id,
-        "test_checksum_123"
+        b"test_checksum_123"
     )
     assert duplicate is not None
     assert duplicate.id == audio_file.id
@@ -156,7 +156,7 @@ async def test_check_duplicate(async_session: AsyncSession, test_user: User):
     no_duplicate = await AudioFileService.check_duplicate(
         async_session,
         test_user.id,
-        "different_checksum"
+        b"different_checksum"
     )
     assert no_duplicate is None
 
@@ -174,7 +174,7 @@ async def test_transcription_service_create(async_session: AsyncSession, test_us
         file_path="uploads/test/file.mp3",
         original_filename="file.mp3",
         file_size=1024,
-        checksum="trans_test_123",
+        checksum=b"trans_test_123",
         source_type="upload"
     )
     async_session.add(audio_file)
@@ -211,7 +211,7 @@ async def test_transcription_service_update_result(async_session: AsyncSession,
         file_path="uploads/test/file.mp3",
         original_filename="file.mp3",
         file_size=1024,
-        checksum="trans_update_123",
+        checksum=b"trans_update_123",
         source_type="upload"
     )
     async_session.add(audio_file)
@@ -254,7 +254,7 @@ async def test_transcription_service_create_chunks(async_session: AsyncSession,
         file_path="uploads/test/file.mp3",
         original_filename="file.mp3",
         file_size=1024,
-        checksum="chunks_test_123",
+        checksum=b"chunks_test_123",
         source_type="upload"
     )
     async_session.add(audio_file)
@@ -345,7 +345,7 @@ async def test_audio_file_service_get_user_files(async_session: AsyncSession, te
         file_path="uploads/test/file1.mp3",
         original_filename="file1.mp3",
         file_size=1024,
-        checksum="list_test_1",
+        checksum=b"list_test_1",
         source_type="upload"
     )
     file2 = AudioFile(
@@ -353,7 +353,7 @@ async def test_audio_file_service_get_user_files(async_session: AsyncSession, te
         file_path="uploads/test/file2.mp3",
         original_filename="file2.mp3",
         file_size=2048,
-        checksum="list_test_2",
+        checksum=b"list_test_2",
         source_type="download",
         source_url="https://example.com/audio"
     )
@@ -396,7 +396,7 @@ async def test_transcription_service_count_user_transcriptions(async_session: As
         file_path="uploads/test/file.mp3",
         original_filename="file.mp3",
         file_size=1024,
-        checksum="count_test_123",
+        checksum=b"count_test_123",
         source_type="upload"
     )
     async_session.add(audio_file)
@@ -0,0 +1,105 @@
+"""
+Tests for batched token revocation in TokenService
+"""
+import time
+from datetime import timedelta
+
+from app.services import token_service
+from app.services.token_service import TokenService
+from app.utils.ttl_cache import TTLCache
+
+
+class FakeRedisClient:
+    """Records the batches TokenService sends instead of talking to Redis."""
+
+    def __init__(self, revoked=()):
+        self.revoked = set(revoked)
+        self.checked = []
+        self.written = []
+
+    async def are_tokens_revoked(self, tokens):
+        self.checked.append(list(tokens))
+        return [token in self.revoked for token in tokens]
+
+    async def set_revoked_tokens(self, tokens):
+        self.written.append(dict(tokens))
+        self.revoked.update(tokens)
+        return True
+
+
+def make_service(monkeypatch, redis_client):
+    monkeypatch.setattr(token_service, "_revoked_tokens", TTLCache(ttl=60))
+    monkeypatch.setattr(token_service, "_unrevoked_tokens", TTLCache(ttl=60))
+    service = TokenService()
+    service.redis_client = redis_client
+    return service
+
+
+async def test_only_cache_misses_are_checked_in_one_batch(monkeypatch):
+    redis_client = FakeRedisClient(revoked={"b"})
+    service = make_service(monkeypatch, redis_client)
+
+    assert await service.are_tokens_revoked(["a", "b", "c"]) == [False, True, False]
+    assert redis_client.checked == [["a", "b", "c"]]
+
+    # Both answers are cached: nothing left to ask Redis
+    assert await service.are_tokens_revoked(["c", "b"]) == [False, True]
+    assert redis_client.checked == [["a", "b", "c"]]
+
+
+async def test_revoke_tokens_writes_one_batch(monkeypatch):
+    redis_client = FakeRedisClient()
+    service = make_service(monkeypatch, redis_client)
+    tokens = [
+        service.create_access_token({"sub": f"user-{i}"}, expires_delta=timedelta(hours=2))
+        for i in range(3)
+    ]
+    assert await service.are_tokens_revoked(tokens) == [False] * 3
+
+    assert await service.revoke_tokens(tokens)
+    assert len(redis_client.written) == 1
+    assert set(redis_client.written[0]) == set(tokens)
+    assert all(0 < ttl <= 2 * 3600 for ttl in redis_client.written[0].values())
+
+    # The "not revoked" cache entries are replaced without another Redis check
+    assert await service.are_tokens_revoked(tokens) == [True] * 3
+    assert len(redis_client.checked) == 1
+
+
+async def test_revoke_tokens_rejects_malformed_token(monkeypatch):
+    redis_client = FakeRedisClient()
+    service = make_service(monkeypatch, redis_client)
+
+    assert not await service.revoke_tokens(["not-a-jwt"])
+    assert redis_client.written == []
+
+
+async def test_failed_redis_check_is_not_cached(monkeypatch):
+    redis_client = FakeRedisClient(revoked={"a"})
+    service = make_service(monkeypatch, redis_client)
+    available = redis_client.are_tokens_revoked
+
+    async def unavailable(tokens):
+        return None
+
+    redis_client.are_tokens_revoked = unavailable
+    # Fails open while Redis is down...
+    assert await service.are_tokens_revoked(["a"]) == [False]
+
+    # ...and asks again once it is back
+    redis_client.are_tokens_revoked = available
+    assert await service.are_tokens_revoked(["a"]) == [True]
+
+
+def test_revocation_ttl_runs_until_the_token_expires(monkeypatch):
+    # Local time west of UTC must not shorten the TTL
+    monkeypatch.setenv("TZ", "America/Los_Angeles")
+    time.tzset()
+    try:
+        service = TokenService()
+        token = service.create_access_token({"sub": "user-1"}, expires_delta=timedelta(hours=2))
+
+        assert 2 * 3600 - 5 <= service._revocation_ttl(token) <= 2 * 3600
+    finally:
+        monkeypatch.delenv("TZ")
+        time.tzset()
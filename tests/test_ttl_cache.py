@@ -0,0 +1,54 @@
+"""
+Tests for the in-process TTL cache
+"""
+import time
+
+from app.utils.ttl_cache import MISSING, TTLCache
+
+
+def test_get_returns_cached_value():
+    cache = TTLCache(ttl=60)
+    cache.set("users", "uuid-1")
+
+    assert cache.get("users") == "uuid-1"
+    assert cache.get("admins") is MISSING
+
+
+def test_none_can_be_cached():
+    cache = TTLCache(ttl=60)
+    cache.set("missing-group", None)
+
+    assert cache.get("missing-group") is None
+
+
+def test_entries_expire():
+    cache = TTLCache(ttl=60)
+    cache.set("short", "value", ttl=0.01)
+    time.sleep(0.02)
+
+    assert cache.get("short") is MISSING
+    assert len(cache) == 0
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = TTLCache(ttl=60, maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is MISSING
+    assert cache.get("c") == 3
+
+
+def test_invalidate_and_clear():
+    cache = TTLCache(ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+
+    cache.invalidate("a")
+    assert cache.get("a") is MISSING
+
+    cache.clear()
+    assert len(cache) == 0
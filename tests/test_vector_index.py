@@ -0,0 +1,168 @@
+"""
+Tests for pgvector index sizing
+"""
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.data.models import Job, Role, User
+from app.data.vector_index import (
+    configure_hnsw_params,
+    configure_index_params,
+    configure_ivfflat_params,
+    create_hnsw_index_sql,
+    create_partitioned_index_sql,
+    create_vector_index_sql,
+    job_chunk_search_sql,
+)
+
+
+def test_hnsw_params_scale_with_corpus_size():
+    assert configure_hnsw_params(0) == {"m": 16, "ef_construction": 64, "ef_search": 40}
+    assert configure_hnsw_params(99_999)["m"] == 16
+    assert configure_hnsw_params(100_000) == {"m": 24, "ef_construction": 100, "ef_search": 100}
+    assert configure_hnsw_params(5_000_000) == {"m": 32, "ef_construction": 128, "ef_search": 200}
+
+
+def test_hnsw_params_are_copies():
+    configure_hnsw_params(0)["m"] = 99
+
+    assert configure_hnsw_params(0)["m"] == 16
+
+
+def test_create_hnsw_index_sql():
+    sql = create_hnsw_index_sql("idx_chunks_hnsw", "job_chunks", {"m": 24, "ef_construction": 100})
+
+    assert sql == (
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_chunks_hnsw "
+        "ON job_chunks USING hnsw (embedding halfvec_cosine_ops) "
+        "WITH (m = 24, ef_construction = 100)"
+    )
+
+
+def test_create_hnsw_index_sql_for_full_precision_vectors():
+    sql = create_hnsw_index_sql(
+        "idx", "job_chunks", {"m": 16, "ef_construction": 64}, opclass="vector_cosine_ops"
+    )
+
+    assert "USING hnsw (embedding vector_cosine_ops)" in sql
+
+
+def test_ivfflat_params_scale_with_corpus_size():
+    assert configure_ivfflat_params(0) == {"lists": 1, "probes": 1}
+    assert configure_ivfflat_params(400_000) == {"lists": 400, "probes": 20}
+    assert configure_ivfflat_params(4_000_000) == {"lists": 2000, "probes": 45}
+
+
+def test_create_vector_index_sql_for_ivfflat():
+    params = configure_index_params("ivfflat", 100_000)
+    sql = create_vector_index_sql("ivfflat", "idx_chunks_ivfflat", "job_chunks", params)
+
+    assert sql == (
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_chunks_ivfflat "
+        "ON job_chunks USING ivfflat (embedding halfvec_cosine_ops) "
+        "WITH (lists = 100)"
+    )
+
+
+def test_create_partitioned_index_sql_builds_each_partition_concurrently():
+    statements = create_partitioned_index_sql(
+        "hnsw", "idx_tc_hnsw", "transcription_chunks",
+        ["transcription_chunks_p0", "transcription_chunks_p1"],
+        {"m": 16, "ef_construction": 64},
+    )
+
+    assert statements == [
+        "CREATE INDEX IF NOT EXISTS idx_tc_hnsw ON ONLY transcription_chunks "
+        "USING hnsw (embedding halfvec_cosine_ops) WITH (m = 16, ef_construction = 64)",
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_tc_hnsw_p0 ON transcription_chunks_p0 "
+        "USING hnsw (embedding halfvec_cosine_ops) WITH (m = 16, ef_construction = 64)",
+        "ALTER INDEX idx_tc_hnsw ATTACH PARTITION idx_tc_hnsw_p0",
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_tc_hnsw_p1 ON transcription_chunks_p1 "
+        "USING hnsw (embedding halfvec_cosine_ops) WITH (m = 16, ef_construction = 64)",
+        "ALTER INDEX idx_tc_hnsw ATTACH PARTITION idx_tc_hnsw_p1",
+    ]
+
+
+def test_unknown_index_type_is_rejected():
+    with pytest.raises(ValueError):
+        configure_index_params("diskann", 0)
+
+
+def _embedding(*components: float) -> str:
+    """384-dim embedding literal starting with components, zero-padded."""
+    return str(list(components) + [0.0] * (384 - len(components)))
+
+
+@pytest.fixture
+async def api_engine():
+    """The API's own engine, so connections carry hnsw.ef_search and hnsw.iterative_scan"""
+    from app.data.database import engine
+
+    # Connections pooled by earlier tests belong to their event loops
+    await engine.dispose(close=False)
+    yield engine
+    await engine.dispose()
+
+
+async def test_search_query_uses_hnsw_index_and_returns_filtered_results(api_engine):
+    async with api_engine.connect() as conn:
+        index = (await conn.execute(
+            text("SELECT to_regclass('idx_job_chunks_embedding_hnsw')")
+        )).scalar()
+        if index is None:
+            pytest.skip("database is not migrated to the HNSW indexes")
+        version = (await conn.execute(
+            text("SELECT extversion FROM pg_extension WHERE extname = 'vector'")
+        )).scalar()
+        if tuple(int(part) for part in version.split(".")[:2]) < (0, 8):
+            pytest.skip(f"iterative index scans need pgvector 0.8+, not {version}")
+
+        # Nothing below is committed: the connection rolls back on close
+        session = AsyncSession(bind=conn)
+        if await session.get(Role, 2) is None:
+            session.add(Role(id=2, name="user", description="Standard user"))
+        jobs = {}
+        for user_id in ("test_user_vector_search", "test_user_vector_decoy"):
+            session.add(User(id=user_id, role_id=2))
+            jobs[user_id] = Job(
+                user_id=user_id, filename="search.mp3", file_path="", status="completed"
+            )
+            session.add(jobs[user_id])
+        await session.flush()
+        job_ids = {user_id: job.id for user_id, job in jobs.items()}
+
+        # The decoy user's chunks are all nearer the query than the searching
+        # user's, and outnumber hnsw.ef_search: without an iterative scan the
+        # index would return only decoys and the user filter would leave nothing
+        chunks = [
+            (job_ids["test_user_vector_decoy"], i, _embedding(1.0, 0.001 * i))
+            for i in range(300)
+        ] + [
+            (job_ids["test_user_vector_search"], i, _embedding(1.0, 1.0 + i))
+            for i in range(5)
+        ]
+        for job_id, chunk_index, embedding in chunks:
+            await conn.execute(
+                text("INSERT INTO job_chunks (job_id, chunk_index, text, embedding) "
+                     "VALUES (:job_id, :chunk_index, 'chunk', CAST(:embedding AS halfvec(384)))"),
+                {"job_id": job_id, "chunk_index": chunk_index, "embedding": embedding},
+            )
+
+        params = {
+            "query_embedding": _embedding(1.0),
+            "user_id": "test_user_vector_search",
+            "limit": 3,
+        }
+        # On a handful of rows any plan is cheap; with sequential scans and sorts
+        # off, only the HNSW index can produce the ORDER BY ... LIMIT
+        await conn.execute(text("SET LOCAL enable_seqscan = off"))
+        await conn.execute(text("SET LOCAL enable_sort = off"))
+        plan = "\n".join((await conn.execute(
+            text(f"EXPLAIN {job_chunk_search_sql()}"), params
+        )).scalars())
+        rows = (await conn.execute(text(job_chunk_search_sql()), params)).all()
+
+    assert "Index Scan using idx_job_chunks_embedding_hnsw" in plan
+    assert [row.chunk_index for row in rows] == [0, 1, 2]
+    assert {row.job_id for row in rows} == {job_ids["test_user_vector_search"]}